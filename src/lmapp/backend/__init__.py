@@ -1,8 +1,25 @@
 """Backend modules for LLM integration"""
 
-from .base import LLMBackend, BackendStatus
-from .detector import BackendDetector
-from .installer import BackendInstaller
+import importlib
+from typing import Any
+
+# Exports are imported on first access so that importing lmapp.backend.base
+# doesn't load every backend implementation and its HTTP client
+_EXPORTS = {
+    "LLMBackend": ".base",
+    "BackendStatus": ".base",
+    "BackendDetector": ".detector",
+    "BackendInstaller": ".installer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "LLMBackend",
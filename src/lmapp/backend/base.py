@@ -6,7 +6,7 @@ Defines abstract interface for all LLM backends
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Iterator
 from dataclasses import dataclass
 
 
@@ -111,6 +111,22 @@ class LLMBackend(ABC):
         """
         raise NotImplementedError()
 
+    def stream_chat(
+        self,
+        prompt: str,
+        model: str = "",
+        temperature: float = 0.7,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """Send a chat prompt and yield the response as it is generated.
+
+        Backends that can stream override this to forward tokens as they
+        arrive. The default yields the complete `chat` response as one chunk.
+        """
+        response = self.chat(prompt=prompt, model=model, temperature=temperature, **kwargs)
+        if response:
+            yield response
+
     def get_status(self) -> BackendStatus:
         """Get current backend status"""
         if not self.is_installed():
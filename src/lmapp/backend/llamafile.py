@@ -4,9 +4,10 @@ llamafile Backend Implementation
 Manages llamafile download and execution
 """
 
+import json
 import subprocess
 import requests
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from pathlib import Path
 
 from .base import LLMBackend
@@ -16,11 +17,13 @@ class LlamafileBackend(LLMBackend):
     """llamafile backend integration"""
 
     LLAMAFILE_DIR = Path.home() / ".lmapp" / "llamafiles"
+    DEFAULT_API_URL = "http://localhost:8080"
 
     def __init__(self):
         super().__init__()
         self.LLAMAFILE_DIR.mkdir(parents=True, exist_ok=True)
         self.current_process = None
+        self.api_url = self.DEFAULT_API_URL
 
     def backend_name(self) -> str:
         return "llamafile"
@@ -51,7 +54,7 @@ class LlamafileBackend(LLMBackend):
 
         # Check if port 8080 is in use (default llamafile port)
         try:
-            response = requests.get("http://localhost:8080/health", timeout=1)
+            response = requests.get(f"{self.api_url}/health", timeout=1)
             return response.status_code == 200
         except Exception:
             return False
@@ -195,8 +198,8 @@ class LlamafileBackend(LLMBackend):
 
         try:
             response = requests.post(
-                "http://localhost:8080/completion",
-                json={"prompt": prompt, "stream": False, **kwargs},
+                f"{self.api_url}/completion",
+                json={"prompt": prompt, **kwargs, "stream": False},
                 timeout=60,
             )
 
@@ -206,3 +209,35 @@ class LlamafileBackend(LLMBackend):
             pass
 
         return ""
+
+    def stream_chat(self, prompt: str, model: str = "", temperature: float = 0.7, **kwargs) -> Iterator[str]:
+        """
+        Stream a chat response from llamafile as tokens are generated.
+
+        With ``stream: true`` /completion returns server-sent events whose
+        ``data:`` lines each carry the next fragment of the response.
+
+        Raises:
+            RuntimeError: If llamafile rejects the request
+        """
+        with requests.post(
+            f"{self.api_url}/completion",
+            json={"prompt": prompt, **kwargs, "stream": True},
+            stream=True,
+            timeout=60,
+        ) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"llamafile returned HTTP {response.status_code}")
+
+            # chunk_size=None hands over each chunk as soon as it arrives
+            for line in response.iter_lines(chunk_size=None):
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("content"):
+                    yield chunk["content"]
+                if chunk.get("stop"):
+                    break
@@ -3,23 +3,62 @@
 Ollama Backend Implementation
 Manages Ollama installation and interaction
 """
+import json
 import shutil
 import subprocess
+import threading
 import requests
 import time
-from typing import Optional, List
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, Optional, List
 
 from .base import LLMBackend
 
 
 class OllamaBackend(LLMBackend):
-    """Ollama backend integration"""
+    """Ollama backend integration
+
+    Requests go through one pooled keep-alive session per backend, and a
+    successful health probe is trusted for HEALTH_TTL seconds so the chat hot
+    path doesn't pay for an extra GET /api/tags. Connection errors invalidate
+    the cached health immediately.
+    """
 
     DEFAULT_API_URL = "http://localhost:11434"
+    HEALTH_TTL = 5.0
+    POOL_SIZE = 8
 
     def __init__(self):
         super().__init__()
         self.api_url = self.DEFAULT_API_URL
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._healthy_until = 0.0
+
+    def _get_session(self) -> requests.Session:
+        """Create the pooled HTTP session on first use."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _mark_healthy(self) -> None:
+        self._healthy_until = time.monotonic() + self.HEALTH_TTL
+
+    def invalidate_health(self) -> None:
+        """Forget the cached health state so the next check probes the server."""
+        self._healthy_until = 0.0
 
     def backend_name(self) -> str:
         return "ollama"
@@ -45,12 +84,19 @@ class OllamaBackend(LLMBackend):
         return None
 
     def is_running(self) -> bool:
-        """Check if Ollama service is running"""
+        """Check if Ollama service is running (cached for HEALTH_TTL after success)"""
+        if time.monotonic() < self._healthy_until:
+            return True
         try:
-            response = requests.get(f"{self.api_url}/api/tags", timeout=2)
-            return response.status_code == 200
+            response = self._get_session().get(f"{self.api_url}/api/tags", timeout=2)
         except Exception:
+            self.invalidate_health()
             return False
+        if response.status_code == 200:
+            self._mark_healthy()
+            return True
+        self.invalidate_health()
+        return False
 
     def install(self) -> bool:
         """
@@ -128,6 +174,7 @@ class OllamaBackend(LLMBackend):
 
     def stop(self) -> bool:
         """Stop Ollama service"""
+        self.invalidate_health()
         try:
             subprocess.run(
                 ["systemctl", "--user", "stop", "ollama"],
@@ -144,10 +191,12 @@ class OllamaBackend(LLMBackend):
             return []
 
         try:
-            response = requests.get(f"{self.api_url}/api/tags", timeout=5)
+            response = self._get_session().get(f"{self.api_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return [model["name"] for model in data.get("models", [])]
+        except requests.ConnectionError:
+            self.invalidate_health()
         except Exception:
             pass
 
@@ -185,21 +234,72 @@ class OllamaBackend(LLMBackend):
         except Exception:
             return False
 
+    @staticmethod
+    def _generate_payload(prompt: str, model: str, stream: bool, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an /api/generate request body from chat keyword arguments."""
+        payload = {"model": model, "prompt": prompt, **options}
+        system_prompt = payload.pop("system_prompt", None)
+        if system_prompt:
+            payload["system"] = system_prompt
+        payload["stream"] = stream
+        return payload
+
     def chat(self, prompt: str, model: str = "", temperature: float = 0.7, *args, **kwargs) -> str:
         """Send a chat prompt to Ollama"""
         if not self.is_running():
             return ""
 
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 f"{self.api_url}/api/generate",
-                json={"model": model, "prompt": prompt, "stream": False, **kwargs},
+                json=self._generate_payload(prompt, model, False, kwargs),
                 timeout=60,
             )
 
             if response.status_code == 200:
+                self._mark_healthy()
                 return response.json().get("response", "")
+        except requests.ConnectionError:
+            self.invalidate_health()
         except Exception:
             pass
 
         return ""
+
+    def stream_chat(self, prompt: str, model: str = "", temperature: float = 0.7, **kwargs) -> Iterator[str]:
+        """
+        Stream a chat response from Ollama as tokens are generated.
+
+        With ``stream: true`` /api/generate returns one JSON object per line,
+        each carrying the next fragment of the response.
+
+        Raises:
+            RuntimeError: If Ollama rejects the request or reports an error
+        """
+        try:
+            response = self._get_session().post(
+                f"{self.api_url}/api/generate",
+                json=self._generate_payload(prompt, model, True, kwargs),
+                stream=True,
+                timeout=60,
+            )
+        except requests.ConnectionError:
+            self.invalidate_health()
+            raise
+
+        with response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Ollama returned HTTP {response.status_code}")
+            self._mark_healthy()
+
+            # chunk_size=None hands over each chunk as soon as it arrives
+            for line in response.iter_lines(chunk_size=None):
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
@@ -8,13 +8,21 @@ Features:
 - Process multiple queries on multiple inputs
 - Results aggregation and export
 - Progress tracking
+- Bounded-concurrency execution
+- Per-item checkpoint journal with resume
+- Streaming file input and JSONL/CSV output for jobs of any size
 - Error handling and recovery
 - Output formatting (JSON, CSV, text)
 """
 
+import csv
 import json
+import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Callable, Tuple
+from typing import IO, Iterable, Iterator, List, Dict, Optional, Any, Callable, Set, Tuple, Type
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timezone
@@ -92,13 +100,20 @@ class BatchJob:
     completed_at: Optional[str] = None
     total_processed: int = 0
     total_failed: int = 0
+    # Set for streamed jobs, whose inputs are not held in memory
+    inputs_total: Optional[int] = None
+
+    @property
+    def input_count(self) -> int:
+        """Number of inputs in the job."""
+        return self.inputs_total if self.inputs_total is not None else len(self.inputs)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
             "job_id": self.job_id,
             "status": self.status.value,
-            "inputs_count": len(self.inputs),
+            "inputs_count": self.input_count,
             "results_count": len(self.results),
             "total_processed": self.total_processed,
             "total_failed": self.total_failed,
@@ -109,9 +124,126 @@ class BatchJob:
         }
 
 
+class ResultWriter(ABC):
+    """Writes batch results to a file one at a time."""
+
+    def __init__(self, output_path: Path):
+        self._file: IO[str] = open(output_path, "w", newline="")
+
+    @abstractmethod
+    def write(self, result: BatchResult) -> None:
+        """Write one result."""
+
+    def close(self) -> None:
+        """Close the output file."""
+        self._file.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class JSONLResultWriter(ResultWriter):
+    """Writes one JSON object per result."""
+
+    def write(self, result: BatchResult) -> None:
+        self._file.write(json.dumps(result.to_dict()) + "\n")
+
+
+class CSVResultWriter(ResultWriter):
+    """Writes one CSV row per result (output truncated to 200 characters)."""
+
+    FIELDS = ["input_id", "status", "output", "error", "processing_time"]
+
+    def __init__(self, output_path: Path):
+        super().__init__(output_path)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.FIELDS)
+        self._writer.writeheader()
+
+    def write(self, result: BatchResult) -> None:
+        self._writer.writerow(
+            {
+                "input_id": result.input_id,
+                "status": result.status,
+                "output": (str(result.output)[:200] if result.output else ""),
+                "error": result.error or "",
+                "processing_time": f"{result.processing_time:.3f}s",
+            }
+        )
+
+
+# Output formats that can be written incrementally
+RESULT_WRITERS: Dict[OutputFormat, Type[ResultWriter]] = {
+    OutputFormat.JSONL: JSONLResultWriter,
+    OutputFormat.CSV: CSVResultWriter,
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def _iter_json_array(f: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array without loading the whole file.
+
+    Yields nothing if the document is not an array.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+    read_size = chunk_size
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if started and buf.startswith(",", pos):
+            pos = _WHITESPACE.match(buf, pos + 1).end()
+
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    return
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Grow reads geometrically so one large element isn't re-parsed per chunk
+                read_size *= 2
+            else:
+                nxt = _WHITESPACE.match(buf, end).end()
+                if nxt < len(buf) and buf[nxt] in ",]":
+                    yield item
+                    pos = nxt
+                    read_size = chunk_size
+                    continue
+                # Otherwise the delimiter hasn't been read yet, or a number was cut off at the buffer boundary
+                if eof or (nxt < len(buf) and not _NUMBER_TAIL.fullmatch(buf, end)):
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, nxt)
+        elif eof:
+            if started:
+                raise json.JSONDecodeError("Unterminated array", buf, pos)
+            return
+
+        chunk = f.read(read_size)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
 class BatchProcessor:
     """Processes batch jobs with multiple inputs."""
 
+    DEFAULT_MAX_WORKERS = 4
+
     def __init__(self, jobs_dir: Optional[Path] = None):
         """
         Initialize BatchProcessor.
@@ -151,15 +283,24 @@ class BatchProcessor:
         job_id: str,
         processor_fn: Callable[[str], Tuple[Any, Optional[str]]],
         on_progress: Optional[Callable[[int, int], None]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        resume: bool = False,
     ) -> BatchJob:
         """
         Process a batch job.
 
+        Inputs run on up to ``max_workers`` threads. Each result is appended
+        to the job's checkpoint journal as soon as it finishes, so an
+        interrupted job can be resumed without redoing completed inputs.
+
         Args:
             job_id: Job ID to process
             processor_fn: Function to process each input.
                          Takes content, returns (output, error_message)
             on_progress: Optional callback for progress updates (processed, total)
+            max_workers: Maximum number of inputs processed concurrently
+            resume: Skip inputs the checkpoint journal already records as
+                    successful (failed inputs are retried)
 
         Returns:
             Completed BatchJob
@@ -171,47 +312,96 @@ class BatchProcessor:
         job.status = BatchStatus.PROCESSING
         job.started_at = datetime.now(timezone.utc).isoformat()
 
-        import time
+        restored: Dict[str, BatchResult] = {}
+        if resume:
+            restored = {input_id: r for input_id, r in self.load_checkpoint(job_id).items() if r.status == "success"}
 
-        for idx, input_item in enumerate(job.inputs):
-            start_time = time.time()
+        total = len(job.inputs)
+        slots: List[Optional[BatchResult]] = [restored.get(item.input_id) for item in job.inputs]
+        pending = [(idx, item) for idx, item in enumerate(job.inputs) if slots[idx] is None]
+        completed = total - len(pending)
 
-            try:
-                output, error = processor_fn(input_item.content)
-
-                if error:
-                    result = BatchResult(
-                        input_id=input_item.input_id,
-                        output=None,
-                        status="error",
-                        error=error,
-                        processing_time=time.time() - start_time,
-                    )
-                    job.total_failed += 1
-                else:
-                    result = BatchResult(
-                        input_id=input_item.input_id,
-                        output=output,
-                        status="success",
-                        processing_time=time.time() - start_time,
-                    )
-                    job.total_processed += 1
+        for idx, result in self._run_checkpointed(job_id, processor_fn, pending, max_workers, resume):
+            slots[idx] = result
+            completed += 1
+            if on_progress:
+                on_progress(completed, total)
 
-            except Exception as e:
-                result = BatchResult(
-                    input_id=input_item.input_id,
-                    output=None,
-                    status="error",
-                    error=str(e),
-                    processing_time=time.time() - start_time,
-                )
-                job.total_failed += 1
+        job.results = [result for result in slots if result is not None]
+        job.total_processed = sum(1 for result in job.results if result.status == "success")
+        job.total_failed = len(job.results) - job.total_processed
+        job.status = BatchStatus.COMPLETED
+        job.completed_at = datetime.now(timezone.utc).isoformat()
+        self._save_job(job)
 
-            job.results.append(result)
+        return job
 
-            # Call progress callback
-            if on_progress:
-                on_progress(idx + 1, len(job.inputs))
+    def process_file(
+        self,
+        job_id: str,
+        input_path: Path,
+        processor_fn: Callable[[str], Tuple[Any, Optional[str]]],
+        output_path: Path,
+        format: OutputFormat = OutputFormat.JSONL,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        resume: bool = False,
+    ) -> BatchJob:
+        """
+        Process a batch straight from an input file to an output file.
+
+        Inputs are read lazily (see iter_inputs_from_file) and each result is
+        written to ``output_path`` as it finishes, in completion order, so
+        memory use does not grow with the size of the batch. The returned job
+        carries counts only; its inputs and results are not kept in memory.
+
+        Args:
+            job_id: Job ID to create
+            input_path: JSON, JSONL or text input file
+            processor_fn: Function to process each input.
+                         Takes content, returns (output, error_message)
+            output_path: Path to write results to
+            format: Output format (JSONL or CSV)
+            on_progress: Optional callback for progress updates (processed, total)
+            max_workers: Maximum number of inputs processed concurrently
+            resume: Skip inputs the checkpoint journal already records as
+                    successful; their results are copied to the new output
+
+        Returns:
+            Completed BatchJob
+        """
+        writer_cls = RESULT_WRITERS.get(format)
+        if writer_cls is None:
+            raise ValueError(f"Format {format.value} cannot be written incrementally")
+
+        # Counting costs an extra streaming pass but keeps progress reporting exact
+        total = sum(1 for _ in self.iter_inputs_from_file(input_path))
+        job = BatchJob(job_id=job_id, inputs=[], inputs_total=total)
+        self.jobs[job_id] = job
+        job.status = BatchStatus.PROCESSING
+        job.started_at = datetime.now(timezone.utc).isoformat()
+
+        with writer_cls(output_path) as writer:
+            done: Set[str] = set()
+            if resume:
+                for result in self._iter_checkpoint(job_id):
+                    if result.status == "success" and result.input_id not in done:
+                        done.add(result.input_id)
+                        writer.write(result)
+                job.total_processed = len(done)
+
+            pending = ((idx, item) for idx, item in enumerate(self.iter_inputs_from_file(input_path)) if item.input_id not in done)
+            completed = len(done)
+            for _, result in self._run_checkpointed(job_id, processor_fn, pending, max_workers, resume):
+                writer.write(result)
+                if result.status == "success":
+                    job.total_processed += 1
+                else:
+                    job.total_failed += 1
+
+                completed += 1
+                if on_progress:
+                    on_progress(completed, total)
 
         job.status = BatchStatus.COMPLETED
         job.completed_at = datetime.now(timezone.utc).isoformat()
@@ -219,6 +409,112 @@ class BatchProcessor:
 
         return job
 
+    def _run_checkpointed(
+        self,
+        job_id: str,
+        processor_fn: Callable[[str], Tuple[Any, Optional[str]]],
+        inputs: Iterable[Tuple[int, BatchInput]],
+        max_workers: int,
+        resume: bool,
+    ) -> Iterator[Tuple[int, BatchResult]]:
+        """Run inputs concurrently, journaling each result before yielding it."""
+        with open(self._checkpoint_path(job_id), "a" if resume else "w") as checkpoint:
+            for idx, result in self._run_concurrently(processor_fn, inputs, max_workers):
+                checkpoint.write(json.dumps(result.to_dict()) + "\n")
+                checkpoint.flush()
+                yield idx, result
+
+    @staticmethod
+    def _process_input(
+        processor_fn: Callable[[str], Tuple[Any, Optional[str]]],
+        input_item: BatchInput,
+    ) -> BatchResult:
+        """Run ``processor_fn`` on one input, capturing errors in the result."""
+        start_time = time.perf_counter()
+
+        try:
+            output, error = processor_fn(input_item.content)
+        except Exception as e:
+            output, error = None, str(e)
+
+        if error:
+            return BatchResult(
+                input_id=input_item.input_id,
+                output=None,
+                status="error",
+                error=error,
+                processing_time=time.perf_counter() - start_time,
+            )
+        return BatchResult(
+            input_id=input_item.input_id,
+            output=output,
+            status="success",
+            processing_time=time.perf_counter() - start_time,
+        )
+
+    def _run_concurrently(
+        self,
+        processor_fn: Callable[[str], Tuple[Any, Optional[str]]],
+        inputs: Iterable[Tuple[int, BatchInput]],
+        max_workers: int,
+    ) -> Iterator[Tuple[int, BatchResult]]:
+        """
+        Yield (index, result) pairs in completion order.
+
+        At most ``max_workers`` inputs are submitted at a time, so inputs are
+        pulled from the iterable lazily and an interrupted run leaves no
+        backlog of queued work behind.
+        """
+        max_workers = max(1, max_workers)
+        items = iter(inputs)
+        in_flight: Dict[Future, int] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lmapp-batch") as executor:
+
+            def fill() -> None:
+                while len(in_flight) < max_workers:
+                    nxt = next(items, None)
+                    if nxt is None:
+                        return
+                    idx, input_item = nxt
+                    in_flight[executor.submit(self._process_input, processor_fn, input_item)] = idx
+
+            fill()
+            while in_flight:
+                done: Set[Future] = wait(in_flight, return_when=FIRST_COMPLETED)[0]
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+                fill()
+
+    def _checkpoint_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.checkpoint.jsonl"
+
+    def load_checkpoint(self, job_id: str) -> Dict[str, BatchResult]:
+        """
+        Load the results recorded in a job's checkpoint journal.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Latest recorded result per input ID (empty if there is no journal)
+        """
+        return {result.input_id: result for result in self._iter_checkpoint(job_id)}
+
+    def _iter_checkpoint(self, job_id: str) -> Iterator[BatchResult]:
+        checkpoint_file = self._checkpoint_path(job_id)
+        if not checkpoint_file.exists():
+            return
+
+        with open(checkpoint_file, "r") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn trailing line from an interrupted write
+                    continue
+                yield BatchResult(**data)
+
     def load_inputs_from_file(self, file_path: Path) -> List[BatchInput]:
         """
         Load batch inputs from a file.
@@ -232,64 +528,70 @@ class BatchProcessor:
             file_path: Path to input file
 
         Returns:
-            List of BatchInput
+            List of BatchInput (inputs read before any parse error)
         """
-        if not file_path.exists():
-            return []
-
-        inputs = []
+        inputs: List[BatchInput] = []
 
         try:
+            for input_item in self.iter_inputs_from_file(file_path):
+                inputs.append(input_item)
+        except (json.JSONDecodeError, IOError):
+            pass
+
+        return inputs
+
+    def iter_inputs_from_file(self, file_path: Path) -> Iterator[BatchInput]:
+        """
+        Read batch inputs from a file one at a time.
+
+        Accepts the same formats as load_inputs_from_file. JSON arrays are
+        decoded element by element, so memory use does not depend on file size.
+
+        Args:
+            file_path: Path to input file
+
+        Yields:
+            BatchInput items
+
+        Raises:
+            json.JSONDecodeError: If the file is malformed
+        """
+        if not file_path.exists():
+            return
+
+        with open(file_path, "r") as f:
             if file_path.suffix == ".json":
-                with open(file_path, "r") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        for idx, item in enumerate(data):
-                            if isinstance(item, dict):
-                                inputs.append(
-                                    BatchInput(
-                                        input_id=item.get("id", f"input_{idx}"),
-                                        content=item.get("content", ""),
-                                        metadata=item.get("metadata"),
-                                    )
-                                )
-                            else:
-                                inputs.append(
-                                    BatchInput(
-                                        input_id=f"input_{idx}",
-                                        content=str(item),
-                                    )
-                                )
+                for idx, item in enumerate(_iter_json_array(f)):
+                    if isinstance(item, dict):
+                        yield BatchInput(
+                            input_id=item.get("id", f"input_{idx}"),
+                            content=item.get("content", ""),
+                            metadata=item.get("metadata"),
+                        )
+                    else:
+                        yield BatchInput(
+                            input_id=f"input_{idx}",
+                            content=str(item),
+                        )
 
             elif file_path.suffix == ".jsonl":
-                with open(file_path, "r") as f:
-                    for idx, line in enumerate(f):
-                        if line.strip():
-                            item = json.loads(line)
-                            inputs.append(
-                                BatchInput(
-                                    input_id=item.get("id", f"input_{idx}"),
-                                    content=item.get("content", ""),
-                                    metadata=item.get("metadata"),
-                                )
-                            )
+                for idx, line in enumerate(f):
+                    if line.strip():
+                        item = json.loads(line)
+                        yield BatchInput(
+                            input_id=item.get("id", f"input_{idx}"),
+                            content=item.get("content", ""),
+                            metadata=item.get("metadata"),
+                        )
 
             else:  # Text file
-                with open(file_path, "r") as f:
-                    for idx, line in enumerate(f):
-                        content = line.strip()
-                        if content:
-                            inputs.append(
-                                BatchInput(
-                                    input_id=f"input_{idx}",
-                                    content=content,
-                                )
-                            )
-
-        except (json.JSONDecodeError, IOError):
-            pass
-
-        return inputs
+                for idx, line in enumerate(f):
+                    content = line.strip()
+                    if content:
+                        yield BatchInput(
+                            input_id=f"input_{idx}",
+                            content=content,
+                        )
 
     def save_results(
         self,
@@ -317,43 +619,16 @@ class BatchProcessor:
                 with open(output_path, "w") as f:
                     json.dump(job.to_dict(), f, indent=2)
 
-            elif format == OutputFormat.JSONL:
-                with open(output_path, "w") as f:
+            elif format in RESULT_WRITERS:
+                with RESULT_WRITERS[format](output_path) as writer:
                     for result in job.results:
-                        f.write(json.dumps(result.to_dict()) + "\n")
-
-            elif format == OutputFormat.CSV:
-                import csv
-
-                with open(output_path, "w", newline="") as f:
-                    if job.results:
-                        writer = csv.DictWriter(
-                            f,
-                            fieldnames=[
-                                "input_id",
-                                "status",
-                                "output",
-                                "error",
-                                "processing_time",
-                            ],
-                        )
-                        writer.writeheader()
-                        for result in job.results:
-                            writer.writerow(
-                                {
-                                    "input_id": result.input_id,
-                                    "status": result.status,
-                                    "output": (str(result.output)[:200] if result.output else ""),
-                                    "error": result.error or "",
-                                    "processing_time": f"{result.processing_time:.3f}s",
-                                }
-                            )
+                        writer.write(result)
 
             elif format == OutputFormat.TEXT:
                 with open(output_path, "w") as f:
                     f.write(f"Batch Job: {job.job_id}\n")
                     f.write(f"Status: {job.status.value}\n")
-                    f.write(f"Processed: {job.total_processed}/{len(job.inputs)}\n")
+                    f.write(f"Processed: {job.total_processed}/{job.input_count}\n")
                     f.write(f"Failed: {job.total_failed}\n\n")
 
                     for result in job.results:
@@ -384,14 +659,15 @@ class BatchProcessor:
             end = dt.fromisoformat(job.completed_at.replace("Z", ""))
             total_time = (end - start).total_seconds()
 
+        count = job.input_count
         return {
             "job_id": job_id,
-            "total_inputs": len(job.inputs),
+            "total_inputs": count,
             "total_processed": job.total_processed,
             "total_failed": job.total_failed,
-            "success_rate": (job.total_processed / len(job.inputs) * 100 if job.inputs else 0),
+            "success_rate": (job.total_processed / count * 100 if count else 0),
             "total_time": total_time,
-            "avg_time_per_item": total_time / len(job.inputs) if job.inputs else 0,
+            "avg_time_per_item": total_time / count if count else 0,
         }
 
     def _save_job(self, job: BatchJob) -> None:
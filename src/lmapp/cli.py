@@ -3,10 +3,11 @@
 lmapp CLI - Main entry point
 Provides the primary command-line interface for lmapp
 """
+import importlib
 import os
 import signal
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import sys
 import click
@@ -14,23 +15,91 @@ from rich.console import Console
 from rich.panel import Panel
 
 from lmapp import __version__
-from lmapp.ui.menu import MainMenu
-from lmapp.ui.chat_ui import launch_chat
-from lmapp.utils.system_check import SystemCheck
 from lmapp.utils.logging import logger, LOG_FILE, enable_debug
-from lmapp.cli_plugins import plugins
-from lmapp.backend.installer import BackendInstaller
-from lmapp.backend.detector import BackendDetector
-from lmapp.core.chat import ChatSession
 from lmapp.core.nux import check_first_run, run_user_mode_setup
 from lmapp.core.config import get_config_manager
-from lmapp.core.auth import GitHubAuth
-from lmapp.core.sync_manager import SyncManager
 
 console = Console()
 
+# Command implementations are imported on first use so that `lmapp --help`
+# and light commands don't pay for the UI, backend and sync import graphs.
+# They remain module attributes (lmapp.cli.MainMenu etc.) via __getattr__.
+_LAZY_IMPORTS = {
+    "MainMenu": "lmapp.ui.menu",
+    "launch_chat": "lmapp.ui.chat_ui",
+    "SystemCheck": "lmapp.utils.system_check",
+    "BackendInstaller": "lmapp.backend.installer",
+    "BackendDetector": "lmapp.backend.detector",
+    "ChatSession": "lmapp.core.chat",
+    "GitHubAuth": "lmapp.core.auth",
+    "SyncManager": "lmapp.core.sync_manager",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Resolve a lazily imported name, preferring a value already set on the module (e.g. a test patch)."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+class LazyGroup(click.Group):
+    """Click group whose lazy subcommands are imported only when invoked.
+
+    ``lazy_subcommands`` maps a command name to ``("module:attribute", short_help)``;
+    the short help is shown in ``--help`` without importing the command.
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
 
-@click.group(invoke_without_command=True)
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attr = import_path.split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attr), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        # Same layout as click.Group.format_commands, without importing lazy commands
+        names = self.list_commands(ctx)
+        if not names:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            if name in self.lazy_subcommands and name not in self.commands:
+                rows.append((name, self.lazy_subcommands[name][1]))
+                continue
+            cmd = self.get_command(ctx, name)
+            if cmd is not None and not cmd.hidden:
+                rows.append((name, cmd.get_short_help_str(limit)))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(
+    cls=LazyGroup,
+    invoke_without_command=True,
+    lazy_subcommands={"plugins": ("lmapp.cli_plugins:plugins", "Manage plugins (search, install, list)")},
+)
 @click.option("--version", is_flag=True, help="Show version and exit")
 @click.option("--debug", is_flag=True, help="Enable debug logging")
 @click.option("--dev", is_flag=True, help="Enable Developer Mode")
@@ -138,7 +207,7 @@ def main(ctx, version, debug, dev, yes):
     if ctx.invoked_subcommand is None:
         # No subcommand, show main menu
         show_welcome()
-        menu = MainMenu()
+        menu = _lazy("MainMenu")()
         menu.run()
 
 
@@ -160,7 +229,7 @@ def chat(model, agent):
     logger.debug(f"chat command started with model={model}, agent={agent}")
 
     # Get detector to find best backend
-    detector = BackendDetector()
+    detector = _lazy("BackendDetector")()
     backend = None
 
     # Try to find a running backend
@@ -225,13 +294,27 @@ def chat(model, agent):
     try:
         # Create and launch chat session
         logger.debug(f"Creating ChatSession with backend={backend.backend_name()}, model={chat_model}")
-        session = ChatSession(backend, model=chat_model)
+        config = get_config_manager().get()
+        semantic_cache = None
+        if config.semantic_cache:
+            from lmapp.core.semantic_cache import SemanticResponseCache, load_embedder
+
+            embedder = load_embedder(config.semantic_cache_embedding_model)
+            if embedder is None:
+                logger.warning(f"Semantic cache disabled: embedding model '{config.semantic_cache_embedding_model}' is unavailable")
+                console.print(
+                    f"[yellow]⚠️  Semantic cache disabled: embedding model '{config.semantic_cache_embedding_model}' is unavailable "
+                    f"(ollama pull {config.semantic_cache_embedding_model})[/yellow]"
+                )
+            else:
+                semantic_cache = SemanticResponseCache(embedder=embedder, threshold=config.semantic_cache_threshold)
+        session = _lazy("ChatSession")(backend, model=chat_model, semantic_cache=semantic_cache, context_tokens=config.context_tokens)
         if agent:
             session.enable_agent_mode()
             console.print("[bold green]Agent Mode Enabled[/bold green]: Tools (Terminal, Editor) active.")
 
         logger.debug("ChatSession created, launching chat UI")
-        launch_chat(session)
+        _lazy("launch_chat")(session)
     except ValueError as e:
         logger.error(f"ValueError in chat: {str(e)}")
         console.print(f"[red]Error: {str(e)}[/red]")
@@ -290,7 +373,7 @@ def install():
 
     # Step 1: System check
     logger.debug("Running system checks")
-    checker = SystemCheck()
+    checker = _lazy("SystemCheck")()
     if checker.run_all_checks():
         console.print("\n[green]✓ System checks passed![/green]")
         logger.debug("System checks passed")
@@ -301,7 +384,7 @@ def install():
 
     # Step 2: Backend installation (automated)
     logger.debug("Starting backend installation")
-    installer = BackendInstaller()
+    installer = _lazy("BackendInstaller")()
     backend = installer.run_installation_wizard()
 
     if not backend:
@@ -329,7 +412,7 @@ def install():
 def model(ctx):
     """List of installed LLM's"""
     if ctx.invoked_subcommand is None:
-        detector = BackendDetector()
+        detector = _lazy("BackendDetector")()
         backend = detector.get_best_backend()
 
         if not backend:
@@ -352,7 +435,7 @@ def model(ctx):
 @model.command()
 def download():
     """Download New Model"""
-    detector = BackendDetector()
+    detector = _lazy("BackendDetector")()
     backend = detector.get_best_backend()
 
     if not backend:
@@ -365,7 +448,7 @@ def download():
             console.print("[red]Failed to start backend.[/red]")
             return
 
-    menu = MainMenu()
+    menu = _lazy("MainMenu")()
     menu.download_model_ui(backend)
 
 
@@ -517,12 +600,12 @@ def status():
     console.print("  Status: [green]Production Ready[/green]")
     console.print("  License: [cyan]MIT (Free)[/cyan]")
 
-    checker = SystemCheck()
+    checker = _lazy("SystemCheck")()
     checker.run_all_checks()
 
     # Show backend status
     console.print("\n[bold]Backend Status[/bold]\n")
-    detector = BackendDetector()
+    detector = _lazy("BackendDetector")()
     detector.show_status_table()
     logger.debug("Status command completed")
 
@@ -871,7 +954,7 @@ def sync():
 def login():
     """Authenticate with GitHub for backup."""
     config_dir = Path(click.get_app_dir("lmapp"))
-    auth = GitHubAuth(config_dir)
+    auth = _lazy("GitHubAuth")(config_dir)
     
     if auth.is_authenticated():
         console.print("[green]Already authenticated![/green]")
@@ -897,7 +980,7 @@ def login():
 def status():
     """Check sync status."""
     config_dir = Path(click.get_app_dir("lmapp"))
-    auth = GitHubAuth(config_dir)
+    auth = _lazy("GitHubAuth")(config_dir)
     
     if auth.is_authenticated():
         console.print("[green]Authenticated: Yes[/green]")
@@ -909,8 +992,8 @@ def status():
 def run(action):
     """Run manual sync (up/down)."""
     config_dir = Path(click.get_app_dir("lmapp"))
-    auth = GitHubAuth(config_dir)
-    manager = SyncManager(config_dir, auth)
+    auth = _lazy("GitHubAuth")(config_dir)
+    manager = _lazy("SyncManager")(config_dir, auth)
     
     # For now, we just sync the main config file as a test
     target_file = config_dir / "config.yaml"
@@ -950,7 +1033,11 @@ def learn(path):
             console.print("[red]Failed to index file.[/red]")
     elif path_obj.is_dir():
         count = rag.index_directory(path_obj)
-        console.print(f"[green]Successfully indexed {count} files.[/green]")
+        stats = rag.last_index_stats
+        console.print(
+            f"[green]Successfully indexed {count} files.[/green] "
+            f"[dim]({stats.get('unchanged', 0)} unchanged, {stats.get('removed', 0)} removed)[/dim]"
+        )
 
 @rag.command()
 @click.argument("query")
@@ -973,10 +1060,6 @@ def query(query):
         console.print(f"   {res.matched_text}\n")
 
 
-# Register plugin commands
-main.add_command(plugins)
-
-
 if __name__ == "__main__":
     main()
 
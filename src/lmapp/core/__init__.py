@@ -1,7 +1,26 @@
 """Core modules for lmapp"""
 
-from .chat import ChatSession, ChatMessage
-from .config import LMAppConfig, ConfigManager, get_config
+import importlib
+from typing import Any
+
+# Exports are imported on first access so that importing a single submodule
+# (e.g. lmapp.core.config) doesn't load the chat stack
+_EXPORTS = {
+    "ChatSession": ".chat",
+    "ChatMessage": ".chat",
+    "LMAppConfig": ".config",
+    "ConfigManager": ".config",
+    "get_config": ".config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ChatSession",
@@ -7,9 +7,10 @@ Uses TTL (Time-To-Live) based eviction and SQLite storage for persistence.
 
 import hashlib
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from loguru import logger
 
@@ -19,22 +20,47 @@ class ResponseCache:
     Manages caching of LLM responses with TTL-based eviction.
 
     Features:
-    - Persistent SQLite storage
+    - Persistent SQLite storage in WAL mode
+    - Long-lived per-thread connections (no connect/close per call)
     - TTL-based automatic expiration
     - Content hash-based key generation
+    - Read-only cache hits: access statistics are buffered and flushed in batches
+    - Row-count bound with least-recently-used eviction, trimmed to a
+      low-water mark so the cost of an eviction pass is amortized
     - Statistics tracking (hit rate, cache size)
     """
 
     DEFAULT_TTL_HOURS = 24
+    DEFAULT_MAX_ENTRIES = 10000
+    HIT_FLUSH_THRESHOLD = 64
+    EVICTION_LOW_WATER = 0.9
     CACHE_DB_NAME = "response_cache.db"
 
-    def __init__(self, cache_dir: Optional[Path] = None, ttl_hours: int = DEFAULT_TTL_HOURS):
+    _SELECT_SQL = "SELECT response, expires_at FROM cache WHERE query_hash = ?"
+    _EXISTS_SQL = "SELECT 1 FROM cache WHERE query_hash = ?"
+    _UPSERT_SQL = """
+        INSERT OR REPLACE INTO cache
+        (query_hash, query_text, response, model, backend, temperature,
+         created_at, expires_at, access_count, last_accessed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _HIT_SQL = "UPDATE cache SET access_count = access_count + ?, last_accessed = ? WHERE query_hash = ?"
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_hours: int = DEFAULT_TTL_HOURS,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    ):
         """
         Initialize the response cache.
 
         Args:
             cache_dir: Directory for cache storage. Defaults to ~/.lmapp/cache/
             ttl_hours: Time-to-live for cached responses in hours
+            max_entries: Maximum cached responses; beyond this, least recently
+                used entries are evicted down to EVICTION_LOW_WATER of it
+                (None for unbounded)
         """
         if cache_dir is None:
             cache_dir = Path.home() / ".lmapp" / "cache"
@@ -44,16 +70,37 @@ class ResponseCache:
 
         self.db_path = self.cache_dir / self.CACHE_DB_NAME
         self.ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max_entries
+
+        # One connection per thread, released with the thread (or by close())
+        self._local = threading.local()
+
+        # Buffered hit statistics: query_hash -> (hits, last_accessed)
+        self._pending_hits: Dict[str, Tuple[int, str]] = {}
+        self._hits_lock = threading.Lock()
+
+        # Row count, maintained from inserts and deletes made through this instance
+        self._row_count = 0
 
         # Initialize database
         self._init_database()
 
-        logger.debug(f"Cache initialized at {self.db_path} with TTL={ttl_hours}h")
+        logger.debug(f"Cache initialized at {self.db_path} with TTL={ttl_hours}h, max_entries={max_entries}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
 
     def _init_database(self) -> None:
         """Initialize SQLite database schema"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             # Create cache table
@@ -88,8 +135,15 @@ class ResponseCache:
             """
             )
 
+            # Used for least-recently-used eviction
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_last_accessed ON cache(last_accessed)
+            """
+            )
+
             conn.commit()
-            conn.close()
+            self._row_count = cursor.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
 
             logger.debug("Cache database initialized")
         except Exception as e:
@@ -111,6 +165,9 @@ class ResponseCache:
         """
         Retrieve a cached response if available and not expired.
 
+        A hit performs a single indexed read; access statistics are buffered
+        in memory and written in batches.
+
         Args:
             query: The user's query
             model: The LLM model used
@@ -120,52 +177,33 @@ class ResponseCache:
         Returns:
             The cached response, or None if not cached or expired
         """
-        query_hash = self._hash_query(query, model, backend, temperature)
+        return self.get_by_hash(self._hash_query(query, model, backend, temperature))
 
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+    def get_by_hash(self, query_hash: str) -> Optional[str]:
+        """
+        Retrieve a cached response by its key hash.
 
-            # Check for valid cache entry
-            cursor.execute(
-                """
-                SELECT response, expires_at FROM cache
-                WHERE query_hash = ?
-            """,
-                (query_hash,),
-            )
+        Args:
+            query_hash: Key produced for a query, model, backend and temperature
 
-            result = cursor.fetchone()
+        Returns:
+            The cached response, or None if not cached or expired
+        """
+        try:
+            result = self._connect().execute(self._SELECT_SQL, (query_hash,)).fetchone()
 
             if result is None:
-                conn.close()
                 return None
 
             response, expires_at = result
-            expires_dt = datetime.fromisoformat(expires_at)
-
-            # Check if expired
-            if datetime.now() > expires_dt:
-                # Delete expired entry
-                cursor.execute("DELETE FROM cache WHERE query_hash = ?", (query_hash,))
-                conn.commit()
-                conn.close()
+            now = datetime.now()
+
+            # Expired rows are left for the next eviction sweep or clear()
+            if now > datetime.fromisoformat(expires_at):
                 logger.debug(f"Cache expired for query hash {query_hash[:8]}...")
                 return None
 
-            # Update access stats
-            cursor.execute(
-                """
-                UPDATE cache
-                SET access_count = access_count + 1,
-                    last_accessed = ?
-                WHERE query_hash = ?
-            """,
-                (datetime.now().isoformat(), query_hash),
-            )
-
-            conn.commit()
-            conn.close()
+            self._record_hit(query_hash, now)
 
             logger.debug(f"Cache hit for query hash {query_hash[:8]}...")
             return response
@@ -174,6 +212,30 @@ class ResponseCache:
             logger.error(f"Failed to retrieve from cache: {e}")
             return None
 
+    def _record_hit(self, query_hash: str, when: datetime) -> None:
+        """Buffer a hit and flush once enough have accumulated."""
+        with self._hits_lock:
+            hits, _ = self._pending_hits.get(query_hash, (0, ""))
+            self._pending_hits[query_hash] = (hits + 1, when.isoformat())
+            should_flush = len(self._pending_hits) >= self.HIT_FLUSH_THRESHOLD
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered hit statistics in one transaction."""
+        with self._hits_lock:
+            if not self._pending_hits:
+                return
+            pending = self._pending_hits
+            self._pending_hits = {}
+
+        try:
+            conn = self._connect()
+            conn.executemany(self._HIT_SQL, [(hits, last, query_hash) for query_hash, (hits, last) in pending.items()])
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to flush cache statistics: {e}")
+
     def set(
         self,
         query: str,
@@ -200,16 +262,10 @@ class ResponseCache:
         expires_at = now + self.ttl
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO cache
-                (query_hash, query_text, response, model, backend, temperature,
-                 created_at, expires_at, access_count, last_accessed)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            conn = self._connect()
+            replacing = conn.execute(self._EXISTS_SQL, (query_hash,)).fetchone() is not None
+            conn.execute(
+                self._UPSERT_SQL,
                 (
                     query_hash,
                     query,
@@ -223,9 +279,12 @@ class ResponseCache:
                     now.isoformat(),
                 ),
             )
-
             conn.commit()
-            conn.close()
+            if not replacing:
+                self._row_count += 1
+
+            if self.max_entries is not None and self._row_count > self.max_entries:
+                self._evict()
 
             logger.debug(f"Cached response for query hash {query_hash[:8]}... (expires in {self.ttl})")
             return True
@@ -234,6 +293,23 @@ class ResponseCache:
             logger.error(f"Failed to store in cache: {e}")
             return False
 
+    def _evict(self) -> None:
+        """Drop expired rows, then least recently used rows down to the low-water mark."""
+        self.flush()
+        conn = self._connect()
+        expired = conn.execute("DELETE FROM cache WHERE expires_at < ?", (datetime.now().isoformat(),)).rowcount
+        self._row_count -= expired
+        excess = self._row_count - int(self.max_entries * self.EVICTION_LOW_WATER)
+        if excess > 0:
+            evicted = conn.execute(
+                "DELETE FROM cache WHERE id IN (SELECT id FROM cache ORDER BY last_accessed ASC LIMIT ?)",
+                (excess,),
+            ).rowcount
+            self._row_count -= evicted
+            logger.debug(f"Evicted {evicted} least recently used cache entries")
+        conn.commit()
+        self._row_count = max(0, self._row_count)
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
@@ -241,9 +317,9 @@ class ResponseCache:
         Returns:
             Dictionary with cache stats (size, hit rate, etc)
         """
+        self.flush()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connect().cursor()
 
             # Count total entries
             cursor.execute("SELECT COUNT(*) FROM cache")
@@ -266,8 +342,6 @@ class ResponseCache:
             # Get cache size
             cache_size = self.db_path.stat().st_size if self.db_path.exists() else 0
 
-            conn.close()
-
             hit_rate = total_accesses / max(1, total_entries) if total_entries > 0 else 0
 
             return {
@@ -277,6 +351,7 @@ class ResponseCache:
                 "total_accesses": total_accesses,
                 "hit_rate": round(hit_rate, 2),
                 "cache_size_mb": round(cache_size / (1024 * 1024), 2),
+                "max_entries": self.max_entries,
             }
 
         except Exception as e:
@@ -294,8 +369,9 @@ class ResponseCache:
         Returns:
             Number of entries removed
         """
+        self.flush()
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             if expired_only:
@@ -311,7 +387,7 @@ class ResponseCache:
 
             deleted_count = cursor.rowcount
             conn.commit()
-            conn.close()
+            self._row_count = max(0, self._row_count - deleted_count)
 
             logger.info(f"Cleared {deleted_count} cache entries")
             return deleted_count
@@ -326,9 +402,9 @@ class ResponseCache:
 
         Useful for finding all cached variants of the same question.
         """
+        self.flush()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connect().cursor()
 
             cursor.execute(
                 """
@@ -341,7 +417,6 @@ class ResponseCache:
             )
 
             results = cursor.fetchall()
-            conn.close()
 
             return [
                 {
@@ -359,5 +434,19 @@ class ResponseCache:
             logger.error(f"Failed to query cache: {e}")
             return []
 
+    def close(self) -> None:
+        """
+        Flush buffered statistics and close the calling thread's connection.
+
+        SQLite connections may only be closed by the thread that opened them;
+        connections opened by other threads are closed when those threads
+        exit and their thread-local storage is released.
+        """
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
 
 __all__ = ["ResponseCache"]
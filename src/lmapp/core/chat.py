@@ -10,6 +10,8 @@ import re
 from lmapp.backend.base import LLMBackend
 from lmapp.utils.logging import logger
 from lmapp.core.cache import ResponseCache
+from lmapp.core.context import ContextBuilder
+from lmapp.core.semantic_cache import SemanticResponseCache
 from lmapp.plugins.terminal import TerminalPlugin
 from lmapp.plugins.editor import EditorPlugin
 
@@ -41,13 +43,23 @@ class ChatMessage:
 class ChatSession:
     """Manages a single conversation session"""
 
-    def __init__(self, backend: LLMBackend, model: str = "tinyllama"):
+    def __init__(
+        self,
+        backend: LLMBackend,
+        model: str = "tinyllama",
+        semantic_cache: Optional[SemanticResponseCache] = None,
+        context_tokens: Optional[int] = ContextBuilder.DEFAULT_MAX_TOKENS,
+    ):
         """
         Initialize a chat session
 
         Args:
             backend: LLMBackend instance to use for chat
             model: Model name to use (default: tinyllama)
+            semantic_cache: Optional near-duplicate cache consulted after an
+                exact cache miss
+            context_tokens: Token budget for the prompt sent to the model; the
+                oldest turns are dropped to fit (None = unbounded)
 
         Raises:
             ValueError: If backend is not running
@@ -64,7 +76,9 @@ class ChatSession:
         self.model = model
         self.history: List[ChatMessage] = []
         self.created_at = datetime.now()
-        self.cache = ResponseCache()
+        self.context = ContextBuilder(max_tokens=context_tokens)
+        self.semantic_cache = semantic_cache
+        self.cache = semantic_cache.response_cache if semantic_cache else ResponseCache()
 
         # Agent capabilities
         self.agent_mode = False
@@ -94,16 +108,8 @@ You can chain multiple actions.
         logger.info("Agent mode enabled")
 
     def _build_prompt(self) -> str:
-        """Construct full prompt from history."""
-        full_prompt = ""
-        if self.system_prompt:
-            full_prompt += f"System: {self.system_prompt}\n\n"
-
-        for msg in self.history:
-            role = "User" if msg.role == "user" else "Assistant"
-            full_prompt += f"{role}: {msg.content}\n\n"
-
-        return full_prompt.strip()
+        """Construct the prompt from history, within the context token budget."""
+        return self.context.build(self.system_prompt, self.history)
 
     def _has_tool_call(self, text: str) -> bool:
         """Check if text contains a tool call."""
@@ -171,6 +177,8 @@ You can chain multiple actions.
         # Check cache for existing response
         # Note: Cache might be tricky with agents/history, but keeping for now
         cached_response = self.cache.get(prompt, self.model, self.backend.backend_name(), temperature)
+        if cached_response is None and self.semantic_cache is not None and not self.agent_mode:
+            cached_response = self.semantic_cache.get(prompt, self.model, self.backend.backend_name(), temperature)
         if cached_response and not self.agent_mode:
             logger.debug(f"Cache hit for prompt (model={self.model}, temperature={temperature})")
             self.history.append(ChatMessage("user", prompt))
@@ -224,7 +232,10 @@ You can chain multiple actions.
 
                 # If no tool call or not agent mode, we are done
                 # Cache the response (only the final one)
-                self.cache.set(prompt, response, self.model, self.backend.backend_name(), temperature)
+                if self.semantic_cache is not None:
+                    self.semantic_cache.set(prompt, response, self.model, self.backend.backend_name(), temperature)
+                else:
+                    self.cache.set(prompt, response, self.model, self.backend.backend_name(), temperature)
                 return response
 
             return response  # Return last response if max turns reached
@@ -295,6 +306,7 @@ You can chain multiple actions.
         """
         count = len(self.history)
         self.history.clear()
+        self.context.reset()
         return count
 
     def get_stats(self) -> Dict:
@@ -312,4 +324,5 @@ You can chain multiple actions.
             "assistant_messages": sum(1 for m in self.history if m.role == "assistant"),
             "created_at": self.created_at.isoformat(),
             "duration_seconds": (datetime.now() - self.created_at).total_seconds(),
+            **self.context.get_stats(),
         }
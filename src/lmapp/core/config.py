@@ -40,6 +40,7 @@ class LMAppConfig(BaseModel):
     # Advanced settings (future)
     max_tokens: Optional[int] = Field(default=None, description="Maximum tokens in response")
     timeout: int = Field(default=300, description="Request timeout in seconds")
+    context_tokens: int = Field(default=4096, ge=256, description="Token budget for chat history sent to the model")
 
     # Runtime flags (not saved to disk usually, but part of config object)
     assume_yes: bool = Field(default=False, description="Skip confirmation prompts (assume yes)")
@@ -58,6 +59,22 @@ class LMAppConfig(BaseModel):
         description="Enable auto-Agent Mode (autonomous tool use, Copilot-like behavior)",
     )
 
+    # Response cache
+    semantic_cache: bool = Field(
+        default=False,
+        description="Serve cached responses for rephrased prompts (near-duplicate matching)",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.9,
+        ge=0.0,
+        le=1.0,
+        description="Minimum similarity for a semantic cache hit (0.0-1.0)",
+    )
+    semantic_cache_embedding_model: str = Field(
+        default="nomic-embed-text",
+        description="Ollama embedding model used to compare prompts for the semantic cache",
+    )
+
     @field_validator("backend")
     @classmethod
     def validate_backend(cls, v):
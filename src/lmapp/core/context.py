@@ -0,0 +1,153 @@
+"""
+Conversation Context Builder
+Assembles chat prompts incrementally under a token budget
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from lmapp.utils.logging import logger
+
+# Summarizer(evicted_messages, previous_summary) -> new summary
+Summarizer = Callable[[List[Any], str], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class ContextBuilder:
+    """
+    Builds the prompt for a conversation from cached per-message segments.
+
+    Each message is formatted and measured once, when it first appears in the
+    history. Messages stay in a rolling window whose token total is kept up to
+    date; when the window no longer fits the budget, the oldest messages are
+    evicted (and optionally folded into a running summary). Building a prompt
+    therefore costs time proportional to the window, not to the session.
+
+    The builder assumes history is append-only between calls. If the history
+    shrinks or its last known message is replaced, it re-synchronises from
+    scratch.
+    """
+
+    DEFAULT_MAX_TOKENS = 4096
+
+    def __init__(self, max_tokens: Optional[int] = DEFAULT_MAX_TOKENS, summarizer: Optional[Summarizer] = None):
+        """
+        Initialize the context builder
+
+        Args:
+            max_tokens: Token budget for the whole prompt (None = unbounded)
+            summarizer: Optional callable that condenses evicted messages into
+                a summary kept at the top of the prompt
+        """
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self._system_prompt: Optional[str] = None
+        self._system_segment = ""
+        self._system_tokens = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all cached segments and any summary."""
+        self._window: Deque[Tuple[Any, str, int]] = deque()
+        self._window_tokens = 0
+        self._synced = 0
+        self._last: Any = None
+        self._summary = ""
+        self._summary_segment = ""
+        self._summary_tokens = 0
+        self._prompt: Optional[str] = None
+        self.evicted = 0
+
+    @staticmethod
+    def _format(message: Any) -> str:
+        role = "User" if message.role == "user" else "Assistant"
+        return f"{role}: {message.content}\n\n"
+
+    def _set_system_prompt(self, system_prompt: str) -> None:
+        if system_prompt != self._system_prompt:
+            self._system_prompt = system_prompt
+            self._system_segment = f"System: {system_prompt}\n\n" if system_prompt else ""
+            self._system_tokens = estimate_tokens(self._system_segment)
+            self._prompt = None
+
+    def _sync(self, history: Sequence[Any]) -> None:
+        """Segment any messages appended since the last build."""
+        if len(history) < self._synced or (self._synced and history[self._synced - 1] is not self._last):
+            logger.debug("Conversation history rewritten; rebuilding context")
+            self.reset()
+
+        for message in history[self._synced :]:
+            segment = self._format(message)
+            tokens = estimate_tokens(segment)
+            self._window.append((message, segment, tokens))
+            self._window_tokens += tokens
+            self._prompt = None
+
+        self._synced = len(history)
+        self._last = history[-1] if history else None
+
+    def _fit(self) -> None:
+        """Evict the oldest messages until the prompt fits the budget."""
+        if self.max_tokens is None:
+            return
+
+        # Always keep the newest message, even if it alone exceeds the budget
+        while len(self._window) > 1 and self.total_tokens > self.max_tokens:
+            evicted: List[Any] = []
+            while len(self._window) > 1 and self.total_tokens > self.max_tokens:
+                message, _, tokens = self._window.popleft()
+                self._window_tokens -= tokens
+                evicted.append(message)
+
+            self.evicted += len(evicted)
+            self._prompt = None
+            if self.summarizer is not None:
+                # A longer summary may push the prompt over budget again
+                self._summarize(evicted)
+
+    def _summarize(self, evicted: List[Any]) -> None:
+        self._summary = self.summarizer(evicted, self._summary)
+        self._summary_segment = f"Summary of earlier conversation: {self._summary}\n\n" if self._summary else ""
+        self._summary_tokens = estimate_tokens(self._summary_segment)
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens in the current prompt."""
+        return self._system_tokens + self._summary_tokens + self._window_tokens
+
+    def build(self, system_prompt: str, history: Sequence[Any]) -> str:
+        """
+        Assemble the prompt for the given system prompt and history
+
+        Args:
+            system_prompt: System prompt ("" for none)
+            history: Conversation messages (objects with role and content)
+
+        Returns:
+            Prompt text in "Role: content" blocks
+        """
+        self._set_system_prompt(system_prompt)
+        self._sync(history)
+        self._fit()
+
+        if self._prompt is None:
+            parts = [self._system_segment, self._summary_segment]
+            parts.extend(segment for _, segment, _ in self._window)
+            self._prompt = "".join(parts).strip()
+        return self._prompt
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Context window statistics."""
+        return {
+            "context_tokens": self.total_tokens,
+            "context_messages": len(self._window),
+            "evicted_messages": self.evicted,
+            "max_context_tokens": self.max_tokens,
+        }
+
+
+__all__ = ["ContextBuilder", "estimate_tokens"]
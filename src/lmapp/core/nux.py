@@ -7,10 +7,8 @@ Handles first-run setup and silent configuration.
 import time
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from lmapp.core.config import get_config_manager, LMAppConfig
-from lmapp.backend.detector import BackendDetector
 from lmapp.utils.logging import logger
 
 console = Console()
@@ -24,6 +22,9 @@ def check_first_run() -> bool:
 
 def run_user_mode_setup():
     """Run User Mode setup (formerly Silent Setup)"""
+    # Imported here: this module loads with the CLI, the progress display only on first run
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     console.print(Panel.fit("[bold blue]Welcome to lmapp![/bold blue]", border_style="blue"))
     console.print("Initializing User Mode... (this will only happen once)")
 
@@ -53,6 +54,8 @@ def run_user_mode_setup():
 
         # Step 2: Detect Backend
         task2 = progress.add_task("Detecting AI backend...", total=None)
+        from lmapp.backend.detector import BackendDetector
+
         detector = BackendDetector()
         backends = detector.detect_all()
 
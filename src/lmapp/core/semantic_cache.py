@@ -0,0 +1,325 @@
+"""
+Semantic Response Cache for LMAPP
+
+Near-duplicate lookup layered over ResponseCache. Each cached query is stored
+with an embedding; a new query whose embedding is within a similarity
+threshold of a cached one (same model, backend and temperature) is served the
+cached response instead of paying for a full generation.
+
+The embedder must capture meaning, not just wording: use a real embedding
+model such as the one configured via ``semantic_cache_embedding_model``.
+Lexical embedders (e.g. HashingEmbeddingModel, which is meant for tests)
+score "sort ascending" and "sort descending" as near-duplicates. As a further
+guard, a match is only served when both queries mention the same numbers and
+negations.
+"""
+
+import math
+import re
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from lmapp.core.cache import ResponseCache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+# Tokens that flip or change a query's meaning while barely moving its embedding
+_GUARD_TOKEN = re.compile(r"\d+(?:\.\d+)?|\b(?:not|no|never|none|nothing|nobody|neither|nor|without|cannot|\w+n't)\b")
+
+
+def _guard_terms(text: str) -> List[str]:
+    """Numbers and negations in a query, which must match for a cache hit."""
+    return sorted(_GUARD_TOKEN.findall(text.lower().replace("\u2019", "'")))
+
+
+def load_embedder(model_name: str, base_url: str = "http://localhost:11434") -> Optional[Any]:
+    """
+    Return the Ollama embedding model ``model_name`` if it is reachable.
+
+    Returns:
+        The embedder, or None if the model could not produce an embedding
+    """
+    from lmapp.rag.embedding import OllamaEmbeddingModel
+
+    embedder = OllamaEmbeddingModel(model_name=model_name, base_url=base_url)
+    embedder.embed_query("semantic cache probe")
+    if embedder.last_call_degraded:
+        embedder.close()
+        return None
+    return embedder
+
+
+class _VectorPartition:
+    """Normalised query vectors for one model/backend/temperature combination."""
+
+    def __init__(self):
+        self.hashes: List[str] = []
+        self.vectors: List[array] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix: Any = None
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def add(self, query_hash: str, vector: array) -> None:
+        position = self._positions.get(query_hash)
+        if position is not None:
+            self.vectors[position] = vector
+        else:
+            self._positions[query_hash] = len(self.hashes)
+            self.hashes.append(query_hash)
+            self.vectors.append(vector)
+        self._matrix = None
+
+    def remove(self, query_hash: str) -> None:
+        position = self._positions.pop(query_hash, None)
+        if position is None:
+            return
+        # Swap with the last row so removal stays O(1)
+        last = len(self.hashes) - 1
+        if position != last:
+            self.hashes[position] = self.hashes[last]
+            self.vectors[position] = self.vectors[last]
+            self._positions[self.hashes[position]] = position
+        self.hashes.pop()
+        self.vectors.pop()
+        self._matrix = None
+
+    def nearest(self, query: array, threshold: float, limit: int) -> List[Tuple[str, float]]:
+        """Best matches scoring at least ``threshold``, highest first."""
+        if not self.hashes:
+            return []
+
+        if np is not None:
+            if self._matrix is None:
+                self._matrix = np.array(self.vectors, dtype=np.float32)
+            scores = self._matrix @ np.frombuffer(query, dtype=np.float32)
+            hits = np.flatnonzero(scores >= threshold)
+            order = hits[np.argsort(-scores[hits], kind="stable")][:limit]
+            return [(self.hashes[i], float(scores[i])) for i in order]
+
+        matches = []
+        for query_hash, vector in zip(self.hashes, self.vectors):
+            score = sum(a * b for a, b in zip(vector, query))
+            if score >= threshold:
+                matches.append((query_hash, score))
+        matches.sort(key=lambda m: -m[1])
+        return matches[:limit]
+
+
+class SemanticResponseCache:
+    """
+    Serves cached responses for rephrased queries.
+
+    Responses themselves live in the wrapped ResponseCache, so TTL expiry and
+    eviction apply unchanged; this layer only keeps query embeddings in a
+    side table of the same database and a small in-memory vector index per
+    model/backend/temperature. Entries whose response has been evicted or has
+    expired are dropped from the index when they are next matched.
+    """
+
+    DEFAULT_THRESHOLD = 0.9
+    MAX_CANDIDATES = 3
+
+    def __init__(
+        self,
+        response_cache: Optional[ResponseCache] = None,
+        embedder: Optional[Any] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            response_cache: Exact-match cache that stores the responses
+            embedder: Semantic embedding model with
+                ``embed_query(text) -> List[float]`` (see ``load_embedder``)
+            threshold: Minimum cosine similarity for a query to count as a hit
+
+        Raises:
+            ValueError: If no embedder is given
+        """
+        if embedder is None:
+            raise ValueError("SemanticResponseCache requires a semantic embedding model")
+
+        self.response_cache = response_cache or ResponseCache()
+        self.embedder = embedder
+        self.threshold = threshold
+        self.embedder_id = f"{type(embedder).__name__}:{getattr(embedder, 'model_name', '')}"
+
+        self._partitions: Dict[str, _VectorPartition] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._init_table()
+        self._load()
+
+    def _init_table(self) -> None:
+        conn = self.response_cache._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS semantic_index (
+                query_hash TEXT PRIMARY KEY,
+                partition TEXT NOT NULL,
+                vector BLOB NOT NULL
+            )
+        """)
+        conn.commit()
+
+    def _load(self) -> None:
+        """Load vectors for entries still present in the response cache."""
+        conn = self.response_cache._connect()
+        conn.execute("DELETE FROM semantic_index WHERE query_hash NOT IN (SELECT query_hash FROM cache)")
+        conn.commit()
+        prefix = self.embedder_id + "|"
+        rows = conn.execute("SELECT query_hash, partition, vector FROM semantic_index").fetchall()
+        for query_hash, partition, blob in rows:
+            # Vectors from another embedder aren't comparable
+            if not partition.startswith(prefix):
+                continue
+            vector = array("f")
+            vector.frombytes(blob)
+            self._partitions.setdefault(partition, _VectorPartition()).add(query_hash, vector)
+        logger.debug(f"Semantic cache loaded {len(rows)} vectors")
+
+    def _partition_key(self, model: str, backend: str, temperature: float) -> str:
+        return f"{self.embedder_id}|{model}|{backend}|{temperature}"
+
+    def _embed(self, query: str) -> Optional[array]:
+        """Normalised float32 embedding, or None for an empty or fallback vector."""
+        values = self.embedder.embed_query(query.strip())
+        if getattr(self.embedder, "last_call_degraded", False):
+            # The embedder substituted placeholder vectors; they carry no meaning
+            return None
+        norm = math.sqrt(sum(v * v for v in values))
+        if not norm:
+            return None
+        return array("f", (v / norm for v in values))
+
+    def get(self, query: str, model: str, backend: str, temperature: float = 0.7) -> Optional[str]:
+        """
+        Return the response cached for the closest near-duplicate query.
+
+        Args:
+            query: The user's query
+            model: The LLM model used
+            backend: The backend system
+            temperature: The temperature parameter used
+
+        Returns:
+            The cached response, or None if no cached query is similar enough
+        """
+        partition_key = self._partition_key(model, backend, temperature)
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if not partition:
+                self.misses += 1
+                return None
+
+        vector = self._embed(query)
+        if vector is None:
+            self.misses += 1
+            return None
+
+        with self._lock:
+            matches = partition.nearest(vector, self.threshold, self.MAX_CANDIDATES)
+
+        guard = _guard_terms(query)
+        for query_hash, score in matches:
+            if _guard_terms(self._cached_query(query_hash) or "") != guard:
+                continue
+            response = self.response_cache.get_by_hash(query_hash)
+            if response is not None:
+                self.hits += 1
+                logger.debug(f"Semantic cache hit for query hash {query_hash[:8]}... (similarity={score:.3f})")
+                return response
+            self._forget(partition_key, query_hash)
+
+        self.misses += 1
+        return None
+
+    def set(
+        self,
+        query: str,
+        response: str,
+        model: str,
+        backend: str,
+        temperature: float = 0.7,
+    ) -> bool:
+        """
+        Store a response and index its query for near-duplicate lookups.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.response_cache.set(query, response, model, backend, temperature):
+            return False
+
+        vector = self._embed(query)
+        if vector is None:
+            return True
+
+        query_hash = self.response_cache._hash_query(query, model, backend, temperature)
+        partition_key = self._partition_key(model, backend, temperature)
+        try:
+            conn = self.response_cache._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO semantic_index (query_hash, partition, vector) VALUES (?, ?, ?)",
+                (query_hash, partition_key, vector.tobytes()),
+            )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to store semantic cache vector: {e}")
+            return False
+
+        with self._lock:
+            self._partitions.setdefault(partition_key, _VectorPartition()).add(query_hash, vector)
+        return True
+
+    def _cached_query(self, query_hash: str) -> Optional[str]:
+        row = self.response_cache._connect().execute("SELECT query_text FROM cache WHERE query_hash = ?", (query_hash,)).fetchone()
+        return row[0] if row else None
+
+    def _forget(self, partition_key: str, query_hash: str) -> None:
+        """Drop an entry whose response is no longer cached."""
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if partition is not None:
+                partition.remove(query_hash)
+        try:
+            conn = self.response_cache._connect()
+            conn.execute("DELETE FROM semantic_index WHERE query_hash = ?", (query_hash,))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to remove semantic cache vector: {e}")
+
+    def clear(self) -> None:
+        """Remove all indexed query vectors (responses are left in place)."""
+        with self._lock:
+            self._partitions.clear()
+        conn = self.response_cache._connect()
+        conn.execute("DELETE FROM semantic_index")
+        conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and index size."""
+        lookups = self.hits + self.misses
+        with self._lock:
+            indexed = sum(len(p) for p in self._partitions.values())
+        return {
+            "semantic_hits": self.hits,
+            "semantic_misses": self.misses,
+            "semantic_hit_rate": round(self.hits / lookups, 2) if lookups else 0.0,
+            "indexed_queries": indexed,
+            "partitions": len(self._partitions),
+            "threshold": self.threshold,
+        }
+
+
+__all__ = ["SemanticResponseCache", "load_embedder"]
@@ -2,7 +2,10 @@
 Session management for LMAPP - enables conversation context and history.
 
 Stores conversation history for multi-turn interactions with context preservation.
-Sessions are stored in ~/.lmapp/sessions/ with automatic management.
+Sessions are stored in ~/.lmapp/sessions/ with automatic management. Each
+session is an append-only journal ({id}.jsonl: a header record followed by one
+record per message), and index.jsonl holds one compact metadata record per
+session so listing never has to open the journals.
 
 Features:
 - Session creation and loading
@@ -13,6 +16,7 @@ Features:
 """
 
 import json
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, List, Any
@@ -90,6 +94,9 @@ class Session:
         self.metadata = metadata or {}
         self.messages: List[Message] = []
         self.last_accessed = datetime.utcnow().isoformat() + "Z"
+        # Journal state: messages already on disk and the header they were written under
+        self._journaled = 0
+        self._journal_header: Optional[str] = None
 
     def add_message(
         self,
@@ -158,6 +165,11 @@ class Session:
 class SessionManager:
     """Manages all LMAPP sessions."""
 
+    INDEX_FILE = "index.jsonl"
+    # The index is rewritten once it holds this many times more records than live sessions
+    INDEX_COMPACT_RATIO = 2
+    INDEX_COMPACT_MIN = 256
+
     def __init__(self, sessions_dir: Optional[Path] = None):
         """
         Initialize SessionManager.
@@ -171,7 +183,17 @@ class SessionManager:
 
         self.sessions_dir = Path(sessions_dir)
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.sessions_dir / self.INDEX_FILE
         self._current_session: Optional[Session] = None
+        self._index_records: Optional[int] = None
+        self._index_live = 0
+        self._unindexed_checked = False
+
+    def _journal_path(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.jsonl"
+
+    def _legacy_path(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.json"
 
     async def create_session(
         self,
@@ -186,19 +208,13 @@ class SessionManager:
 
     async def load_session(self, session_id: str) -> Optional[Session]:
         """Load a session from disk."""
-        session_file = self.sessions_dir / f"{session_id}.json"
-        if not session_file.exists():
-            return None
-
-        try:
-            async with aiofiles.open(session_file, "r") as f:
-                content = await f.read()
-                data = json.loads(content)
-            session = Session.from_dict(data)
-            self._current_session = session
-            return session
-        except (json.JSONDecodeError, IOError):
-            return None
+        for session_file in (self._journal_path(session_id), self._legacy_path(session_id)):
+            if session_file.exists():
+                session = await self._read_session_file(session_file)
+                if session is not None:
+                    self._current_session = session
+                return session
+        return None
 
     def get_current_session(self) -> Optional[Session]:
         """Get the current active session."""
@@ -210,72 +226,232 @@ class SessionManager:
 
     async def list_sessions(self) -> List[Dict[str, Any]]:
         """List all available sessions."""
-        sessions_info = []
+        entries = await self._read_index()
+        return sorted(entries.values(), key=lambda x: x["last_accessed"], reverse=True)
 
-        for session_file in sorted(self.sessions_dir.glob("*.json")):
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session."""
+        deleted = False
+        for session_file in (self._journal_path(session_id), self._legacy_path(session_id)):
             try:
-                async with aiofiles.open(session_file, "r") as f:
-                    content = await f.read()
-                    data = json.loads(content)
-                    session = Session.from_dict(data)
-                    sessions_info.append(
-                        {
-                            "session_id": session.session_id,
-                            "name": session.name,
-                            "created_at": session.created_at,
-                            "last_accessed": session.last_accessed,
-                            "message_count": len(session.messages),
-                            "summary": session.get_summary(),
-                        }
-                    )
-            except (json.JSONDecodeError, IOError):
+                session_file.unlink()
+                deleted = True
+            except FileNotFoundError:
                 continue
 
-        return sorted(sessions_info, key=lambda x: x["last_accessed"], reverse=True)
-
-    def delete_session(self, session_id: str) -> bool:
-        """Delete a session."""
-        session_file = self.sessions_dir / f"{session_id}.json"
-        try:
-            session_file.unlink()
-            if self._current_session and self._current_session.session_id == session_id:
-                self._current_session = None
-            return True
-        except FileNotFoundError:
+        if not deleted:
             return False
 
+        self._append_index({"session_id": session_id, "deleted": True})
+        if self._current_session and self._current_session.session_id == session_id:
+            self._current_session = None
+        return True
+
     async def cleanup_old_sessions(self, days: int = 30) -> int:
         """Delete sessions older than specified days. Returns count deleted."""
         cutoff = datetime.utcnow() - timedelta(days=days)
         deleted = 0
 
-        for session_file in self.sessions_dir.glob("*.json"):
+        for entry in list((await self._read_index()).values()):
             try:
-                async with aiofiles.open(session_file, "r") as f:
-                    content = await f.read()
-                    data = json.loads(content)
-                    created_at_str = data["created_at"].replace("Z", "")
-                    created_at = datetime.fromisoformat(created_at_str)
-
-                    if created_at < cutoff:
-                        self.delete_session(data["session_id"])
-                        deleted += 1
-            except (json.JSONDecodeError, IOError, ValueError):
+                created_at = datetime.fromisoformat(entry["created_at"].replace("Z", ""))
+            except (KeyError, AttributeError, ValueError):
                 continue
 
+            if created_at < cutoff and self.delete_session(entry["session_id"]):
+                deleted += 1
+
         return deleted
 
     async def _save_session(self, session: Session) -> None:
-        """Save a session to disk."""
-        session_file = self.sessions_dir / f"{session.session_id}.json"
-        async with aiofiles.open(session_file, "w") as f:
-            await f.write(json.dumps(session.to_dict(), indent=2))
+        """
+        Persist a session.
+
+        Messages added since the last save are appended to the journal; the
+        journal is only rewritten when it doesn't exist yet or the message
+        list has shrunk. Renames and metadata changes are appended as "meta"
+        records.
+        """
+        journal = self._journal_path(session.session_id)
+        header = self._header_snapshot(session)
+
+        if session._journaled > len(session.messages) or not journal.exists():
+            mode = "w"
+            records = [self._header_record(session)]
+            records.extend(self._message_record(msg) for msg in session.messages)
+        else:
+            mode = "a"
+            records = []
+            if header != session._journal_header:
+                records.append({"type": "meta", "name": session.name, "metadata": session.metadata})
+            records.extend(self._message_record(msg) for msg in session.messages[session._journaled :])
+
+        if records:
+            async with aiofiles.open(journal, mode) as f:
+                await f.write("".join(json.dumps(record) + "\n" for record in records))
+
+        if mode == "w":
+            # A session loaded from the old single-file format now lives in its journal
+            self._legacy_path(session.session_id).unlink(missing_ok=True)
+
+        session._journaled = len(session.messages)
+        session._journal_header = header
+
+        self._append_index(self._index_entry(session))
+        if self._index_records is None or self._index_needs_compaction():
+            await self._read_index()
 
     async def save_current_session(self) -> None:
         """Save the current session to disk."""
         if self._current_session:
             await self._save_session(self._current_session)
 
+    @staticmethod
+    def _header_snapshot(session: Session) -> str:
+        return json.dumps({"name": session.name, "metadata": session.metadata}, sort_keys=True)
+
+    @staticmethod
+    def _header_record(session: Session) -> Dict[str, Any]:
+        return {
+            "type": "session",
+            "session_id": session.session_id,
+            "name": session.name,
+            "created_at": session.created_at,
+            "last_accessed": session.last_accessed,
+            "metadata": session.metadata,
+        }
+
+    @staticmethod
+    def _message_record(message: Message) -> Dict[str, Any]:
+        return {"type": "message", **message.to_dict()}
+
+    @staticmethod
+    def _index_entry(session: Session) -> Dict[str, Any]:
+        return {
+            "session_id": session.session_id,
+            "name": session.name,
+            "created_at": session.created_at,
+            "last_accessed": session.last_accessed,
+            "message_count": len(session.messages),
+            "summary": session.get_summary(),
+        }
+
+    @classmethod
+    def _parse_journal(cls, content: str) -> Optional[Session]:
+        """Rebuild a session from its journal records."""
+        session: Optional[Session] = None
+        for line in content.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn trailing line from an interrupted append
+                continue
+
+            kind = record.pop("type", "message")
+            if kind == "session":
+                session = Session(
+                    session_id=record["session_id"],
+                    name=record.get("name"),
+                    created_at=record.get("created_at"),
+                    metadata=record.get("metadata", {}),
+                )
+                session.last_accessed = record.get("last_accessed", session.last_accessed)
+            elif session is None:
+                continue
+            elif kind == "meta":
+                session.name = record.get("name", session.name)
+                session.metadata = record.get("metadata", session.metadata)
+            else:
+                session.messages.append(Message.from_dict(record))
+
+        if session is None:
+            return None
+
+        if session.messages:
+            session.last_accessed = session.messages[-1].timestamp
+        session._journaled = len(session.messages)
+        session._journal_header = cls._header_snapshot(session)
+        return session
+
+    async def _read_session_file(self, session_file: Path) -> Optional[Session]:
+        """Read a journal (.jsonl) or a legacy single-document session (.json)."""
+        try:
+            async with aiofiles.open(session_file, "r") as f:
+                content = await f.read()
+            if session_file.suffix == ".jsonl":
+                return self._parse_journal(content)
+            return Session.from_dict(json.loads(content))
+        except (json.JSONDecodeError, IOError, KeyError):
+            return None
+
+    def _append_index(self, *records: Dict[str, Any]) -> None:
+        """Append records to the index; the last record for a session wins."""
+        with open(self.index_file, "a") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        if self._index_records is not None:
+            self._index_records += len(records)
+
+    def _index_needs_compaction(self) -> bool:
+        if self._index_records is None:
+            return False
+        return self._index_records > max(self.INDEX_COMPACT_MIN, self.INDEX_COMPACT_RATIO * self._index_live)
+
+    async def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Current index entries by session id, compacting the index file if it has grown stale."""
+        entries: Dict[str, Dict[str, Any]] = {}
+        records = 0
+        index_exists = self.index_file.exists()
+
+        if index_exists:
+            async with aiofiles.open(self.index_file, "r") as f:
+                content = await f.read()
+            for line in content.splitlines():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records += 1
+                if record.get("deleted"):
+                    entries.pop(record["session_id"], None)
+                else:
+                    entries[record["session_id"]] = record
+
+        if not self._unindexed_checked:
+            # Once per manager: pick up legacy .json sessions, and rebuild from
+            # the journals if the index itself is missing
+            self._unindexed_checked = True
+            found = await self._scan_unindexed(entries, include_journals=not index_exists)
+            if found:
+                self._append_index(*found)
+                records += len(found)
+                entries.update((entry["session_id"], entry) for entry in found)
+
+        self._index_records = records
+        self._index_live = len(entries)
+        if self._index_needs_compaction():
+            self._compact_index(entries)
+        return entries
+
+    async def _scan_unindexed(self, entries: Dict[str, Dict[str, Any]], include_journals: bool) -> List[Dict[str, Any]]:
+        patterns = ["*.json", "*.jsonl"] if include_journals else ["*.json"]
+        found = []
+        for pattern in patterns:
+            for session_file in sorted(self.sessions_dir.glob(pattern)):
+                if session_file == self.index_file or session_file.stem in entries:
+                    continue
+                session = await self._read_session_file(session_file)
+                if session is not None:
+                    found.append(self._index_entry(session))
+        return found
+
+    def _compact_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Rewrite the index with one record per live session."""
+        tmp_file = self.index_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries.values()))
+        os.replace(tmp_file, self.index_file)
+        self._index_records = self._index_live = len(entries)
+
 
 # Global session manager instance
 _session_manager: Optional[SessionManager] = None
@@ -10,6 +10,8 @@ import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
+from lmapp.utils.bounded_cache import BoundedCache
+
 from .plugin_manager import BasePlugin, PluginMetadata
 
 
@@ -45,45 +47,40 @@ class SimpleLRUCache:
     def __init__(self, max_size_mb: int = 100):
         self.max_size_mb = max_size_mb
         self.max_size_bytes = max_size_mb * 1024 * 1024
-        self.entries: Dict[str, CacheEntry] = {}
+        self.entries: BoundedCache[str, CacheEntry] = BoundedCache(max_bytes=self.max_size_bytes, size_of=lambda entry: entry.size_bytes)
         self.hits = 0
         self.misses = 0
 
     def set(self, key: str, value: Any, ttl_seconds: int = 3600) -> bool:
-        """Set cache entry with TTL"""
+        """Set cache entry with TTL; False if the value is larger than the whole cache"""
         value_str = json.dumps(value) if not isinstance(value, str) else value
         size_bytes = len(value_str.encode())
 
-        # Check if adding this would exceed size limit
-        current_size = sum(e.size_bytes for e in self.entries.values())
-        if current_size + size_bytes > self.max_size_bytes:
-            # Evict LRU entry
-            self._evict_lru()
-
+        now = time.time()
         entry = CacheEntry(
             key=key,
             value=value,
-            created_at=time.time(),
-            accessed_at=time.time(),
+            created_at=now,
+            accessed_at=now,
             ttl_seconds=ttl_seconds,
             size_bytes=size_bytes,
         )
 
-        self.entries[key] = entry
-        return True
+        # Evicts least recently used entries until the new one fits
+        self.entries.set(key, entry, size=size_bytes)
+        return key in self.entries
 
     def get(self, key: str) -> Tuple[Optional[Any], bool]:
         """Get cache entry, returns (value, is_hit)"""
-        if key not in self.entries:
+        entry = self.entries.get(key)
+        if entry is None:
             self.misses += 1
             return None, False
 
-        entry = self.entries[key]
-
         # Check if expired
         age_seconds = time.time() - entry.created_at
         if age_seconds > entry.ttl_seconds:
-            del self.entries[key]
+            self.entries.pop(key)
             self.misses += 1
             return None, False
 
@@ -100,13 +97,19 @@ class SimpleLRUCache:
         expired_keys = [k for k, e in self.entries.items() if (current_time - e.created_at) > e.ttl_seconds]
 
         for key in expired_keys:
-            del self.entries[key]
+            self.entries.pop(key)
 
         return len(expired_keys)
 
+    def clear(self) -> int:
+        """Remove all entries, return count removed"""
+        removed = len(self.entries)
+        self.entries.clear()
+        return removed
+
     def get_stats(self) -> CacheStats:
         """Get cache statistics"""
-        total_size = sum(e.size_bytes for e in self.entries.values())
+        total_size = self.entries.total_bytes
         total_size_mb = total_size / (1024 * 1024)
 
         total_accesses = self.hits + self.misses
@@ -136,11 +139,8 @@ class SimpleLRUCache:
 
     def _evict_lru(self) -> None:
         """Evict least recently used entry"""
-        if not self.entries:
-            return
-
-        lru_key = min(self.entries.keys(), key=lambda k: self.entries[k].accessed_at)
-        del self.entries[lru_key]
+        if self.entries:
+            self.entries.popitem()
 
 
 class CacheManagerPlugin(BasePlugin):
@@ -310,16 +310,13 @@ class CacheManagerPlugin(BasePlugin):
         cleared = 0
 
         if cache_type in ["all", "response"]:
-            cleared += len(self.response_cache.entries)
-            self.response_cache.entries = {}
+            cleared += self.response_cache.clear()
 
         if cache_type in ["all", "rag"]:
-            cleared += len(self.rag_cache.entries)
-            self.rag_cache.entries = {}
+            cleared += self.rag_cache.clear()
 
         if cache_type in ["all", "search"]:
-            cleared += len(self.search_cache.entries)
-            self.search_cache.entries = {}
+            cleared += self.search_cache.clear()
 
         return {
             "status": "success",
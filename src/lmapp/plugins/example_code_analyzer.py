@@ -26,7 +26,7 @@ Supported Languages:
 - Generic patterns for any language
 """
 
-from typing import Dict, Optional, Any, Callable, List
+from typing import Dict, Optional, Any, Callable, Iterator, List, Tuple
 from dataclasses import dataclass, field
 import re
 
@@ -58,6 +58,174 @@ class CodeIssue:
         }
 
 
+@dataclass(frozen=True, eq=False)
+class PatternRule:
+    """A detection rule: each of its patterns that matches a line reports an issue."""
+
+    rule_id: str
+    severity: str
+    issue_type: str
+    message: str
+    suggestion: str
+    patterns: Tuple[str, ...]
+
+
+def _class_end(pattern: str, start: int) -> int:
+    """Index just past the character class starting at ``start``."""
+    i = start + 1
+    if pattern.startswith("^", i):
+        i += 1
+    if pattern.startswith("]", i):
+        i += 1
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+        elif pattern[i] == "]":
+            return i + 1
+        else:
+            i += 1
+    return len(pattern)
+
+
+def _group_end(pattern: str, start: int) -> int:
+    """Index just past the group opening at ``start``."""
+    depth = 0
+    i = start
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            i = _class_end(pattern, i)
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(pattern)
+
+
+def _relax_pattern(pattern: str) -> Optional[str]:
+    """
+    Drop lookarounds and anchors from a pattern.
+
+    Searched over a whole file, the result matches wherever the original
+    matches within a single line, even though lookarounds and anchors would
+    otherwise see neighbouring lines. Returns None for patterns that cannot
+    be relaxed safely (backreferences, conditionals, quantified assertions).
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            escape = pattern[i : i + 2]
+            if escape[1:].isdigit():
+                return None
+            i += 2
+            if escape in ("\\A", "\\Z"):
+                if pattern[i : i + 1] in ("*", "+", "?", "{"):
+                    return None
+                continue
+            out.append(escape)
+        elif c == "[":
+            end = _class_end(pattern, i)
+            out.append(pattern[i:end])
+            i = end
+        elif pattern.startswith(("(?P=", "(?("), i):
+            return None
+        elif pattern.startswith(("(?=", "(?!", "(?<=", "(?<!"), i) or c in "^$":
+            i = _group_end(pattern, i) if c == "(" else i + 1
+            if pattern[i : i + 1] in ("*", "+", "?", "{"):
+                return None
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+class RuleMatcher:
+    """
+    Rules compiled into a single matcher that scans source text in one pass.
+
+    All patterns are joined into one alternation that is searched over the
+    whole text, so lines that no rule can match are skipped inside the regex
+    engine without any per-line Python work. The scanner uses relaxed copies
+    of the patterns (see ``_relax_pattern``) so it never skips a line that a
+    rule matches; each line it stops on is then checked against the original
+    compiled patterns. Results are identical to searching every pattern in
+    every line.
+    """
+
+    def __init__(self, rules: List[PatternRule], flags: int = re.IGNORECASE):
+        """
+        Compile rules into a matcher.
+
+        Args:
+            rules: Detection rules, in reporting order
+            flags: Regex flags applied to every pattern
+        """
+        self.rules = list(rules)
+        self._checks = [(rule, re.compile(pattern, flags)) for rule in self.rules for pattern in rule.patterns]
+        self._scanner = None
+
+        relaxed = [_relax_pattern(check.pattern) for _, check in self._checks]
+        if relaxed and None not in relaxed:
+            try:
+                self._scanner = re.compile("|".join(f"(?:{pattern})" for pattern in relaxed), flags)
+            except re.error:
+                pass  # e.g. inline global flags; fall back to checking every line
+
+    def scan(self, code: str) -> Iterator[Tuple[PatternRule, int, int]]:
+        """
+        Find rule matches in source code.
+
+        Args:
+            code: Source code (lines separated by "\\n")
+
+        Yields:
+            (rule, line number, indentation column) for each matching pattern,
+            in line order
+        """
+        if not self._checks:
+            return
+        for line_no, line in self._candidate_lines(code):
+            column = len(line) - len(line.lstrip())
+            for rule, check in self._checks:
+                if check.search(line):
+                    yield rule, line_no, column
+
+    def _candidate_lines(self, code: str) -> Iterator[Tuple[int, str]]:
+        """Lines on which some pattern may match, with their line numbers."""
+        if self._scanner is None:
+            yield from enumerate(code.split("\n"), 1)
+            return
+
+        search = self._scanner.search
+        pos = 0
+        line_no = 1
+        counted = 0
+
+        while pos <= len(code):
+            match = search(code, pos)
+            if match is None:
+                return
+
+            line_start = code.rfind("\n", 0, match.start()) + 1
+            line_end = code.find("\n", match.start())
+            if line_end < 0:
+                line_end = len(code)
+
+            line_no += code.count("\n", counted, line_start)
+            counted = line_start
+            yield line_no, code[line_start:line_end]
+            pos = line_end + 1
+
+
 @dataclass
 class AnalysisResult:
     """Result of code analysis."""
@@ -107,6 +275,10 @@ class AnalysisResult:
         }
 
 
+# Compiled matchers, shared by all analyzer instances: {(class, language, strict): matcher}
+_MATCHERS: Dict[Tuple[type, str, bool], RuleMatcher] = {}
+
+
 class CodeAnalyzerPlugin(BasePlugin):
     """
     Code Analyzer plugin for static code analysis.
@@ -158,7 +330,7 @@ class CodeAnalyzerPlugin(BasePlugin):
             "patterns": [
                 r"for\s+.*\s+in\s+.*:\s*.*\.append\(",  # List append in loop (consider list comprehension)
                 r"str\s*\+\s*=\s*(?!f['\"])",  # String concatenation in loop
-                r"(?:.*\s+)?=\s*\[\s*\].*for",  # List comprehension opportunity
+                r"=\s*\[\s*\].*for",  # List comprehension opportunity
             ],
             "message": "Performance optimization opportunity",
             "suggestion": "Consider using list comprehension or more efficient method",
@@ -244,6 +416,42 @@ class CodeAnalyzerPlugin(BasePlugin):
 
         return min(complexity, 10)  # Cap at 10
 
+    def _build_rules(self, language: str) -> List[PatternRule]:
+        """
+        Build the detection rules for a language, in reporting order.
+
+        The pattern tables are currently shared by all languages; style
+        rules are only included in strict mode.
+        """
+        groups = [
+            (self.CRITICAL_PATTERNS, "critical", "bug"),
+            (self.HIGH_PATTERNS, "high", "bug"),
+            (self.MEDIUM_PATTERNS, "medium", "performance"),  # Always check performance
+        ]
+        if self.strict_mode:
+            groups.append((self.STYLE_PATTERNS, "low", "style"))
+
+        return [
+            PatternRule(
+                rule_id=issue_name,
+                severity=severity,
+                issue_type=issue_type,
+                message=str(issue_def["message"]),
+                suggestion=str(issue_def["suggestion"]),
+                patterns=tuple(issue_def["patterns"]),
+            )
+            for patterns, severity, issue_type in groups
+            for issue_name, issue_def in patterns.items()
+        ]
+
+    def _get_matcher(self, language: str) -> RuleMatcher:
+        """Get the compiled matcher for a language, compiling it on first use."""
+        key = (type(self), language, self.strict_mode)
+        matcher = _MATCHERS.get(key)
+        if matcher is None:
+            matcher = _MATCHERS[key] = RuleMatcher(self._build_rules(language))
+        return matcher
+
     def _detect_issues(self, code: str, language: str) -> List[CodeIssue]:
         """
         Detect issues in code.
@@ -253,82 +461,25 @@ class CodeAnalyzerPlugin(BasePlugin):
             language: Programming language
 
         Returns:
-            List of CodeIssue objects
+            List of CodeIssue objects, grouped by rule in reporting order
         """
-        issues = []
-        lines = code.split("\n")
-
-        # Detect critical issues
-        for issue_name, issue_def in self.CRITICAL_PATTERNS.items():
-            for line_no, line in enumerate(lines, 1):
-                for pattern in issue_def["patterns"]:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        issues.append(
-                            CodeIssue(
-                                severity="critical",
-                                issue_type="bug",
-                                line=line_no,
-                                column=len(line) - len(line.lstrip()),
-                                message=str(issue_def["message"]),
-                                suggestion=str(issue_def["suggestion"]),
-                                pattern=issue_name,
-                            )
-                        )
-
-        # Detect high severity issues
-        for issue_name, issue_def in self.HIGH_PATTERNS.items():
-            for line_no, line in enumerate(lines, 1):
-                for pattern in issue_def["patterns"]:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        issues.append(
-                            CodeIssue(
-                                severity="high",
-                                issue_type="bug",
-                                line=line_no,
-                                column=len(line) - len(line.lstrip()),
-                                message=str(issue_def["message"]),
-                                suggestion=str(issue_def["suggestion"]),
-                                pattern=issue_name,
-                            )
-                        )
-
-        # Detect medium severity issues (performance)
-        if not self.strict_mode or True:  # Always check performance
-            for issue_name, issue_def in self.MEDIUM_PATTERNS.items():
-                for line_no, line in enumerate(lines, 1):
-                    for pattern in issue_def["patterns"]:
-                        if re.search(pattern, line, re.IGNORECASE):
-                            issues.append(
-                                CodeIssue(
-                                    severity="medium",
-                                    issue_type="performance",
-                                    line=line_no,
-                                    column=len(line) - len(line.lstrip()),
-                                    message=str(issue_def["message"]),
-                                    suggestion=str(issue_def["suggestion"]),
-                                    pattern=issue_name,
-                                )
-                            )
-
-        # Detect style issues (only in strict mode)
-        if self.strict_mode:
-            for issue_name, issue_def in self.STYLE_PATTERNS.items():
-                for line_no, line in enumerate(lines, 1):
-                    for pattern in issue_def["patterns"]:
-                        if re.search(pattern, line, re.IGNORECASE):
-                            issues.append(
-                                CodeIssue(
-                                    severity="low",
-                                    issue_type="style",
-                                    line=line_no,
-                                    column=len(line) - len(line.lstrip()),
-                                    message=str(issue_def["message"]),
-                                    suggestion=str(issue_def["suggestion"]),
-                                    pattern=issue_name,
-                                )
-                            )
-
-        return issues
+        matcher = self._get_matcher(language)
+        issues_by_rule: Dict[PatternRule, List[CodeIssue]] = {rule: [] for rule in matcher.rules}
+
+        for rule, line_no, column in matcher.scan(code):
+            issues_by_rule[rule].append(
+                CodeIssue(
+                    severity=rule.severity,
+                    issue_type=rule.issue_type,
+                    line=line_no,
+                    column=column,
+                    message=rule.message,
+                    suggestion=rule.suggestion,
+                    pattern=rule.rule_id,
+                )
+            )
+
+        return [issue for issues in issues_by_rule.values() for issue in issues]
 
     def execute(self, *args, **kwargs) -> Dict[str, Any]:
         """
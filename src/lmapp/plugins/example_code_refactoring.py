@@ -9,9 +9,11 @@ License: MIT
 """
 
 import ast
+import hashlib
 import re
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from lmapp.plugins.plugin_manager import BasePlugin, PluginMetadata
 
@@ -39,9 +41,127 @@ class RefactoringResult:
     error: Optional[str] = None
 
 
+# Nodes that add a branch to a function's cyclomatic complexity
+_BRANCH_NODES = frozenset({ast.If, ast.While, ast.For, ast.ExceptHandler, ast.BoolOp})
+
+
+@dataclass
+class FunctionInfo:
+    """Facts about a function, including any functions nested inside it."""
+
+    node: ast.FunctionDef
+    assigned: Set[str] = field(default_factory=set)
+    used: Set[str] = field(default_factory=set)
+    complexity: int = 1
+
+
+class SourceAnalysis:
+    """
+    Everything the refactoring actions need to know about one source text.
+
+    The code is parsed at most once, on first use, and a single traversal
+    collects every node category the checks look at. Traversal is
+    breadth-first like ``ast.walk``, so results come out in the same order
+    as walking the tree once per check.
+    """
+
+    def __init__(self, code: str):
+        """
+        Create an analysis context for the given code.
+
+        Args:
+            code: Python source
+        """
+        self.code = code
+        self.lines = code.split("\n")
+        self.tree: Optional[ast.AST] = None
+        self.syntax_error: Optional[SyntaxError] = None
+        self._parsed = False
+
+        self.functions: List[FunctionInfo] = []
+        self.classes: List[ast.ClassDef] = []
+        self.definitions: List[ast.stmt] = []  # functions and classes, in traversal order
+        self.imports: List[ast.stmt] = []
+        self.except_handlers: List[ast.ExceptHandler] = []
+        self.names: List[ast.Name] = []
+        self.loaded_names: Set[str] = set()
+
+    @staticmethod
+    def key(code: str) -> str:
+        """Cache key for a source text."""
+        return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def parse(self) -> bool:
+        """
+        Parse and index the code, if not done yet.
+
+        Returns:
+            True if the code is valid Python
+        """
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self.tree = ast.parse(self.code)
+            except SyntaxError as e:
+                self.syntax_error = e
+            else:
+                self._collect(self.tree)
+        return self.tree is not None
+
+    def _collect(self, tree: ast.AST) -> None:
+        """Index all node categories in one breadth-first pass."""
+        # Each entry carries the functions enclosing the node, so per-function
+        # facts include nested code exactly as walking each function would.
+        # Parsed trees only contain the exact ast node classes, so dispatch on type().
+        todo: deque = deque([(tree, ())])
+        pop, push, children = todo.popleft, todo.append, ast.iter_child_nodes
+        while todo:
+            node, enclosing = pop()
+            kind = type(node)
+
+            if kind is ast.Name:
+                self.names.append(node)
+                if type(node.ctx) is ast.Load:
+                    self.loaded_names.add(node.id)
+                    for info in enclosing:
+                        info.used.add(node.id)
+                continue  # a Name's only child is its ctx
+            elif kind is ast.FunctionDef:
+                info = FunctionInfo(node)
+                self.functions.append(info)
+                self.definitions.append(node)
+                enclosing = enclosing + (info,)
+            elif kind is ast.ClassDef:
+                self.classes.append(node)
+                self.definitions.append(node)
+            elif kind is ast.Import or kind is ast.ImportFrom:
+                self.imports.append(node)
+            elif kind is ast.Assign:
+                targets = [target.id for target in node.targets if type(target) is ast.Name]
+                for info in enclosing:
+                    info.assigned.update(targets)
+            elif kind in _BRANCH_NODES:
+                for info in enclosing:
+                    info.complexity += 1
+                if kind is ast.ExceptHandler:
+                    self.except_handlers.append(node)
+
+            for child in children(node):
+                push((child, enclosing))
+
+
 class CodeRefactoringPlugin(BasePlugin):
     """Analyze Python code and suggest refactorings."""
 
+    # Analysis contexts kept for recently seen sources
+    CONTEXT_CACHE_SIZE = 16
+    # Consecutive significant lines that make up a duplicate block
+    DUPLICATE_WINDOW = 3
+
+    def __init__(self):
+        """Initialize the refactoring plugin."""
+        self._contexts: "OrderedDict[str, SourceAnalysis]" = OrderedDict()
+
     @property
     def metadata(self) -> PluginMetadata:
         """Plugin metadata."""
@@ -62,11 +182,15 @@ class CodeRefactoringPlugin(BasePlugin):
     def execute(self, action: str, code: str = "", **kwargs) -> Dict[str, Any]:
         """Execute refactoring action.
 
+        Actions share one parsed analysis per distinct source, so running
+        several actions on the same code parses it once.
+
         Actions:
             - "analyze": Detect issues in code
             - "suggest_names": Suggest better variable/function names
             - "complexity": Analyze cyclomatic complexity
-            - "duplicates": Find duplicate code patterns
+            - "duplicates": Find duplicate code patterns (``window`` sets the
+              minimum block length in lines)
         """
         if action == "analyze":
             return self._analyze_code(code)
@@ -75,31 +199,42 @@ class CodeRefactoringPlugin(BasePlugin):
         elif action == "complexity":
             return self._analyze_complexity(code)
         elif action == "duplicates":
-            return self._find_duplicates(code)
+            return self._find_duplicates(code, kwargs.get("window", self.DUPLICATE_WINDOW))
         return {
             "success": False,
             "error": f"Unknown action: {action}",
         }
 
+    def _get_context(self, code: str) -> SourceAnalysis:
+        """Get the analysis context for a source, reusing a cached one."""
+        key = SourceAnalysis.key(code)
+        context = self._contexts.get(key)
+        if context is None:
+            context = self._contexts[key] = SourceAnalysis(code)
+            if len(self._contexts) > self.CONTEXT_CACHE_SIZE:
+                self._contexts.popitem(last=False)
+        else:
+            self._contexts.move_to_end(key)
+        return context
+
     def _analyze_code(self, code: str) -> Dict[str, Any]:
         """Analyze code for issues and improvements."""
         result = RefactoringResult(success=True)
 
         # Try to parse the code
-        try:
-            tree = ast.parse(code)
-        except SyntaxError as e:
+        context = self._get_context(code)
+        if not context.parse():
             return {
                 "success": False,
-                "error": f"Syntax error: {str(e)}",
+                "error": f"Syntax error: {str(context.syntax_error)}",
             }
 
         # Run all checks
-        result.issues.extend(self._check_dead_code(tree, code))
-        result.issues.extend(self._check_naming(tree))
-        result.issues.extend(self._check_complexity(tree))
-        result.issues.extend(self._check_imports(tree))
-        result.issues.extend(self._check_except_clauses(tree))
+        result.issues.extend(self._check_dead_code(context))
+        result.issues.extend(self._check_naming(context))
+        result.issues.extend(self._check_complexity(context))
+        result.issues.extend(self._check_imports(context))
+        result.issues.extend(self._check_except_clauses(context))
 
         # Calculate metrics
         result.metrics = {
@@ -108,9 +243,9 @@ class CodeRefactoringPlugin(BasePlugin):
             "high": sum(1 for i in result.issues if i.severity == "high"),
             "medium": sum(1 for i in result.issues if i.severity == "medium"),
             "low": sum(1 for i in result.issues if i.severity == "low"),
-            "lines_of_code": len(code.split("\n")),
-            "functions": sum(1 for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)),
-            "classes": sum(1 for node in ast.walk(tree) if isinstance(node, ast.ClassDef)),
+            "lines_of_code": len(context.lines),
+            "functions": len(context.functions),
+            "classes": len(context.classes),
         }
 
         return {
@@ -128,46 +263,30 @@ class CodeRefactoringPlugin(BasePlugin):
             "metrics": result.metrics,
         }
 
-    def _check_dead_code(self, tree: ast.AST, code: str) -> List[RefactoringIssue]:
+    def _check_dead_code(self, context: SourceAnalysis) -> List[RefactoringIssue]:
         """Detect dead code patterns."""
         issues = []
 
         # Check for unused variables
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Get all assigned variables
-                assigned = set()
-                used = set()
-
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Assign):
-                        for target in child.targets:
-                            if isinstance(target, ast.Name):
-                                assigned.add(target.id)
-                    elif isinstance(child, ast.Name):
-                        if isinstance(child.ctx, ast.Load):
-                            used.add(child.id)
-
-                # Find unused
-                unused = assigned - used - {"self", "cls"}
-                for var in unused:
-                    issues.append(
-                        RefactoringIssue(
-                            issue_type="unused_variable",
-                            severity="medium",
-                            line_number=node.lineno,
-                            description=f"Variable '{var}' is assigned but never used",
-                            suggestion=f"Remove variable '{var}' or use it in the code",
-                        )
+        for info in context.functions:
+            unused = info.assigned - info.used - {"self", "cls"}
+            for var in unused:
+                issues.append(
+                    RefactoringIssue(
+                        issue_type="unused_variable",
+                        severity="medium",
+                        line_number=info.node.lineno,
+                        description=f"Variable '{var}' is assigned but never used",
+                        suggestion=f"Remove variable '{var}' or use it in the code",
                     )
+                )
 
         return issues
 
-    def _check_naming(self, tree: ast.AST) -> List[RefactoringIssue]:
+    def _check_naming(self, context: SourceAnalysis) -> List[RefactoringIssue]:
         """Check for poor naming conventions."""
         issues = []
-
-        for node in ast.walk(tree):
+        for node in context.definitions:
             # Check function names
             if isinstance(node, ast.FunctionDef):
                 if not self._is_valid_snake_case(node.name):
@@ -182,103 +301,85 @@ class CodeRefactoringPlugin(BasePlugin):
                     )
 
             # Check class names
-            elif isinstance(node, ast.ClassDef):
-                if not self._is_valid_class_case(node.name):
-                    issues.append(
-                        RefactoringIssue(
-                            issue_type="naming",
-                            severity="low",
-                            line_number=node.lineno,
-                            description=f"Class name '{node.name}' should be PascalCase",
-                            suggestion=f"Rename to: {self._to_pascal_case(node.name)}",
-                        )
+            elif not self._is_valid_class_case(node.name):
+                issues.append(
+                    RefactoringIssue(
+                        issue_type="naming",
+                        severity="low",
+                        line_number=node.lineno,
+                        description=f"Class name '{node.name}' should be PascalCase",
+                        suggestion=f"Rename to: {self._to_pascal_case(node.name)}",
                     )
+                )
 
         return issues
 
-    def _check_complexity(self, tree: ast.AST) -> List[RefactoringIssue]:
+    def _check_complexity(self, context: SourceAnalysis) -> List[RefactoringIssue]:
         """Check for high cyclomatic complexity."""
         issues = []
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                complexity = self._calculate_complexity(node)
-                severity = "low"
-                if complexity >= 10:
-                    severity = "high"
-                elif complexity >= 8:
-                    severity = "medium"
-
-                if complexity > 5:
-                    issues.append(
-                        RefactoringIssue(
-                            issue_type="complexity",
-                            severity=severity,
-                            line_number=node.lineno,
-                            description=f"Function '{node.name}' has high cyclomatic complexity ({complexity})",
-                            suggestion="Consider breaking down this function into smaller, more focused functions",
-                        )
+        for info in context.functions:
+            complexity = info.complexity
+            severity = "low"
+            if complexity >= 10:
+                severity = "high"
+            elif complexity >= 8:
+                severity = "medium"
+
+            if complexity > 5:
+                issues.append(
+                    RefactoringIssue(
+                        issue_type="complexity",
+                        severity=severity,
+                        line_number=info.node.lineno,
+                        description=f"Function '{info.node.name}' has high cyclomatic complexity ({complexity})",
+                        suggestion="Consider breaking down this function into smaller, more focused functions",
                     )
+                )
 
         return issues
 
-    def _check_imports(self, tree: ast.AST) -> List[RefactoringIssue]:
+    def _check_imports(self, context: SourceAnalysis) -> List[RefactoringIssue]:
         """Check for unused or problematic imports."""
         issues = []
         imports = set()
-        used = set()
 
         # Collect all imports
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    name = alias.asname or alias.name
-                    imports.add(name.split(".")[0])
-            elif isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    name = alias.asname or alias.name
-                    imports.add(name)
-
-        # Collect all used names
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name):
-                if isinstance(node.ctx, ast.Load):
-                    used.add(node.id)
+        for node in context.imports:
+            for alias in node.names:
+                name = alias.asname or alias.name
+                imports.add(name.split(".")[0] if isinstance(node, ast.Import) else name)
 
         # Find unused imports
-        unused_imports = imports - used
+        unused_imports = imports - context.loaded_names
         for imp in unused_imports:
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    issues.append(
-                        RefactoringIssue(
-                            issue_type="unused_import",
-                            severity="medium",
-                            line_number=node.lineno,
-                            description=f"Import '{imp}' is never used",
-                            suggestion=f"Remove the unused import '{imp}'",
-                        )
-                    )
-                    break
+            issues.append(
+                RefactoringIssue(
+                    issue_type="unused_import",
+                    severity="medium",
+                    line_number=context.imports[0].lineno,
+                    description=f"Import '{imp}' is never used",
+                    suggestion=f"Remove the unused import '{imp}'",
+                )
+            )
 
         return issues
 
-    def _check_except_clauses(self, tree: ast.AST) -> List[RefactoringIssue]:
+    def _check_except_clauses(self, context: SourceAnalysis) -> List[RefactoringIssue]:
         """Check for bare except clauses."""
         issues = []
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ExceptHandler):
-                if node.type is None:  # Bare except
-                    issues.append(
-                        RefactoringIssue(
-                            issue_type="bare_except",
-                            severity="high",
-                            line_number=node.lineno,
-                            description="Bare except clause catches all exceptions",
-                            suggestion="Specify the exception type to catch (e.g., except ValueError:)",
-                        )
+        for node in context.except_handlers:
+            if node.type is None:  # Bare except
+                issues.append(
+                    RefactoringIssue(
+                        issue_type="bare_except",
+                        severity="high",
+                        line_number=node.lineno,
+                        description="Bare except clause catches all exceptions",
+                        suggestion="Specify the exception type to catch (e.g., except ValueError:)",
                     )
+                )
 
         return issues
 
@@ -286,18 +387,16 @@ class CodeRefactoringPlugin(BasePlugin):
         """Suggest better variable and function names."""
         suggestions = {}
 
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
+        context = self._get_context(code)
+        if not context.parse():
             return {"success": False, "error": "Invalid Python code"}
 
         # Collect short variable names
         short_vars = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name):
-                if len(node.id) == 1 and node.id.islower():
-                    if node.id not in {"_", "i", "j", "k", "x", "y", "z"}:
-                        short_vars[node.id] = f"Use a more descriptive name instead of '{node.id}'"
+        for node in context.names:
+            if len(node.id) == 1 and node.id.islower():
+                if node.id not in {"_", "i", "j", "k", "x", "y", "z"}:
+                    short_vars[node.id] = f"Use a more descriptive name instead of '{node.id}'"
 
         suggestions["short_variable_names"] = short_vars
 
@@ -308,16 +407,11 @@ class CodeRefactoringPlugin(BasePlugin):
 
     def _analyze_complexity(self, code: str) -> Dict[str, Any]:
         """Analyze cyclomatic complexity."""
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
+        context = self._get_context(code)
+        if not context.parse():
             return {"success": False, "error": "Invalid Python code"}
 
-        complexity_map = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                complexity = self._calculate_complexity(node)
-                complexity_map[node.name] = complexity
+        complexity_map = {info.node.name: info.complexity for info in context.functions}
 
         avg_complexity = sum(complexity_map.values()) / len(complexity_map) if complexity_map else 0
 
@@ -328,51 +422,80 @@ class CodeRefactoringPlugin(BasePlugin):
             "status": ("Good" if avg_complexity < 5 else "Moderate" if avg_complexity < 10 else "High"),
         }
 
-    def _find_duplicates(self, code: str) -> Dict[str, Any]:
-        """Find duplicate code patterns."""
-        lines = code.split("\n")
+    def _find_duplicates(self, code: str, window: int = DUPLICATE_WINDOW) -> Dict[str, Any]:
+        """
+        Find duplicate code patterns.
+
+        Repeated single lines are reported in ``duplicates``. Repeated blocks
+        of at least ``window`` consecutive lines (ignoring blank lines and
+        comments) are found by hashing each window of lines and are reported,
+        merged into maximal runs, in ``duplicate_blocks``.
+        """
+        context = self._get_context(code)
         duplicates = []
 
-        # Look for repeated lines
-        seen_lines: Dict[str, int] = {}
-        for i, line in enumerate(lines):
+        # Significant lines as (line index, stripped text)
+        significant: List[Tuple[int, str]] = []
+        for i, line in enumerate(context.lines):
             stripped = line.strip()
             if stripped and not stripped.startswith("#"):
-                if stripped in seen_lines:
-                    duplicates.append(
-                        {
-                            "line": i + 1,
-                            "previous_line": seen_lines[stripped] + 1,
-                            "code": stripped,
-                        }
-                    )
-                else:
-                    seen_lines[stripped] = i
+                significant.append((i, stripped))
+
+        # Look for repeated lines
+        seen_lines: Dict[str, int] = {}
+        line_ids: List[int] = []
+        for i, stripped in significant:
+            if stripped in seen_lines:
+                duplicates.append(
+                    {
+                        "line": i + 1,
+                        "previous_line": seen_lines[stripped] + 1,
+                        "code": stripped,
+                    }
+                )
+            else:
+                seen_lines[stripped] = i
+            line_ids.append(seen_lines[stripped])
 
         return {
             "success": True,
             "duplicates": duplicates,
             "duplicate_count": len(duplicates),
+            "duplicate_blocks": self._find_duplicate_blocks(significant, line_ids, max(1, window)),
         }
 
-    def _calculate_complexity(self, node: ast.FunctionDef) -> int:
-        """Calculate cyclomatic complexity of a function."""
-        complexity = 1
-
-        for child in ast.walk(node):
-            if isinstance(
-                child,
-                (
-                    ast.If,
-                    ast.While,
-                    ast.For,
-                    ast.ExceptHandler,
-                    ast.BoolOp,
-                ),
-            ):
-                complexity += 1
-
-        return complexity
+    @staticmethod
+    def _find_duplicate_blocks(significant: List[Tuple[int, str]], line_ids: List[int], window: int) -> List[Dict[str, Any]]:
+        """Find repeated runs of significant lines via hashed line windows."""
+        windows = [tuple(line_ids[i : i + window]) for i in range(len(line_ids) - window + 1)]
+        first_seen: Dict[Tuple[int, ...], int] = {}
+        blocks: List[Dict[str, Any]] = []
+        previous: Optional[Tuple[int, int]] = None  # (window, earlier window it repeats)
+
+        for i, key in enumerate(windows):
+            earlier = first_seen.setdefault(key, i)
+
+            # Prefer continuing the current block over jumping back to the first copy
+            if previous is not None and windows[previous[1] + 1] == key and previous[1] + 1 + window <= i:
+                earlier = previous[1] + 1
+                blocks[-1]["length"] += 1
+                previous = (i, earlier)
+            elif earlier + window <= i:
+                blocks.append({"start": i, "previous_start": earlier, "length": window})
+                previous = (i, earlier)
+            else:
+                previous = None
+
+        return [
+            {
+                "line": significant[block["start"]][0] + 1,
+                "previous_line": significant[block["previous_start"]][0] + 1,
+                "end_line": significant[block["start"] + block["length"] - 1][0] + 1,
+                "lines": block["length"],
+                "code": "\n".join(text for _, text in significant[block["start"] : block["start"] + block["length"]]),
+            }
+            for block in blocks
+        ]
 
     @staticmethod
     def _is_valid_snake_case(name: str) -> bool:
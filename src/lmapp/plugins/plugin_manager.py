@@ -10,17 +10,22 @@ Features:
 - Plugin metadata and versioning
 - Plugin configuration support
 - Safe plugin execution with error isolation
+- Cached discovery manifest; plugin code is imported on first use
 """
 
+import hashlib
 import importlib
 import json
+import os
 import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set
 from dataclasses import dataclass, field
 from enum import Enum
 
+from lmapp.utils.logging import logger
+
 
 class PluginStatus(Enum):
     """Plugin status states."""
@@ -112,6 +117,47 @@ class BasePlugin(ABC):
         """
         return {}
 
+    def get_hooks(self) -> Dict[str, Callable]:
+        """
+        Get hook handlers provided by this plugin.
+
+        Returns:
+            Dict of {hook_name: handler_function}
+        """
+        return {}
+
+
+@dataclass
+class PluginManifestEntry:
+    """Cached discovery record for a plugin, usable without importing it."""
+
+    metadata: PluginMetadata
+    path: str
+    fingerprint: str
+    commands: List[str] = field(default_factory=list)
+    hooks: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "metadata": self.metadata.to_dict(),
+            "path": self.path,
+            "fingerprint": self.fingerprint,
+            "commands": self.commands,
+            "hooks": self.hooks,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "PluginManifestEntry":
+        """Create from dictionary."""
+        return PluginManifestEntry(
+            metadata=PluginMetadata.from_dict(data["metadata"]),
+            path=data["path"],
+            fingerprint=data["fingerprint"],
+            commands=data.get("commands", []),
+            hooks=data.get("hooks", []),
+        )
+
 
 @dataclass
 class PluginInfo:
@@ -129,7 +175,23 @@ class PluginInfo:
 
 
 class PluginManager:
-    """Manages plugin discovery, loading, and execution."""
+    """
+    Manages plugin discovery, loading, and execution.
+
+    Discovery results are cached in ``manifest.json`` in the plugins
+    directory: each plugin's metadata, the commands and hooks it provides,
+    and a fingerprint of its files. Listing plugins and looking up commands
+    or hooks only reads the manifest; a plugin is imported the first time
+    one of its commands, hooks or ``execute`` is used. A plugin is only
+    re-read when its fingerprint changes.
+
+    Plugins should declare ``"commands"`` and ``"hooks"`` in plugin.json.
+    If either is missing, the plugin is imported once when its manifest
+    entry is built, to ask it for them.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    MANIFEST_VERSION = 1
 
     def __init__(self, plugins_dir: Optional[Path] = None):
         """
@@ -146,6 +208,12 @@ class PluginManager:
         self.plugins_dir.mkdir(parents=True, exist_ok=True)
         self.loaded_plugins: Dict[str, PluginInfo] = {}
         self.registry_file = self.plugins_dir / "registry.json"
+        self.manifest_file = self.plugins_dir / self.MANIFEST_FILE
+
+        self._manifest: Optional[Dict[str, PluginManifestEntry]] = None
+        self._command_owners: Dict[str, str] = {}
+        self._hook_owners: Dict[str, List[str]] = {}
+        self._failed: Set[str] = set()
 
     def discover_plugins(self) -> List[Path]:
         """
@@ -210,13 +278,88 @@ class PluginManager:
         except Exception:
             return None
 
-    def load_all_plugins(self) -> int:
+    def refresh_manifest(self) -> Dict[str, PluginManifestEntry]:
+        """
+        Bring the plugin manifest up to date with the plugins directory.
+
+        Entries whose fingerprint still matches are reused as-is; new or
+        changed plugins are re-read, and removed ones are dropped.
+
+        Returns:
+            Dict of {plugin_name: PluginManifestEntry}
+        """
+        previous = self._manifest if self._manifest is not None else self._read_manifest()
+        cached = {entry.path: entry for entry in previous.values()}
+        manifest: Dict[str, PluginManifestEntry] = {}
+
+        for plugin_path in self.discover_plugins():
+            fingerprint = self._fingerprint(plugin_path)
+            entry = cached.get(str(plugin_path))
+            if entry is None or entry.fingerprint != fingerprint:
+                entry = self._build_manifest_entry(plugin_path, fingerprint)
+                if entry is None:
+                    continue
+            manifest[entry.metadata.name] = entry
+
+        if {n: e.fingerprint for n, e in manifest.items()} != {n: e.fingerprint for n, e in previous.items()}:
+            self._write_manifest(manifest)
+
+        self._manifest = manifest
+        self._command_owners = {}
+        self._hook_owners = {}
+        for name, entry in manifest.items():
+            for command in entry.commands:
+                self._command_owners.setdefault(command, name)
+            for hook in entry.hooks:
+                self._hook_owners.setdefault(hook, []).append(name)
+        return manifest
+
+    def get_manifest(self) -> Dict[str, PluginManifestEntry]:
+        """Get the plugin manifest, refreshing it on first use."""
+        if self._manifest is None:
+            return self.refresh_manifest()
+        return self._manifest
+
+    def activate(self, name: str) -> Optional[PluginInfo]:
+        """
+        Import and initialize a plugin from the manifest, if not yet loaded.
+
+        Args:
+            name: Plugin name
+
+        Returns:
+            PluginInfo if the plugin is available, None otherwise
+        """
+        info = self.loaded_plugins.get(name)
+        if info is not None:
+            return info
+
+        entry = self.get_manifest().get(name)
+        if entry is None or name in self._failed:
+            return None
+
+        plugin_path = Path(entry.path)
+        info = self.load_plugin(plugin_path, self._load_plugin_config(plugin_path))
+        if info is None or info.status == PluginStatus.ERROR:
+            # Don't retry on every command or hook
+            self._failed.add(name)
+            logger.warning(f"Plugin {name} failed to load: {info.error_message if info else 'import failed'}")
+        return info
+
+    def load_all_plugins(self, lazy: bool = True) -> int:
         """
         Load all available plugins.
 
+        Args:
+            lazy: Only register plugins from the manifest; each one is
+                imported when first used. Pass False to import all now.
+
         Returns:
-            Number of successfully loaded plugins
+            Number of available plugins (lazy) or successfully loaded plugins
         """
+        if lazy:
+            return len(self.refresh_manifest())
+
         plugins = self.discover_plugins()
         loaded_count = 0
 
@@ -230,8 +373,8 @@ class PluginManager:
         return loaded_count
 
     def get_plugin(self, name: str) -> Optional[PluginInfo]:
-        """Get a loaded plugin by name."""
-        return self.loaded_plugins.get(name)
+        """Get a plugin by name, loading it from the manifest on first use."""
+        return self.activate(name)
 
     def execute_plugin(self, name: str, *args, **kwargs) -> Optional[Any]:
         """
@@ -245,7 +388,7 @@ class PluginManager:
         Returns:
             Plugin execution result
         """
-        info = self.get_plugin(name)
+        info = self.activate(name)
 
         if not info:
             return None
@@ -264,10 +407,17 @@ class PluginManager:
         """
         Get all CLI commands from all plugins.
 
+        Commands of plugins that are not loaded yet are returned as stubs
+        that load the plugin on first call.
+
         Returns:
             Dict of {command_name: handler_function}
         """
-        commands = {}
+        commands: Dict[str, Callable] = {}
+
+        for command, owner in self.get_manifest_commands().items():
+            if owner not in self.loaded_plugins:
+                commands[command] = self._lazy_command(command)
 
         for plugin_info in self.loaded_plugins.values():
             if plugin_info.status != PluginStatus.ERROR:
@@ -279,6 +429,62 @@ class PluginManager:
 
         return commands
 
+    def get_manifest_commands(self) -> Dict[str, str]:
+        """Get {command_name: plugin_name} for all plugins, without importing any."""
+        self.get_manifest()
+        return dict(self._command_owners)
+
+    def execute_command(self, command_name: str, *args, **kwargs) -> Optional[Any]:
+        """
+        Execute a plugin command, loading its plugin if needed.
+
+        Args:
+            command_name: Command name
+            *args: Arguments to pass to the command
+            **kwargs: Keyword arguments to pass to the command
+
+        Returns:
+            Command result, or None if unavailable or it failed
+        """
+        handler = self._resolve_command(command_name)
+        if handler is None:
+            return None
+
+        try:
+            return handler(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Plugin command {command_name} failed: {e}")
+            return None
+
+    def trigger_hook(self, hook_name: str, *args, **kwargs) -> List[Any]:
+        """
+        Call every plugin handler for a hook, loading plugins as needed.
+
+        Args:
+            hook_name: Hook name
+            *args: Arguments to pass to each handler
+            **kwargs: Keyword arguments to pass to each handler
+
+        Returns:
+            Results of the handlers that ran successfully
+        """
+        manifest = self.get_manifest()
+        owners = list(self._hook_owners.get(hook_name, []))
+        owners.extend(name for name in self.loaded_plugins if name not in manifest)
+
+        results = []
+        for name in owners:
+            info = self.activate(name)
+            if info is None or info.status == PluginStatus.ERROR:
+                continue
+            try:
+                handler = info.plugin.get_hooks().get(hook_name)
+                if handler is not None:
+                    results.append(handler(*args, **kwargs))
+            except Exception as e:
+                logger.warning(f"Plugin {name} hook {hook_name} failed: {e}")
+        return results
+
     def unload_plugin(self, name: str) -> bool:
         """
         Unload a plugin.
@@ -289,7 +495,7 @@ class PluginManager:
         Returns:
             True if successful
         """
-        info = self.get_plugin(name)
+        info = self.loaded_plugins.get(name)
 
         if not info:
             return False
@@ -303,7 +509,10 @@ class PluginManager:
 
     def list_plugins(self) -> List[Dict[str, Any]]:
         """
-        List all loaded plugins.
+        List all available and loaded plugins.
+
+        Plugins that have not been used yet are listed from the manifest
+        with status "unloaded"; no plugin code is imported.
 
         Returns:
             List of plugin information dictionaries
@@ -317,26 +526,153 @@ class PluginManager:
                     "version": info.metadata.version,
                     "description": info.metadata.description,
                     "author": info.metadata.author,
+                    "tags": info.metadata.tags,
                     "status": info.status.value,
                     "error": info.error_message,
                 }
             )
 
+        for name, entry in self.get_manifest().items():
+            if name in self.loaded_plugins:
+                continue
+            failed = name in self._failed
+            plugins_info.append(
+                {
+                    "name": name,
+                    "version": entry.metadata.version,
+                    "description": entry.metadata.description,
+                    "author": entry.metadata.author,
+                    "tags": entry.metadata.tags,
+                    "status": (PluginStatus.ERROR if failed else PluginStatus.UNLOADED).value,
+                    "error": "Failed to load" if failed else None,
+                }
+            )
+
         return sorted(plugins_info, key=lambda x: x["name"])
 
     def get_plugin_stats(self) -> Dict[str, Any]:
-        """Get statistics about loaded plugins."""
+        """
+        Get statistics about available plugins.
+
+        Plugins known only from the manifest are counted with the status
+        reported by ``list_plugins``; no plugin code is imported.
+        """
+        plugins = self.list_plugins()
         statuses: Dict[str, int] = {}
-        for info in self.loaded_plugins.values():
-            status = info.status.value
-            statuses[status] = statuses.get(status, 0) + 1
+        for plugin in plugins:
+            statuses[plugin["status"]] = statuses.get(plugin["status"], 0) + 1
 
         return {
-            "total_plugins": len(self.loaded_plugins),
+            "total_plugins": len(plugins),
+            "loaded_plugins": len(self.loaded_plugins),
             "by_status": statuses,
-            "with_errors": len([p for p in self.loaded_plugins.values() if p.status == PluginStatus.ERROR]),
+            "with_errors": statuses.get(PluginStatus.ERROR.value, 0),
         }
 
+    def _resolve_command(self, command_name: str) -> Optional[Callable]:
+        """Find the handler for a command, loading its plugin if needed."""
+        owner = self.get_manifest_commands().get(command_name)
+        candidates = [owner] if owner else list(self.loaded_plugins)
+
+        for name in candidates:
+            info = self.activate(name)
+            if info is None or info.status == PluginStatus.ERROR:
+                continue
+            try:
+                handler = info.plugin.get_commands().get(command_name)
+            except Exception:
+                continue
+            if handler is not None:
+                return handler
+        return None
+
+    def _lazy_command(self, command_name: str) -> Callable:
+        """Stub that loads the owning plugin when the command is first called."""
+
+        def handler(*args, **kwargs):
+            resolved = self._resolve_command(command_name)
+            if resolved is None:
+                return None
+            return resolved(*args, **kwargs)
+
+        handler.__name__ = command_name
+        return handler
+
+    @staticmethod
+    def _fingerprint(plugin_path: Path) -> str:
+        """Hash of the names, sizes and mtimes of a plugin's source and metadata files."""
+        parts = []
+        for root, dirs, files in os.walk(plugin_path):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            for filename in files:
+                if filename.endswith(".py") or filename == "plugin.json":
+                    stat = os.stat(os.path.join(root, filename))
+                    rel = os.path.relpath(os.path.join(root, filename), plugin_path)
+                    parts.append(f"{rel}:{stat.st_size}:{stat.st_mtime_ns}")
+        return hashlib.sha256("\n".join(sorted(parts)).encode()).hexdigest()
+
+    def _build_manifest_entry(self, plugin_path: Path, fingerprint: str) -> Optional[PluginManifestEntry]:
+        """Read a plugin's metadata (and, if undeclared, its commands and hooks)."""
+        metadata_file = plugin_path / "plugin.json"
+        if not metadata_file.exists():
+            return None
+
+        try:
+            with open(metadata_file, "r") as f:
+                data = json.load(f)
+            metadata = PluginMetadata.from_dict(data)
+        except (json.JSONDecodeError, KeyError, TypeError, OSError) as e:
+            logger.warning(f"Invalid plugin metadata in {metadata_file}: {e}")
+            return None
+
+        commands = data.get("commands")
+        hooks = data.get("hooks")
+        if commands is None or hooks is None:
+            plugin = self._load_plugin_class(plugin_path, metadata)
+            if plugin is not None:
+                try:
+                    commands = list(plugin.get_commands()) if commands is None else commands
+                    hooks = list(plugin.get_hooks()) if hooks is None else hooks
+                except Exception as e:
+                    logger.warning(f"Could not list commands of plugin {metadata.name}: {e}")
+
+        return PluginManifestEntry(
+            metadata=metadata,
+            path=str(plugin_path),
+            fingerprint=fingerprint,
+            commands=list(commands or []),
+            hooks=list(hooks or []),
+        )
+
+    def _read_manifest(self) -> Dict[str, PluginManifestEntry]:
+        """Load the cached manifest (empty if missing, stale or unreadable)."""
+        try:
+            with open(self.manifest_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") != self.MANIFEST_VERSION:
+                return {}
+            entries = [PluginManifestEntry.from_dict(item) for item in data.get("plugins", [])]
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable plugin manifest: {e}")
+            return {}
+        return {entry.metadata.name: entry for entry in entries}
+
+    def _write_manifest(self, manifest: Dict[str, PluginManifestEntry]) -> None:
+        """Atomically replace the manifest file."""
+        data = {
+            "version": self.MANIFEST_VERSION,
+            "plugins": [entry.to_dict() for entry in manifest.values()],
+        }
+        tmp_file = self.manifest_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.manifest_file)
+        except OSError as e:
+            logger.warning(f"Could not write plugin manifest: {e}")
+
     def _load_plugin_class(self, plugin_path: Path, metadata: PluginMetadata) -> Optional[BasePlugin]:
         """Load the plugin class from module."""
         try:
@@ -9,6 +9,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Any, Optional, Generic, TypeVar
 from pathlib import Path
 
+from lmapp.utils.bounded_cache import BoundedCache, EvictionPolicy
+
 T = TypeVar("T")
 
 
@@ -64,18 +66,36 @@ class CacheBackend(ABC):
 
 
 class MemoryCache(CacheBackend):
-    """In-memory cache backend."""
+    """In-memory cache backend.
+
+    Evicts the least frequently read entry (least recently used among ties)
+    once ``max_size`` entries or ``max_bytes`` of values are stored.
+    """
 
-    def __init__(self, max_size: int = 1000):
+    def __init__(self, max_size: int = 1000, max_bytes: Optional[int] = None):
         """Initialize memory cache.
 
         Args:
             max_size: Maximum entries to store
+            max_bytes: Maximum total size of stored values (None for unbounded)
         """
         self.max_size = max_size
-        self.store: dict[str, CacheEntry] = {}
+        self.max_bytes = max_bytes
+        self.store: BoundedCache[str, CacheEntry] = BoundedCache(
+            max_entries=max_size,
+            max_bytes=max_bytes,
+            policy=EvictionPolicy.LFU,
+        )
+        self._total_hits = 0
+        self._total_ttl = 0
         self._lock = asyncio.Lock()
 
+    def _forget(self, entry: Optional[CacheEntry]) -> None:
+        """Remove a dropped entry from the running totals."""
+        if entry is not None:
+            self._total_hits -= entry.hits
+            self._total_ttl -= entry.ttl_seconds or 0
+
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache."""
         async with self._lock:
@@ -84,10 +104,11 @@ class MemoryCache(CacheBackend):
                 return None
 
             if entry.is_expired():
-                del self.store[key]
+                self._forget(self.store.pop(key))
                 return None
 
             entry.hits += 1
+            self._total_hits += 1
             return entry.value
 
     async def set(
@@ -98,41 +119,40 @@ class MemoryCache(CacheBackend):
     ) -> None:
         """Set value in cache."""
         async with self._lock:
-            if len(self.store) >= self.max_size:
-                # Remove least recently used entry
-                least_used = min(
-                    self.store.items(),
-                    key=lambda x: x[1].hits,
-                )[0]
-                del self.store[least_used]
-
-            self.store[key] = CacheEntry(
+            self._forget(self.store.pop(key))
+            entry = CacheEntry(
                 key=key,
                 value=value,
                 timestamp=datetime.now(timezone.utc),
                 ttl_seconds=ttl_seconds,
             )
+            for _, evicted in self.store.set(key, entry, size=len(value.encode("utf-8"))):
+                self._forget(evicted)
+            if key in self.store:
+                self._total_ttl += ttl_seconds or 0
 
     async def delete(self, key: str) -> None:
         """Delete value from cache."""
         async with self._lock:
-            self.store.pop(key, None)
+            self._forget(self.store.pop(key))
 
     async def clear(self) -> None:
         """Clear entire cache."""
         async with self._lock:
             self.store.clear()
+            self._total_hits = 0
+            self._total_ttl = 0
 
     async def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
         async with self._lock:
-            total_hits = sum(e.hits for e in self.store.values())
             return {
                 "type": "memory",
                 "entries": len(self.store),
                 "max_size": self.max_size,
-                "total_hits": total_hits,
-                "avg_ttl": sum(e.ttl_seconds or 0 for e in self.store.values()) / max(len(self.store), 1),
+                "size_bytes": self.store.total_bytes,
+                "total_hits": self._total_hits,
+                "avg_ttl": self._total_ttl / max(len(self.store), 1),
             }
 
 
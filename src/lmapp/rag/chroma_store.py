@@ -52,7 +52,8 @@ class ChromaDBStore:
             metadatas.append(meta)
 
         if ids:
-            self.collection.add(ids=ids, documents=documents_text, metadatas=metadatas)
+            # Upsert so re-indexing a changed file replaces its chunks
+            self.collection.upsert(ids=ids, documents=documents_text, metadatas=metadatas)
             logger.debug(f"Added {len(ids)} documents to ChromaDB")
 
     def search(self, query: str, limit: int = 5, filter: Optional[Dict] = None) -> List[VectorSearchResult]:
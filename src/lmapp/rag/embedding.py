@@ -1,8 +1,18 @@
 """Embedding service for RAG."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 import hashlib
+import logging
+import math
+import re
+import threading
+
+from .embedding_cache import EmbeddingCache, make_key
+
+logger = logging.getLogger(__name__)
 
 
 class EmbeddingModel(ABC):
@@ -76,53 +86,195 @@ class MockEmbeddingModel(EmbeddingModel):
         return embedding
 
 
+class HashingEmbeddingModel(EmbeddingModel):
+    """Local, deterministic lexical embedding.
+
+    Words and character trigrams are hashed into a fixed number of signed
+    buckets with sublinear term weighting, then L2-normalised. Rephrasings
+    that share most of their wording land close together, but so do queries
+    that differ only by a negation or a number: this is a lexical stand-in
+    for tests and offline development, not a semantic model.
+    """
+
+    _WORD_RE = re.compile(r"\w+")
+
+    def __init__(self, dim: int = 256):
+        self._dim = dim
+        self.model_name = f"hashing-{dim}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dim
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate hashed embeddings."""
+        return [self._hash_embed(text) for text in texts]
+
+    def embed_query(self, query: str) -> List[float]:
+        """Generate hashed query embedding."""
+        return self._hash_embed(query)
+
+    def _features(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for word in self._WORD_RE.findall(text.lower()):
+            counts["w:" + word] = counts.get("w:" + word, 0) + 1
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                gram = "c:" + padded[i : i + 3]
+                counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    def _hash_embed(self, text: str) -> List[float]:
+        vector = [0.0] * self._dim
+        for feature, count in self._features(text).items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self._dim] += sign * (1.0 + math.log(count))
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+
 class OllamaEmbeddingModel(EmbeddingModel):
-    """Ollama embedding model."""
+    """Ollama embedding model.
+
+    Texts are sent to /api/embed in batches over a pooled keep-alive session,
+    with up to ``max_concurrency`` batches in flight at once.
+    """
 
-    def __init__(self, model_name: str = "nomic-embed-text", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model_name: str = "nomic-embed-text",
+        base_url: str = "http://localhost:11434",
+        batch_size: int = 32,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+    ):
+        """Initialize Ollama embedding model.
+
+        Args:
+            model_name: Ollama embedding model to use
+            base_url: Ollama server URL
+            batch_size: Maximum texts sent per /api/embed request
+            max_concurrency: Maximum batch requests in flight at once
+            timeout: Per-request timeout in seconds
+        """
         self.model_name = model_name
         self.base_url = base_url
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
         self._dim = 384  # Default for nomic-embed-text
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.last_call_degraded = False
 
     @property
     def dimension(self) -> int:
         return self._dim
 
+    def _get_session(self):
+        """Create the pooled HTTP session on first use."""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch with a single request."""
+        response = self._get_session().post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model_name, "input": batch},
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            logger.warning(f"Failed to embed batch of {len(batch)} texts: {response.status_code}")
+            self.last_call_degraded = True
+            return [[0.0] * self._dim for _ in batch]
+
+        data = response.json()
+        embeddings = data.get("embeddings")
+        if embeddings is None and "embedding" in data:
+            embeddings = [data["embedding"]]
+        if not embeddings or len(embeddings) != len(batch):
+            logger.warning(f"Embedding response size mismatch: expected {len(batch)}, got {len(embeddings or [])}")
+            self.last_call_degraded = True
+            return [[0.0] * self._dim for _ in batch]
+
+        if embeddings[0]:
+            self._dim = len(embeddings[0])
+        return embeddings
+
     def embed(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings via Ollama."""
+        if not texts:
+            return []
+
+        self.last_call_degraded = False
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
         try:
-            import requests
-
-            results = []
-            for text in texts:
-                response = requests.post(
-                    f"{self.base_url}/api/embed",
-                    json={"model": self.model_name, "input": text},
-                )
-                if response.status_code == 200:
-                    embedding = response.json().get("embedding", [])
-                    results.append(embedding)
-                else:
-                    print(f"Failed to embed text: {response.status_code}")
-                    results.append([0.0] * self._dim)
-
-            return results
+            if len(batches) == 1 or self.max_concurrency == 1:
+                batch_results = [self._embed_batch(batch) for batch in batches]
+            else:
+                workers = min(self.max_concurrency, len(batches))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    batch_results = list(executor.map(self._embed_batch, batches))
         except Exception as e:
-            print(f"Error connecting to Ollama: {e}")
+            logger.warning(f"Error connecting to Ollama: {e}")
+            self.last_call_degraded = True
             # Fall back to mock
             return MockEmbeddingModel(self._dim).embed(texts)
 
+        return [embedding for batch in batch_results for embedding in batch]
+
     def embed_query(self, query: str) -> List[float]:
         """Generate query embedding via Ollama."""
         return self.embed([query])[0]
 
 
 class EmbeddingService:
-    """Service for managing embeddings."""
+    """Service for managing embeddings.
+
+    Embeddings are cached by a hash of model and content in a byte-bounded
+    LRU, and persisted to ``cache_dir`` when one is given.
+    """
+
+    def __init__(
+        self,
+        model: Optional[EmbeddingModel] = None,
+        cache_dir: Optional[Path] = None,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+    ):
+        """Initialize embedding service.
 
-    def __init__(self, model: Optional[EmbeddingModel] = None):
+        Args:
+            model: Embedding model (defaults to MockEmbeddingModel)
+            cache_dir: Directory for the persistent cache (memory only if None)
+            max_memory_bytes: Byte budget for the in-memory cache tier
+        """
         self.model = model or MockEmbeddingModel()
-        self._cache = {}
+        self._cache = EmbeddingCache(cache_dir, max_memory_bytes=max_memory_bytes)
+
+    @property
+    def model_id(self) -> str:
+        """Identifier mixed into cache keys so models never share vectors."""
+        name = getattr(self.model, "model_name", None)
+        if name:
+            return f"{type(self.model).__name__}:{name}"
+        return f"{type(self.model).__name__}:{self.model.dimension}"
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings with caching.
@@ -133,37 +285,47 @@ class EmbeddingService:
         Returns:
             Embedding vectors
         """
-        uncached = []
-        uncached_indices = []
+        model_id = self.model_id
+        keys = [make_key(model_id, text) for text in texts]
+        found = self._cache.get_many(keys)
 
-        # Check cache
-        for i, text in enumerate(texts):
-            if text in self._cache:
-                continue
-            uncached.append(text)
-            uncached_indices.append(i)
+        # Embed each missing text once, even if it repeats
+        uncached: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in uncached:
+                uncached[key] = text
 
-        # Embed uncached texts
         if uncached:
-            embeddings = self.model.embed(uncached)
-            for text, emb in zip(uncached, embeddings):
-                self._cache[text] = emb
+            embeddings = self.model.embed(list(uncached.values()))
+            fresh = dict(zip(uncached.keys(), embeddings))
+            if getattr(self.model, "last_call_degraded", False):
+                # Don't persist fallback vectors; the real model may be back next time
+                found.update(fresh)
+            else:
+                found.update(self._cache.set_many(fresh))
 
         # Assemble results in original order
-        results = [None] * len(texts)
-        for idx, text in enumerate(texts):
-            results[idx] = self._cache[text]
-
-        return results
+        return [found[key] for key in keys]
 
     def embed_query(self, query: str) -> List[float]:
-        """Embed a query with caching."""
-        if query in self._cache:
-            return self._cache[query]
+        """Embed a query with caching.
+
+        Uses the model's query embedding, which can differ from its document
+        embedding, so query vectors are cached under their own key namespace.
+        """
+        key = make_key(f"query:{self.model_id}", query)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
 
         embedding = self.model.embed_query(query)
-        self._cache[query] = embedding
-        return embedding
+        if getattr(self.model, "last_call_degraded", False):
+            return embedding
+        return self._cache.set_many({key: embedding})[key]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics."""
+        return self._cache.get_stats()
 
     def clear_cache(self) -> None:
         """Clear embedding cache."""
@@ -0,0 +1,171 @@
+"""Content-addressed embedding cache with a bounded memory tier and SQLite persistence."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(model_id: str, text: str) -> str:
+    """Cache key for a text embedded by a given model."""
+    digest = hashlib.sha256()
+    digest.update(model_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by a hash of model and content.
+
+    Vectors are stored as packed float32. The memory tier is an LRU bounded by
+    bytes; the optional disk tier is a single SQLite file that survives
+    restarts, so unchanged content is never embedded twice.
+    """
+
+    DB_NAME = "embeddings.db"
+    _SQL_BATCH = 500
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_memory_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize EmbeddingCache.
+
+        Args:
+            cache_dir: Directory for the persistent tier (memory only if None)
+            max_memory_bytes: Byte budget for the in-memory LRU tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.db_path: Optional[Path] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        if cache_dir is not None:
+            cache_dir = Path(cache_dir)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self.db_path = cache_dir / self.DB_NAME
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is not None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return len(self._memory)
+
+    @staticmethod
+    def _pack(vector: Iterable[float]) -> array:
+        return array("f", vector)
+
+    def _remember(self, key: str, packed: array) -> None:
+        """Insert into the memory tier, evicting least recently used entries. Caller holds the lock."""
+        size = len(packed) * packed.itemsize
+        if size > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old) * old.itemsize
+        self._memory[key] = packed
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted) * evicted.itemsize
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up several keys; missing keys are absent from the result."""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            pending = []
+            for key in keys:
+                packed = self._memory.get(key)
+                if packed is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = packed.tolist()
+                    self.memory_hits += 1
+                else:
+                    pending.append(key)
+
+            if pending and self._conn is not None:
+                unique = list(dict.fromkeys(pending))
+                for i in range(0, len(unique), self._SQL_BATCH):
+                    chunk = unique[i : i + self._SQL_BATCH]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk).fetchall()
+                    for key, blob in rows:
+                        packed = array("f")
+                        packed.frombytes(blob)
+                        self._remember(key, packed)
+                        found[key] = packed.tolist()
+                for key in pending:
+                    if key in found:
+                        self.disk_hits += 1
+                    else:
+                        self.misses += 1
+            else:
+                self.misses += len(pending)
+        return found
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Look up a single key."""
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """Store vectors and return them as they will be served from the cache."""
+        stored: Dict[str, List[float]] = {}
+        with self._lock:
+            rows = []
+            for key, vector in items.items():
+                packed = self._pack(vector)
+                self._remember(key, packed)
+                stored[key] = packed.tolist()
+                rows.append((key, packed.tobytes()))
+            if rows and self._conn is not None:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+                self._conn.commit()
+        return stored
+
+    def clear(self) -> None:
+        """Remove all cached embeddings from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        with self._lock:
+            memory_entries = len(self._memory)
+            memory_bytes = self._memory_bytes
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "persistent": self.db_path is not None,
+        }
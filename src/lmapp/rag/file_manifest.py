@@ -0,0 +1,99 @@
+"""File manifest for incremental RAG indexing.
+
+Records, for every indexed file, its size, mtime, content hash and the chunk
+ids it produced, so unchanged files can be skipped and removed or shrunk
+files can have their chunks purged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileRecord:
+    """Manifest entry for one indexed file."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    chunk_ids: List[str] = field(default_factory=list)
+
+    def matches_stat(self, stat_result: os.stat_result) -> bool:
+        """Whether size and mtime are unchanged since indexing."""
+        return self.size == stat_result.st_size and self.mtime_ns == stat_result.st_mtime_ns
+
+
+def hash_file(path: Path, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileManifest:
+    """Persistent map of absolute file path to FileRecord."""
+
+    def __init__(self, manifest_path: Path):
+        """
+        Initialize FileManifest.
+
+        Args:
+            manifest_path: JSON file holding the manifest
+        """
+        self.manifest_path = Path(manifest_path)
+        self.records: Dict[str, FileRecord] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        try:
+            data = json.loads(self.manifest_path.read_text())
+            self.records = {path: FileRecord(**entry) for path, entry in data.get("files", {}).items()}
+        except (json.JSONDecodeError, IOError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable file manifest {self.manifest_path}: {e}")
+            self.records = {}
+
+    def save(self) -> None:
+        """Atomically persist the manifest if it changed."""
+        if not self._dirty:
+            return
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "files": {p: asdict(r) for p, r in self.records.items()}}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.manifest_path)
+        self._dirty = False
+
+    def get(self, path: str) -> Optional[FileRecord]:
+        return self.records.get(path)
+
+    def set(self, record: FileRecord) -> None:
+        self.records[record.path] = record
+        self._dirty = True
+
+    def remove(self, path: str) -> Optional[FileRecord]:
+        record = self.records.pop(path, None)
+        if record is not None:
+            self._dirty = True
+        return record
+
+    def clear(self) -> None:
+        if self.records:
+            self.records.clear()
+            self._dirty = True
+
+    def paths_under(self, directory: Path) -> Iterator[str]:
+        """Recorded paths located inside ``directory``."""
+        prefix = str(Path(directory).absolute()).rstrip(os.sep) + os.sep
+        return (path for path in list(self.records) if path.startswith(prefix))
@@ -1,10 +1,11 @@
 """Hybrid search combining semantic and keyword search."""
 
-import re
+import heapq
 from abc import ABC, abstractmethod
-from collections import Counter
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .inverted_index import STOPWORDS, InvertedIndex, tokenize
 
 
 @dataclass
@@ -37,72 +38,107 @@ class KeywordSearcher(ABC):
 
 
 class BM25Searcher(KeywordSearcher):
-    """Simple BM25 keyword search implementation."""
+    """BM25 keyword search backed by an incrementally maintained inverted index."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, index: Optional[InvertedIndex] = None):
+        """Initialize BM25 searcher.
 
-    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+            index: Existing inverted index to search (e.g. loaded from disk)
+        """
         self.k1 = k1
         self.b = b
-        self.idf_cache = {}
+        self.index = index if index is not None else InvertedIndex()
+        # List-based search() keeps its own index so it never touches ``index``
+        self._corpus_index = InvertedIndex()
+        self._corpus_key: Optional[int] = None
 
-    def search(self, query: str, documents: List[str], k: int = 5) -> List[Tuple[int, float]]:
-        """BM25 search."""
-        query_tokens = self._tokenize(query)
-        if not query_tokens:
-            return []
+    def add_document(self, doc_id: Hashable, text: str) -> None:
+        """Add or replace a document in the index."""
+        self.index.add(doc_id, text)
 
-        # Calculate IDF for query terms
-        doc_freqs = self._get_doc_freqs(documents)
-        n_docs = len(documents)
+    def remove_document(self, doc_id: Hashable) -> bool:
+        """Remove a document from the index."""
+        return self.index.remove(doc_id)
 
-        scores = []
-        for doc_idx, doc in enumerate(documents):
-            score = self._bm25_score(query_tokens, doc, doc_freqs, n_docs)
-            scores.append((doc_idx, score))
+    def search_index(self, query: str, k: int = 5, normalize: bool = False) -> List[Tuple[Hashable, float]]:
+        """Score indexed documents against a query.
 
-        # Sort by score and return top k
-        scores.sort(key=lambda x: -x[1])
-        return scores[:k]
+        Only postings of the query terms are visited, so cost depends on the
+        number of matching documents rather than on corpus size.
+
+        Args:
+            query: Search query
+            k: Number of results
+            normalize: Scale scores into [0, 1] by dividing by the score a
+                document would reach with unbounded frequency of every query term
+
+        Returns:
+            Up to k (doc_id, score) tuples with positive scores, best first
+        """
+        return self._rank(self.index, query, k, normalize)
+
+    def _rank(self, index: InvertedIndex, query: str, k: int, normalize: bool) -> List[Tuple[Hashable, float]]:
+        query_tokens = self._tokenize(query)
+        if not query_tokens or not len(index):
+            return []
+
+        avg_doc_len = index.avg_doc_length or 1.0
+        doc_lengths = index.doc_lengths
+        scores: Dict[Hashable, float] = {}
 
-    def _tokenize(self, text: str) -> List[str]:
-        """Simple tokenization."""
-        # Convert to lowercase and split on non-alphanumeric
-        text = text.lower()
-        tokens = re.findall(r"\w+", text)
-        # Remove common stopwords
-        stopwords = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for"}
-        return [t for t in tokens if t not in stopwords]
-
-    def _get_doc_freqs(self, documents: List[str]) -> dict:
-        """Get document frequencies for each token."""
-        freqs = {}
-        for doc in documents:
-            tokens = set(self._tokenize(doc))
-            for token in tokens:
-                freqs[token] = freqs.get(token, 0) + 1
-        return freqs
-
-    def _bm25_score(self, query_tokens: List[str], doc: str, doc_freqs: dict, n_docs: int) -> float:
-        """Calculate BM25 score."""
-        doc_tokens = self._tokenize(doc)
-        doc_len = len(doc_tokens)
-        avg_doc_len = sum(len(self._tokenize(d)) for d in [doc]) / 1.0 or 1.0
-
-        score = 0.0
         for token in query_tokens:
-            # IDF calculation
-            df = doc_freqs.get(token, 1)
-            idf = (n_docs - df + 0.5) / (df + 0.5)
+            postings = index.postings.get(token)
+            if not postings:
+                continue
+            idf = index.idf(token)
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * (doc_lengths[doc_id] / avg_doc_len))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (tf * (self.k1 + 1)) / (tf + norm)
+
+        top = heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+        if normalize and top:
+            ceiling = (self.k1 + 1) * sum(index.idf(token) for token in query_tokens)
+            top = [(doc_id, score / ceiling) for doc_id, score in top]
+        return top
 
-            # Term frequency in document
-            tf = doc_tokens.count(token)
+    def search(self, query: str, documents: List[str], k: int = 5) -> List[Tuple[int, float]]:
+        """BM25 search over a list of documents.
 
-            # BM25 formula
-            numerator = tf * (self.k1 + 1)
-            denominator = tf + self.k1 * (1 - self.b + self.b * (doc_len / (avg_doc_len or 1)))
+        The documents are indexed separately from ``self.index``, and that
+        index is rebuilt only when the document list changes, so repeated
+        queries over the same corpus reuse postings and cached IDF values.
+        """
+        query_tokens = self._tokenize(query)
+        if not query_tokens:
+            return []
 
-            score += idf * (numerator / denominator)
+        corpus_key = hash(tuple(documents))
+        if corpus_key != self._corpus_key:
+            self._corpus_index.clear()
+            for doc_idx, doc in enumerate(documents):
+                self._corpus_index.add(doc_idx, doc)
+            self._corpus_key = corpus_key
+
+        scored = self._rank(self._corpus_index, query, len(documents), normalize=False)
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        results: List[Tuple[int, float]] = [(int(doc_idx), score) for doc_idx, score in scored[:k]]
+
+        # Pad with non-matching documents in corpus order, as a full scan would
+        if len(results) < k:
+            matched = {doc_idx for doc_idx, _ in results}
+            for doc_idx in range(len(documents)):
+                if len(results) >= k:
+                    break
+                if doc_idx not in matched:
+                    results.append((doc_idx, 0.0))
+        return results
 
-        return score
+    def _tokenize(self, text: str) -> List[str]:
+        """Tokenize and drop stopwords."""
+        return [t for t in tokenize(text) if t not in STOPWORDS]
 
 
 class HybridSearcher:
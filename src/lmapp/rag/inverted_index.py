@@ -0,0 +1,162 @@
+"""Inverted index with precomputed BM25 statistics."""
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+# Common stopwords, excluded from postings, document lengths and queries
+STOPWORDS = frozenset({"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for"})
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokenization shared by indexing and querying."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def content_hash(text: str) -> str:
+    """Short content fingerprint used to detect changed documents."""
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:16]
+
+
+class InvertedIndex:
+    """Postings lists, document lengths and cached IDF values for BM25.
+
+    Stopwords are not indexed: they would make nearly every document a
+    candidate for any query while contributing almost nothing to scores.
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[Hashable, int]] = {}
+        self.doc_lengths: Dict[Hashable, int] = {}
+        self.doc_hashes: Dict[Hashable, str] = {}
+        self._doc_terms: Dict[Hashable, List[str]] = {}
+        self._total_length = 0
+        self._idf_cache: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self.doc_lengths
+
+    @property
+    def avg_doc_length(self) -> float:
+        """Corpus-wide average document length."""
+        if not self.doc_lengths:
+            return 0.0
+        return self._total_length / len(self.doc_lengths)
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        """Index a document, replacing any previous version with the same id."""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+
+        counts = Counter(t for t in tokenize(text) if t not in STOPWORDS)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+        length = sum(counts.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_hashes[doc_id] = content_hash(text)
+        self._doc_terms[doc_id] = list(counts)
+        self._total_length += length
+        self._idf_cache.clear()
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """Remove a document. Returns False if it was not indexed."""
+        if doc_id not in self.doc_lengths:
+            return False
+
+        for term in self._doc_terms.pop(doc_id, []):
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+
+        self._total_length -= self.doc_lengths.pop(doc_id)
+        self.doc_hashes.pop(doc_id, None)
+        self._idf_cache.clear()
+        return True
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self.postings.clear()
+        self.doc_lengths.clear()
+        self.doc_hashes.clear()
+        self._doc_terms.clear()
+        self._total_length = 0
+        self._idf_cache.clear()
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (non-negative variant)."""
+        cached = self._idf_cache.get(term)
+        if cached is not None:
+            return cached
+        n_docs = len(self.doc_lengths)
+        df = len(self.postings.get(term, ()))
+        value = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        self._idf_cache[term] = value
+        return value
+
+    def candidates(self, terms: Iterable[str]) -> Set[Hashable]:
+        """Ids of documents containing at least one of ``terms``."""
+        found: Set[Hashable] = set()
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs:
+                found.update(docs)
+        return found
+
+    def to_dict(self) -> Dict:
+        """Serialize to a JSON-compatible dict (document ids become strings)."""
+        return {
+            "version": self.FORMAT_VERSION,
+            "postings": {term: {str(d): tf for d, tf in docs.items()} for term, docs in self.postings.items()},
+            "doc_lengths": {str(d): n for d, n in self.doc_lengths.items()},
+            "doc_hashes": {str(d): h for d, h in self.doc_hashes.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InvertedIndex":
+        """Restore an index serialized with :meth:`to_dict`."""
+        index = cls()
+        if data.get("version") != cls.FORMAT_VERSION:
+            return index
+        index.postings = {term: dict(docs) for term, docs in data.get("postings", {}).items()}
+        index.doc_lengths = dict(data.get("doc_lengths", {}))
+        index.doc_hashes = dict(data.get("doc_hashes", {}))
+        index._total_length = sum(index.doc_lengths.values())
+        doc_terms: Dict[Hashable, List[str]] = {d: [] for d in index.doc_lengths}
+        for term, docs in index.postings.items():
+            for d in docs:
+                doc_terms.setdefault(d, []).append(term)
+        index._doc_terms = doc_terms
+        return index
+
+    def save(self, path: Path) -> None:
+        """Atomically write the index to ``path``."""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["InvertedIndex"]:
+        """Load an index from ``path``; returns None if missing or unreadable."""
+        try:
+            with open(path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except (IOError, json.JSONDecodeError, AttributeError):
+            return None
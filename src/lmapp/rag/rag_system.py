@@ -13,16 +13,22 @@ Features:
 - Smart Chunking for better context retrieval
 """
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-import json
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple
 import hashlib
 import logging
+import os
 
 from .models import Document, SearchResult
 from .vector_store import VectorStore
 from .chroma_store import ChromaDBStore
+from .file_manifest import FileManifest, FileRecord, hash_file
 from .ingestion import DocumentIngestor
+from .hybrid_search import BM25Searcher
+from .inverted_index import STOPWORDS, InvertedIndex, content_hash, tokenize
+from .segment_store import SegmentStore
 
 logger = logging.getLogger(__name__)
 
@@ -163,40 +169,70 @@ class DocumentIndex:
         self.index_dir = Path(index_dir)
         self.index_dir.mkdir(parents=True, exist_ok=True)
         self.documents_file = self.index_dir / "documents.jsonl"
+        self.keyword_index_file = self.index_dir / "bm25_index.json"
+        self.store = SegmentStore(self.index_dir)
         self.documents: Dict[str, Document] = {}
+        self.keyword_searcher = BM25Searcher()
+        self._keyword_index_dirty = False
         self._load_index()
 
     def _load_index(self) -> None:
-        """Load documents from index file."""
-        if not self.documents_file.exists():
-            return
-
+        """Load documents by replaying the segment store."""
         try:
-            with open(self.documents_file, "r") as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        doc = Document.from_dict(data)
-                        self.documents[doc.doc_id] = doc
-        except (json.JSONDecodeError, IOError):
-            pass
+            self.documents = self.store.load()
+        except IOError as e:
+            logger.error(f"Failed to load index from {self.index_dir}: {e}")
+        self._load_keyword_index()
+
+    def _load_keyword_index(self) -> None:
+        """Load the persisted inverted index and reconcile it with the documents.
+
+        Only documents whose content hash differs from the snapshot are
+        re-tokenized, so a clean shutdown means no tokenization at startup.
+        """
+        index = InvertedIndex.load(self.keyword_index_file) or InvertedIndex()
+        stale = [doc_id for doc_id in index.doc_lengths if doc_id not in self.documents]
+        for doc_id in stale:
+            index.remove(doc_id)
+
+        changed = 0
+        for doc in self.documents.values():
+            if index.doc_hashes.get(doc.doc_id) != content_hash(doc.content):
+                index.add(doc.doc_id, doc.content)
+                changed += 1
+
+        self.keyword_searcher = BM25Searcher(index=index)
+        self._keyword_index_dirty = bool(stale or changed)
 
     def _save_index(self) -> None:
-        """Save documents to index file."""
-        with open(self.documents_file, "w") as f:
-            for doc in self.documents.values():
-                f.write(json.dumps(doc.to_dict()) + "\n")
+        """Snapshot the in-memory documents into a single compacted segment."""
+        self.store.rewrite(self.documents.values())
+        self.flush()
+
+    def flush(self) -> None:
+        """Persist the keyword index if it changed since the last flush."""
+        if not self._keyword_index_dirty:
+            return
+        try:
+            self.keyword_searcher.index.save(self.keyword_index_file)
+            self._keyword_index_dirty = False
+        except IOError as e:
+            logger.error(f"Failed to save keyword index: {e}")
 
     def add_document(self, document: Document) -> None:
         """Add a document to the index."""
         self.documents[document.doc_id] = document
-        self._save_index()
+        self.store.put(document)
+        self.keyword_searcher.add_document(document.doc_id, document.content)
+        self._keyword_index_dirty = True
 
     def add_documents(self, documents: List[Document]) -> None:
         """Add multiple documents."""
         for doc in documents:
             self.documents[doc.doc_id] = doc
-        self._save_index()
+            self.keyword_searcher.add_document(doc.doc_id, doc.content)
+        self.store.put_many(documents)
+        self._keyword_index_dirty = True
 
     def get_document(self, doc_id: str) -> Optional[Document]:
         """Get a document by ID."""
@@ -206,44 +242,48 @@ class DocumentIndex:
         """Remove a document from index."""
         if doc_id in self.documents:
             del self.documents[doc_id]
-            self._save_index()
+            self.store.delete(doc_id)
+            self.keyword_searcher.remove_document(doc_id)
+            self._keyword_index_dirty = True
             return True
         return False
 
+    def clear(self) -> None:
+        """Remove all documents from the index."""
+        self.documents.clear()
+        self.keyword_searcher.index.clear()
+        self._keyword_index_dirty = True
+        self._save_index()
+
     def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """
-        Search documents using semantic similarity.
+        Search documents by BM25 keyword relevance.
+
+        Scores come straight from the inverted index's postings, document
+        lengths and IDF values; documents are never re-tokenized per query.
 
         Args:
             query: Search query
             top_k: Return top K results
 
         Returns:
-            List of SearchResult sorted by relevance
+            List of SearchResult sorted by relevance, with scores in [0, 1]
         """
         if not query or not self.documents:
             return []
 
-        query_tokens = SimpleVectorizer.tokenize(query)
+        query_tokens = [t for t in tokenize(query) if t not in STOPWORDS]
         results = []
-
-        for doc in self.documents.values():
-            doc_tokens = SimpleVectorizer.tokenize(doc.content)
-            score = SimpleVectorizer.calculate_similarity(query_tokens, doc_tokens)
-
-            if score > 0.0:
-                # Find matched text excerpt
-                matched_text = self._extract_matched_text(query_tokens, doc.content)
-                result = SearchResult(
+        for doc_id, score in self.keyword_searcher.search_index(query, k=top_k, normalize=True):
+            doc = self.documents[doc_id]
+            results.append(
+                SearchResult(
                     document=doc,
                     relevance_score=score,
-                    matched_text=matched_text,
+                    matched_text=self._extract_matched_text(query_tokens, doc.content),
                 )
-                results.append(result)
-
-        # Sort by score descending
-        results.sort(key=lambda x: x.relevance_score, reverse=True)
-        return results[:top_k]
+            )
+        return results
 
     def _extract_matched_text(self, query_tokens: List[str], content: str, window: int = 50) -> str:
         """Extract a snippet of text around the first match."""
@@ -272,6 +312,17 @@ class DocumentIndex:
         return snippet
 
 
+@dataclass
+class _PreparedFile:
+    """Output of the read/hash/chunk stage for one file."""
+
+    path: str
+    status: str  # "changed", "unchanged" or "failed"
+    record: Optional[FileRecord] = None
+    chunk_docs: List[Document] = field(default_factory=list)
+    vector_docs: List[Dict[str, Any]] = field(default_factory=list)
+
+
 class RAGSystem:
     """Main RAG system controller."""
 
@@ -306,6 +357,10 @@ class RAGSystem:
         # Always keep SimpleIndex for fallback/hybrid
         self.simple_index = DocumentIndex(self.index_dir)
 
+        # Manifest of indexed files for incremental re-indexing
+        self.file_manifest = FileManifest(self.index_dir / "file_manifest.json")
+        self.last_index_stats: Dict[str, int] = {}
+
     @property
     def index(self) -> DocumentIndex:
         """Alias for simple_index for backward compatibility."""
@@ -315,45 +370,69 @@ class RAGSystem:
         """
         Index a single file.
 
+        The indexes are persisted afterwards; to index several files, use
+        ``index_files`` so they are persisted once for the whole batch.
+
         Args:
             file_path: Path to file to index
 
         Returns:
             Document ID if successful, None otherwise
         """
+        return self.index_files([file_path])[0]
+
+    def index_files(self, file_paths: List[Path]) -> List[Optional[str]]:
+        """
+        Index several files, persisting the indexes once at the end.
+
+        Args:
+            file_paths: Paths of files to index
+
+        Returns:
+            Document ID (or None on failure) for each path, in order
+        """
+        doc_ids = [self._commit_prepared(self._prepare_file(Path(file_path), previous=None)) for file_path in file_paths]
+        self.flush()
+        return doc_ids
+
+    def flush(self) -> None:
+        """Persist the keyword index and file manifest."""
+        self.simple_index.flush()
+        self.file_manifest.save()
+
+    def _prepare_file(self, file_path: Path, previous: Optional[FileRecord]) -> _PreparedFile:
+        """Read, hash and chunk a file. Safe to run on a worker thread."""
+        path = str(file_path.absolute())
         try:
+            stat_result = file_path.stat()
+            sha256 = hash_file(file_path)
+            if previous is not None and previous.sha256 == sha256:
+                # Touched but not modified: refresh the stat, keep the chunks
+                record = FileRecord(path, stat_result.st_size, stat_result.st_mtime_ns, sha256, previous.chunk_ids)
+                return _PreparedFile(path, "unchanged", record=record)
+
             # Use ingestor to load file
             doc = self.ingestor.load_file(str(file_path))
             if not doc:
-                return None
+                return _PreparedFile(path, "failed")
 
             # Chunk the content
-            chunks = self.chunker.chunk_text(doc.content)
-            first_chunk_id = None
-
-            # Prepare documents for vector store
+            chunk_docs = []
             vector_docs = []
-
-            for i, chunk_content in enumerate(chunks):
+            for i, chunk_content in enumerate(self.chunker.chunk_text(doc.content)):
                 chunk_id = f"{doc.doc_id}_chunk_{i}"
-                if i == 0:
-                    first_chunk_id = chunk_id
-
-                chunk_doc = Document(
-                    doc_id=chunk_id,
-                    title=f"{doc.title} (Part {i+1})",
-                    content=chunk_content,
-                    file_path=doc.file_path,
-                    source_type=doc.source_type,
-                    metadata=doc.metadata,
-                    parent_id=doc.doc_id,
-                    chunk_index=i,
+                chunk_docs.append(
+                    Document(
+                        doc_id=chunk_id,
+                        title=f"{doc.title} (Part {i+1})",
+                        content=chunk_content,
+                        file_path=doc.file_path,
+                        source_type=doc.source_type,
+                        metadata=doc.metadata,
+                        parent_id=doc.doc_id,
+                        chunk_index=i,
+                    )
                 )
-
-                # Add to Simple Index
-                self.simple_index.add_document(chunk_doc)
-
-                # Prepare for Vector Store
                 vector_docs.append(
                     {
                         "doc_id": chunk_id,
@@ -362,38 +441,155 @@ class RAGSystem:
                     }
                 )
 
-            # Add to Vector Store if available
-            if self.vector_store and vector_docs:
-                self.vector_store.add_documents(vector_docs)
-
-            return first_chunk_id
+            record = FileRecord(path, stat_result.st_size, stat_result.st_mtime_ns, sha256, [d.doc_id for d in chunk_docs])
+            return _PreparedFile(path, "changed", record=record, chunk_docs=chunk_docs, vector_docs=vector_docs)
 
         except Exception as e:
             logger.error(f"Error indexing file {file_path}: {e}")
+            return _PreparedFile(path, "failed")
+
+    def _commit_prepared(self, prepared: _PreparedFile) -> Optional[str]:
+        """Write a prepared file to the indexes and manifest. Runs on the calling thread."""
+        if prepared.record is None:
+            return None
+
+        if prepared.status == "unchanged":
+            self.file_manifest.set(prepared.record)
+            return prepared.record.chunk_ids[0] if prepared.record.chunk_ids else None
+
+        previous = self.file_manifest.get(prepared.path)
+        if previous is not None:
+            stale = set(previous.chunk_ids) - set(prepared.record.chunk_ids)
+            self._remove_chunks(sorted(stale))
+
+        try:
+            # Add to Simple Index in a single append
+            self.simple_index.add_documents(prepared.chunk_docs)
+
+            # Add to Vector Store if available (this is where chunks are embedded)
+            if self.vector_store and prepared.vector_docs:
+                self.vector_store.add_documents(prepared.vector_docs)
+        except Exception as e:
+            logger.error(f"Error indexing file {prepared.path}: {e}")
             return None
 
-    def index_directory(self, directory: Path, extensions: Optional[List[str]] = None) -> int:
+        self.file_manifest.set(prepared.record)
+        return prepared.record.chunk_ids[0] if prepared.record.chunk_ids else None
+
+    def _remove_chunks(self, chunk_ids: List[str]) -> None:
+        """Remove chunks from the simple index and vector store."""
+        if not chunk_ids:
+            return
+        for chunk_id in chunk_ids:
+            self.simple_index.remove_document(chunk_id)
+        if self.vector_store:
+            try:
+                self.vector_store.delete(chunk_ids)
+            except Exception as e:
+                logger.error(f"Failed to delete chunks from vector store: {e}")
+
+    def _iter_files(self, directory: Path, extensions: List[str]) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Walk a directory with scandir, skipping the index directory itself."""
+        index_dir = str(self.index_dir.absolute())
+        stack = [str(directory.absolute())]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path != index_dir:
+                                stack.append(entry.path)
+                        elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions:
+                            yield Path(entry.path), entry.stat()
+            except OSError as e:
+                logger.warning(f"Cannot scan {current}: {e}")
+
+    def index_directory(
+        self,
+        directory: Path,
+        extensions: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        force: bool = False,
+        prune: bool = False,
+    ) -> int:
         """
-        Index all files in a directory.
+        Incrementally index all files in a directory.
+
+        Files whose size and mtime match the manifest are skipped without being
+        read; files that were touched but whose content hash is unchanged are
+        not re-chunked; files that disappeared have their chunks purged.
+        Previously indexed files that still exist but were not visited (for
+        example because ``extensions`` is narrower this time) are kept unless
+        ``prune`` is set.
+        Reading, hashing and chunking run on a worker pool while the calling
+        thread writes results to the indexes as they complete.
 
         Args:
             directory: Directory to index
             extensions: File extensions to index (default: common text/code formats)
+            workers: Worker threads for reading and chunking (default: executor default)
+            force: Re-index every file even if unchanged
+            prune: Also purge indexed files under ``directory`` that were not
+                visited in this run, such as ones excluded by ``extensions``
 
         Returns:
-            Number of files indexed
+            Number of files (re)indexed in this run. Counts for unchanged,
+            removed and failed files are available in ``last_index_stats``.
         """
         if extensions is None:
             extensions = [".txt", ".md", ".py", ".js", ".ts", ".java", ".c", ".cpp", ".h", ".json", ".yaml", ".yml", ".xml", ".html", ".css", ".pdf", ".docx"]
-
-        indexed_count = 0
-
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in extensions:
-                if self.index_file(file_path):
-                    indexed_count += 1
-
-        return indexed_count
+        extensions = [ext.lower() for ext in extensions]
+
+        directory = Path(directory)
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        seen = set()
+
+        def consume(future: "Future[_PreparedFile]") -> None:
+            prepared = future.result()
+            if prepared.status == "unchanged":
+                self._commit_prepared(prepared)
+                stats["unchanged"] += 1
+            elif prepared.status == "changed" and self._commit_prepared(prepared):
+                stats["indexed"] += 1
+            else:
+                stats["failed"] += 1
+
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lmapp-rag-index") as executor:
+            # Bound the number of prepared-but-uncommitted files held in memory
+            max_in_flight = workers * 2
+            in_flight: Set["Future[_PreparedFile]"] = set()
+
+            for file_path, stat_result in self._iter_files(directory, extensions):
+                path = str(file_path.absolute())
+                seen.add(path)
+                previous = self.file_manifest.get(path)
+                if previous is not None and not force and previous.matches_stat(stat_result):
+                    stats["unchanged"] += 1
+                    continue
+
+                in_flight.add(executor.submit(self._prepare_file, file_path, None if force else previous))
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        consume(future)
+
+            for future in as_completed(in_flight):
+                consume(future)
+
+        # Purge files that were deleted (and, when pruning, ones not visited)
+        for path in self.file_manifest.paths_under(directory):
+            if path not in seen and (prune or not Path(path).exists()):
+                record = self.file_manifest.remove(path)
+                if record is not None:
+                    self._remove_chunks(record.chunk_ids)
+                    stats["removed"] += 1
+
+        self.flush()
+        self.last_index_stats = stats
+        logger.info(f"Indexed {directory}: {stats}")
+        return stats["indexed"]
 
     def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """
@@ -483,8 +679,9 @@ class RAGSystem:
 
     def clear_index(self) -> None:
         """Clear all indexed documents."""
-        self.simple_index.documents.clear()
-        self.simple_index._save_index()
+        self.simple_index.clear()
+        self.file_manifest.clear()
+        self.file_manifest.save()
         if self.vector_store:
             # Chroma doesn't have a simple clear, usually delete collection
             # For now, we just rely on simple index clearing or implement delete_all later
@@ -0,0 +1,334 @@
+"""Append-only segmented document storage for the RAG index.
+
+Documents are written as JSON lines to numbered segment files. Updates append
+a new record and deletes append a tombstone, so every write is a single
+append regardless of index size. A small manifest lists the segments in
+replay order. Once enough records are superseded, sealed segments are merged
+into one compacted segment on a background thread.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import Document
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentStore:
+    """Append-only, segmented storage for documents with tombstone deletes."""
+
+    MANIFEST_NAME = "manifest.json"
+    SEGMENT_DIR = "segments"
+    LEGACY_FILE = "documents.jsonl"
+
+    def __init__(
+        self,
+        index_dir: Path,
+        max_segment_bytes: int = 8 * 1024 * 1024,
+        compaction_ratio: float = 0.5,
+        min_compaction_records: int = 1000,
+        background_compaction: bool = True,
+    ):
+        """
+        Initialize SegmentStore.
+
+        Args:
+            index_dir: Directory holding the manifest and segments
+            max_segment_bytes: Size after which the active segment is sealed
+            compaction_ratio: Fraction of dead records that triggers compaction
+            min_compaction_records: Minimum record count before compaction is considered
+            background_compaction: Compact on a background thread when triggered
+        """
+        self.index_dir = Path(index_dir)
+        self.segment_dir = self.index_dir / self.SEGMENT_DIR
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.index_dir / self.MANIFEST_NAME
+
+        self.max_segment_bytes = max_segment_bytes
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction_records = min_compaction_records
+        self.background_compaction = background_compaction
+
+        self._lock = threading.RLock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._segments: List[str] = []
+        self._next_segment = 0
+        self._active_handle = None
+        self._live_ids: set = set()
+        self._total_records = 0
+
+        self._load_manifest()
+
+    # ------------------------------------------------------------------
+    # Manifest handling
+    # ------------------------------------------------------------------
+
+    def _load_manifest(self) -> None:
+        """Load the manifest, migrating a legacy single-file index if present."""
+        if self.manifest_path.exists():
+            try:
+                data = json.loads(self.manifest_path.read_text())
+                self._segments = list(data.get("segments", []))
+                self._next_segment = int(data.get("next_segment", len(self._segments)))
+            except (json.JSONDecodeError, IOError, ValueError):
+                logger.warning(f"Corrupt manifest at {self.manifest_path}, rebuilding from segments")
+                self._segments = sorted(p.name for p in self.segment_dir.glob("seg-*.jsonl"))
+                self._next_segment = len(self._segments)
+        else:
+            legacy = self.index_dir / self.LEGACY_FILE
+            if legacy.exists():
+                name = self._new_segment_name()
+                os.replace(legacy, self.segment_dir / name)
+                self._segments.append(name)
+
+        if not self._segments:
+            self._segments.append(self._new_segment_name())
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        """Atomically persist the manifest."""
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "segments": self._segments, "next_segment": self._next_segment}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _new_segment_name(self) -> str:
+        """Allocate the next segment file name."""
+        name = f"seg-{self._next_segment:06d}.jsonl"
+        self._next_segment += 1
+        return name
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterable[Dict[str, Any]]:
+        """Yield records from a segment, skipping torn or corrupt lines."""
+        if not path.exists():
+            return
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt record in {path.name}")
+
+    @staticmethod
+    def _apply(record: Dict[str, Any], documents: Dict[str, Document]) -> None:
+        """Apply one record to a document map."""
+        op = record.get("op")
+        if op == "del":
+            documents.pop(record.get("doc_id"), None)
+        elif op == "put":
+            doc = Document.from_dict(record["doc"])
+            documents[doc.doc_id] = doc
+        elif "doc_id" in record:
+            # Legacy documents.jsonl line: a bare document dict
+            doc = Document.from_dict(record)
+            documents[doc.doc_id] = doc
+
+    def load(self) -> Dict[str, Document]:
+        """Replay all segments and return the live documents."""
+        documents: Dict[str, Document] = {}
+        with self._lock:
+            segments = list(self._segments)
+        total = 0
+        for name in segments:
+            for record in self._read_segment(self.segment_dir / name):
+                self._apply(record, documents)
+                total += 1
+        with self._lock:
+            self._live_ids = set(documents)
+            self._total_records = total
+        return documents
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _active_path(self) -> Path:
+        return self.segment_dir / self._segments[-1]
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the active segment, rolling it when full."""
+        payload = "".join(json.dumps(r) + "\n" for r in records)
+        with self._lock:
+            if self._active_handle is None:
+                self._active_handle = open(self._active_path(), "a")
+            self._active_handle.write(payload)
+            self._active_handle.flush()
+            self._total_records += len(records)
+            if self._active_handle.tell() >= self.max_segment_bytes:
+                self._seal_active()
+        self._maybe_compact()
+
+    def _seal_active(self) -> None:
+        """Close the active segment and start a new one. Caller holds the lock."""
+        if self._active_handle is not None:
+            self._active_handle.close()
+            self._active_handle = None
+        self._segments.append(self._new_segment_name())
+        self._write_manifest()
+
+    def put(self, document: Document) -> None:
+        """Append a document (insert or overwrite)."""
+        self.put_many([document])
+
+    def put_many(self, documents: Iterable[Document]) -> None:
+        """Append several documents in one write."""
+        records = [{"op": "put", "doc": doc.to_dict()} for doc in documents]
+        if not records:
+            return
+        with self._lock:
+            for record in records:
+                self._live_ids.add(record["doc"]["doc_id"])
+            self._append(records)
+
+    def delete(self, doc_id: str) -> None:
+        """Append a tombstone for a document."""
+        with self._lock:
+            self._live_ids.discard(doc_id)
+            self._append([{"op": "del", "doc_id": doc_id}])
+
+    def rewrite(self, documents: Iterable[Document]) -> None:
+        """Replace all segments with a single segment holding ``documents``."""
+        documents = list(documents)
+        self.wait_for_compaction()
+        with self._lock:
+            if self._active_handle is not None:
+                self._active_handle.close()
+                self._active_handle = None
+            old_segments = list(self._segments)
+            name = self._new_segment_name()
+            count = self._write_segment(name, documents)
+            self._segments = [name]
+            self._write_manifest()
+            self._remove_segments(old_segments)
+            self._live_ids = {doc.doc_id for doc in documents}
+            self._total_records = count
+        logger.debug(f"Rewrote index into {name} ({count} documents)")
+
+    def _write_segment(self, name: str, documents: Iterable[Document]) -> int:
+        """Write documents into a fresh segment file and return the record count."""
+        tmp_path, count = self._write_temp_segment(documents)
+        os.replace(tmp_path, self.segment_dir / name)
+        return count
+
+    def _write_temp_segment(self, documents: Iterable[Document]) -> Tuple[Path, int]:
+        """Write documents to a uniquely named temporary file in the segment directory."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.segment_dir, prefix="merge-", suffix=".tmp")
+        count = 0
+        with os.fdopen(fd, "w") as f:
+            for doc in documents:
+                f.write(json.dumps({"op": "put", "doc": doc.to_dict()}) + "\n")
+                count += 1
+        return Path(tmp_name), count
+
+    def _remove_segments(self, names: Iterable[str]) -> None:
+        for name in names:
+            try:
+                (self.segment_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    @property
+    def dead_records(self) -> int:
+        """Number of records superseded by a later put or tombstone."""
+        return max(0, self._total_records - len(self._live_ids))
+
+    def needs_compaction(self) -> bool:
+        """Whether enough records are dead to justify compaction."""
+        if self._total_records < self.min_compaction_records:
+            return False
+        return self.dead_records / self._total_records >= self.compaction_ratio
+
+    def _maybe_compact(self) -> None:
+        with self._lock:
+            if not self.needs_compaction():
+                return
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            self._seal_active()
+            if not self.background_compaction:
+                self._compaction_thread = None
+                run_inline = True
+            else:
+                self._compaction_thread = threading.Thread(target=self.compact, name="lmapp-rag-compaction", daemon=True)
+                run_inline = False
+        if run_inline:
+            self.compact()
+        else:
+            self._compaction_thread.start()  # type: ignore[union-attr]
+
+    def compact(self) -> None:
+        """Merge all sealed segments into one, dropping superseded records.
+
+        The active segment is left alone and the merged file is written
+        before the lock is taken, so writers are never blocked on the merge;
+        the lock only covers swapping the merged segment into the manifest.
+        Tombstones can be discarded because every older segment is merged too.
+        """
+        with self._lock:
+            sealed = self._segments[:-1]
+        if len(sealed) == 0:
+            return
+
+        documents: Dict[str, Document] = {}
+        merged_records = 0
+        for name in sealed:
+            for record in self._read_segment(self.segment_dir / name):
+                self._apply(record, documents)
+                merged_records += 1
+
+        tmp_path, count = self._write_temp_segment(documents.values())
+
+        with self._lock:
+            if self._segments[: len(sealed)] != sealed:
+                # The index was rewritten while we were merging; our output is stale.
+                tmp_path.unlink()
+                return
+            name = self._new_segment_name()
+            os.replace(tmp_path, self.segment_dir / name)
+            # Only the merged prefix is replaced; segments sealed meanwhile stay in order.
+            self._segments = [name] + self._segments[len(sealed) :]
+            self._write_manifest()
+            self._total_records -= merged_records - count
+        self._remove_segments(sealed)
+        logger.debug(f"Compacted {len(sealed)} segments into {name} ({count} documents)")
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Block until any running background compaction finishes."""
+        thread = self._compaction_thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def close(self) -> None:
+        """Flush and close the active segment."""
+        self.wait_for_compaction()
+        with self._lock:
+            if self._active_handle is not None:
+                self._active_handle.close()
+                self._active_handle = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics."""
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "total_records": self._total_records,
+                "live_documents": len(self._live_ids),
+                "dead_records": self.dead_records,
+            }
@@ -1,30 +1,157 @@
 """Vector store implementation with in-memory and persistent backends."""
 
 import asyncio
-from typing import List, Dict, Optional, Any
+import heapq
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timezone
 
 from src.lmapp.rag.vector_store import VectorStore, VectorDocument, SearchResult, VectorSearchResult
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
 
 class InMemoryVectorStore(VectorStore):
-    """In-memory vector store for testing and development."""
+    """In-memory vector store for testing and development.
+
+    Document vectors are kept as pre-normalised rows so a query costs a single
+    matrix-vector product. With NumPy installed the rows live in a contiguous
+    float32 matrix and top-k uses partial selection; without it the same
+    normalised rows are scored in pure Python.
+
+    The row store is maintained incrementally: adds append a row (the matrix
+    grows geometrically), updates overwrite their row in place and deletes
+    mark their row dead. Dead rows are compacted away once they outnumber
+    live ones. All non-empty vectors must share one dimension.
+    """
 
-    def __init__(self):
-        """Initialize memory store."""
+    def __init__(self, use_numpy: bool = True):
+        """Initialize memory store.
+
+        Args:
+            use_numpy: Use the NumPy matrix backend when NumPy is available
+        """
         self.documents: Dict[str, VectorDocument] = {}
         self._stats = {
             "documents_added": 0,
             "searches_performed": 0,
             "documents_deleted": 0,
         }
+        self.use_numpy = use_numpy and np is not None
+        self._reset_rows()
+
+    def _reset_rows(self) -> None:
+        # Row i belongs to _row_ids[i]; None marks a deleted row
+        self._row_ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._dead_rows = 0
+        self._dim = 0
+        self._rows: Any = np.zeros((0, 0), dtype=np.float32) if self.use_numpy else []
+
+    def _check_dimension(self, vector: List[float]) -> None:
+        """Reject vectors that cannot be compared with the stored ones."""
+        if vector and self._dim and len(vector) != self._dim:
+            raise ValueError(f"Vector dimension {len(vector)} does not match the store dimension {self._dim}")
 
     async def add_document(self, doc: VectorDocument) -> str:
-        """Add document to memory store."""
+        """Add document to memory store.
+
+        Raises:
+            ValueError: If the vector's dimension differs from the stored vectors
+        """
+        self._check_dimension(doc.vector)
         self.documents[doc.doc_id] = doc
         self._stats["documents_added"] += 1
+        self._put_row(doc.doc_id, doc.vector)
         return doc.doc_id
 
+    def _normalise(self, vector: List[float]) -> Any:
+        """Unit-length row for ``vector``; empty and zero vectors become zero rows."""
+        norm = sum(a * a for a in vector) ** 0.5 if vector else 0.0
+        if self.use_numpy:
+            return np.asarray(vector, dtype=np.float32) / np.float32(norm) if norm else np.zeros(self._dim, dtype=np.float32)
+        return tuple(a / norm for a in vector) if norm else (0.0,) * self._dim
+
+    def _put_row(self, doc_id: str, vector: List[float]) -> None:
+        """Write the row for ``doc_id``, in place if it already has one."""
+        if vector and not self._dim:
+            # First real vector fixes the dimension; earlier rows are all zero
+            self._dim = len(vector)
+            if self.use_numpy:
+                self._rows = np.zeros((len(self._rows), self._dim), dtype=np.float32)
+            else:
+                self._rows = [(0.0,) * self._dim for _ in self._rows]
+
+        row = self._normalise(vector)
+        index = self._row_of.get(doc_id)
+        if index is not None:
+            self._rows[index] = row
+            return
+
+        index = len(self._row_ids)
+        if self.use_numpy:
+            if index == len(self._rows):
+                grown = np.zeros((max(16, 2 * index), self._dim), dtype=np.float32)
+                grown[:index] = self._rows
+                self._rows = grown
+            self._rows[index] = row
+        else:
+            self._rows.append(row)
+        self._row_ids.append(doc_id)
+        self._row_of[doc_id] = index
+
+    def _drop_row(self, doc_id: str) -> None:
+        """Mark the row for ``doc_id`` dead, compacting once most rows are dead."""
+        index = self._row_of.pop(doc_id)
+        self._row_ids[index] = None
+        self._rows[index] = 0.0 if self.use_numpy else (0.0,) * self._dim
+        self._dead_rows += 1
+
+        if self._dead_rows > len(self._row_of):
+            live = [(i, row_id) for i, row_id in enumerate(self._row_ids) if row_id is not None]
+            if self.use_numpy:
+                self._rows = np.ascontiguousarray(self._rows[[i for i, _ in live]])
+            else:
+                self._rows = [self._rows[i] for i, _ in live]
+            self._row_ids = [row_id for _, row_id in live]
+            self._row_of = {row_id: i for i, row_id in enumerate(self._row_ids)}
+            self._dead_rows = 0
+
+    def _score(self, query_vector: List[float]) -> Any:
+        """Cosine similarity of the query against every row."""
+        n_rows = len(self._row_ids)
+        query_norm = sum(a * a for a in query_vector) ** 0.5 if query_vector else 0.0
+        if not query_norm or len(query_vector) != self._dim:
+            return np.zeros(n_rows, dtype=np.float32) if self.use_numpy else [0.0] * n_rows
+
+        if self.use_numpy:
+            query = np.asarray(query_vector, dtype=np.float32) / np.float32(query_norm)
+            return self._rows[:n_rows] @ query
+
+        query = [a / query_norm for a in query_vector]
+        return [sum(a * b for a, b in zip(row, query)) for row in self._rows]
+
+    def _top_k(self, scores: Any, candidates: Optional[List[int]], top_k: int) -> List[Tuple[int, float]]:
+        """Select the best (row, score) pairs, ties broken by insertion order."""
+        if top_k <= 0:
+            return []
+
+        if self.use_numpy:
+            rows = np.arange(len(scores)) if candidates is None else np.asarray(candidates, dtype=np.intp)
+            if len(rows) == 0:
+                return []
+            subset = scores[rows]
+            if top_k < len(rows):
+                part = np.argpartition(-subset, top_k - 1)[:top_k]
+                rows, subset = rows[part], subset[part]
+            order = np.lexsort((rows, -subset))
+            return [(int(rows[i]), float(subset[i])) for i in order]
+
+        rows = range(len(scores)) if candidates is None else candidates
+        return heapq.nsmallest(top_k, ((i, scores[i]) for i in rows), key=lambda x: (-x[1], x[0]))
+
     async def search(
         self,
         query_vector: List[float],
@@ -34,44 +161,55 @@ class InMemoryVectorStore(VectorStore):
         """Search memory store using cosine similarity."""
         self._stats["searches_performed"] += 1
 
-        results = []
-        for doc_id, doc in self.documents.items():
-            # Apply metadata filter
-            if filter_metadata:
-                match = all(doc.metadata.get(k) == v for k, v in filter_metadata.items())
-                if not match:
-                    continue
+        if not self.documents:
+            return []
+
+        scores = self._score(query_vector)
 
-            # Calculate cosine similarity
-            similarity = self._cosine_similarity(query_vector, doc.vector)
-            distance = 1.0 - similarity
+        # Apply metadata filter, skipping deleted rows
+        candidates = None
+        if filter_metadata:
+            candidates = [
+                i
+                for i, doc_id in enumerate(self._row_ids)
+                if doc_id is not None and all(self.documents[doc_id].metadata.get(k) == v for k, v in filter_metadata.items())
+            ]
+        elif self._dead_rows:
+            candidates = [i for i, doc_id in enumerate(self._row_ids) if doc_id is not None]
 
+        results = []
+        for row, similarity in self._top_k(scores, candidates, top_k):
+            doc = self.documents[self._row_ids[row]]
             results.append(
                 SearchResult(
-                    doc_id=doc_id,
+                    doc_id=doc.doc_id,
                     text=doc.text,
                     similarity=similarity,
                     metadata=doc.metadata,
-                    distance=distance,
+                    distance=1.0 - similarity,
                 )
             )
-
-        # Sort by similarity (descending) and return top k
-        results.sort(key=lambda x: -x.similarity)
-        return results[:top_k]
+        return results
 
     async def delete_document(self, doc_id: str) -> bool:
         """Delete document from store."""
         if doc_id in self.documents:
             del self.documents[doc_id]
             self._stats["documents_deleted"] += 1
+            self._drop_row(doc_id)
             return True
         return False
 
     async def update_document(self, doc: VectorDocument) -> bool:
-        """Update document in store."""
+        """Update document in store.
+
+        Raises:
+            ValueError: If the vector's dimension differs from the stored vectors
+        """
         if doc.doc_id in self.documents:
+            self._check_dimension(doc.vector)
             self.documents[doc.doc_id] = doc
+            self._put_row(doc.doc_id, doc.vector)
             return True
         return False
 
@@ -93,6 +231,7 @@ class InMemoryVectorStore(VectorStore):
     async def clear(self) -> None:
         """Clear all documents."""
         self.documents.clear()
+        self._reset_rows()
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get store statistics."""
@@ -100,6 +239,7 @@ class InMemoryVectorStore(VectorStore):
             **self._stats,
             "total_documents": len(self.documents),
             "type": "memory",
+            "backend": "numpy" if self.use_numpy else "python",
         }
 
     # Legacy methods
@@ -141,6 +281,7 @@ class InMemoryVectorStore(VectorStore):
         for doc_id in doc_ids:
             if doc_id in self.documents:
                 del self.documents[doc_id]
+                self._drop_row(doc_id)
 
     def persist(self) -> None:
         """Persist to disk (legacy - no-op for memory store)."""
@@ -1,8 +1,11 @@
+import asyncio
+import contextlib
 import os
 import signal
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from pathlib import Path
@@ -10,18 +13,41 @@ import time
 import json
 
 from lmapp import __version__
-from lmapp.backend.detector import BackendDetector
 from lmapp.utils.logging import logger
 from lmapp.server.analysis_service import get_analysis_service
+from lmapp.server.backend_state import AsyncBackendClient, BackendState
 from lmapp.server.refactoring_service import get_refactoring_service
+from lmapp.server.scheduler import RequestScheduler, SchedulerBusy
 from lmapp.server.streaming import stream_chat, format_stream_event
 
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep the resolved backend healthy in the background while serving."""
+    health_task = asyncio.create_task(app.state.backend_state.run_health_checks())
+    try:
+        yield
+    finally:
+        health_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await health_task
+        await app.state.async_client.aclose()
+
+
 app = FastAPI(
     title="lmapp API",
     description="Local LLM API Server for VS Code Integration",
     version=__version__,
+    lifespan=lifespan,
 )
 
+# --- State ---
+# Held on the application; handlers reach it through request.app.state
+
+app.state.backend_state = BackendState()
+app.state.async_client = AsyncBackendClient()
+app.state.scheduler = RequestScheduler()
+
 # --- Models ---
 
 
@@ -63,26 +89,9 @@ class ChatResponse(BaseModel):
     error: Optional[str] = None
 
 
-# --- State ---
-
-backend = None
-
-
-def get_backend():
-    global backend
-    if backend and backend.is_running():
-        return backend
-
-    detector = BackendDetector()
-    # Try to find running backend first
-    for b in detector.detect_all():
-        if b.is_running():
-            backend = b
-            return backend
-
-    # If none running, try to start one?
-    # For now, just return None if nothing is running
-    return None
+def get_backend(request: Request):
+    """Return the cached backend; detection only runs when it is missing or down."""
+    return request.app.state.backend_state.get()
 
 
 # --- Endpoints ---
@@ -100,12 +109,12 @@ if WEB_DIR.exists():
 
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Root endpoint - Redirects to UI if available"""
     if WEB_DIR.exists():
         return RedirectResponse(url="/ui/")
 
-    b = get_backend()
+    b = await request.app.state.backend_state.aget()
     status_color = "#4caf50" if b else "#f44336"
     status_text = "Online" if b else "Offline (No Backend)"
     backend_name = b.backend_name() if b else "None"
@@ -312,8 +321,8 @@ def shutdown_server(request: Request):
 
 
 @app.get("/health", response_model=HealthResponse)
-def health_check():
-    b = get_backend()
+def health_check(http_request: Request):
+    b = get_backend(http_request)
     status = "ok" if b else "no_backend"
     backend_name = b.backend_name() if b else None
     models = b.list_models() if b else []
@@ -322,8 +331,9 @@ def health_check():
 
 
 @app.post("/v1/completions", response_model=CompletionResponse)
-def create_completion(request: CompletionRequest):
-    b = get_backend()
+async def create_completion(request: CompletionRequest, http_request: Request):
+    state = http_request.app.state
+    b = await state.backend_state.aget()
     if not b:
         raise HTTPException(status_code=503, detail="No LLM backend available")
 
@@ -331,14 +341,26 @@ def create_completion(request: CompletionRequest):
         # This is a simplified chat call for now.
         # Real FIM (Fill-In-Middle) requires specific model support.
         # We'll treat the prompt as a user message.
-        response_text = b.chat(request.prompt, model=request.model)
+        key = state.scheduler.make_key(request.prompt, request.model, b.backend_name(), request.temperature or 0.7)
+        try:
+            response_text = await state.scheduler.submit(
+                key, request.model, lambda: state.async_client.complete(b, request.prompt, model=request.model)
+            )
+        except SchedulerBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception:
+            # Re-resolve on the next request in case the backend went away
+            state.backend_state.invalidate()
+            raise
 
         # Optional: Perform code analysis
         analysis_data = None
         if request.include_analysis:
             try:
                 analysis_service = get_analysis_service()
-                analysis_data = analysis_service.analyze_context(request.prompt, language=request.language or "python")
+                analysis_data = await run_in_threadpool(
+                    analysis_service.analyze_context, request.prompt, language=request.language or "python"
+                )
             except Exception as e:
                 logger.warning(f"Analysis failed: {e}")
                 # Continue without analysis if it fails
@@ -360,6 +382,8 @@ def create_completion(request: CompletionRequest):
             model=request.model,
             choices=[choice],
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Completion failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -381,27 +405,35 @@ def analyze_code(request: CompletionRequest):
 
 
 @app.post("/v1/chat")
-def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """Chat endpoint for GUI - simple request/response"""
-    b = get_backend()
+    state = http_request.app.state
+    b = await state.backend_state.aget()
     if not b:
         return ChatResponse(response="", model="none", error="No LLM backend available")
     
+    model = request.model
     try:
         # Get model or use default
-        model = request.model
         if not model:
-            models = b.list_models()
+            models = await run_in_threadpool(b.list_models)
             model = models[0] if models else "default"
         
-        # Get response from backend (non-streaming)
-        response_text = b.chat(
-            prompt=request.message,
-            model=model,
-            system_prompt=request.system_prompt,
-            temperature=0.7,
-            stream=False
-        )
+        # Get response from backend (non-streaming); identical concurrent
+        # requests share one generation
+        key = state.scheduler.make_key(request.message, model, b.backend_name(), 0.7, request.system_prompt)
+        try:
+            response_text = await state.scheduler.submit(
+                key,
+                model,
+                lambda: state.async_client.complete(b, request.message, model=model, system_prompt=request.system_prompt),
+            )
+        except SchedulerBusy:
+            raise
+        except Exception:
+            # Re-resolve on the next request in case the backend went away
+            state.backend_state.invalidate()
+            raise
         
         return ChatResponse(response=response_text, model=model)
     
@@ -411,9 +443,9 @@ def chat(request: ChatRequest):
 
 
 @app.post("/v1/chat/stream")
-def chat_stream(request: ChatRequest):
+def chat_stream(request: ChatRequest, http_request: Request):
     """Streaming chat endpoint for GUI - real-time responses"""
-    b = get_backend()
+    b = get_backend(http_request)
     if not b:
         def error_stream():
             yield format_stream_event("Error: No LLM backend available")
@@ -444,9 +476,9 @@ def chat_stream(request: ChatRequest):
 
 
 @app.get("/v1/models")
-def list_models():
+def list_models(http_request: Request):
     """List available models"""
-    b = get_backend()
+    b = get_backend(http_request)
     if not b:
         return {"models": [], "error": "No backend available"}
     
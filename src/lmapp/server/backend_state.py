@@ -0,0 +1,178 @@
+"""
+Backend resolution and async request path for the API server.
+
+The server resolves its LLM backend once and keeps it in application state;
+a background task re-checks health periodically instead of every request
+running backend detection. Completions are sent with a non-blocking HTTP
+client so a long generation doesn't hold a threadpool worker.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from lmapp.backend.base import LLMBackend
+from lmapp.backend.detector import BackendDetector
+from lmapp.backend.llamafile import LlamafileBackend
+from lmapp.backend.ollama import OllamaBackend
+from lmapp.utils.logging import logger
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+
+class BackendState:
+    """Resolved LLM backend shared by all request handlers."""
+
+    REFRESH_INTERVAL = 10.0
+    MISSING_RETRY = 2.0
+
+    def __init__(
+        self,
+        detector_factory: Callable[[], BackendDetector] = BackendDetector,
+        refresh_interval: float = REFRESH_INTERVAL,
+    ):
+        """
+        Initialize backend state.
+
+        Args:
+            detector_factory: Builds the detector used to find running backends
+            refresh_interval: Seconds between background health checks
+        """
+        self.detector_factory = detector_factory
+        self.refresh_interval = refresh_interval
+        self._detector: Optional[BackendDetector] = None
+        self._backend: Optional[LLMBackend] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.detections = 0
+
+    def _is_fresh(self) -> bool:
+        if self._checked_at is None:
+            return False
+        if self._backend is not None:
+            return True
+        # With nothing running, look again soon so a freshly started backend is picked up
+        return time.monotonic() - self._checked_at < self.MISSING_RETRY
+
+    def get(self) -> Optional[LLMBackend]:
+        """Return the resolved backend, resolving it first if needed."""
+        if self._is_fresh():
+            return self._backend
+        return self.refresh()
+
+    async def aget(self) -> Optional[LLMBackend]:
+        """Async variant of get() that never blocks the event loop."""
+        if self._is_fresh():
+            return self._backend
+        return await run_in_threadpool(self.refresh)
+
+    def refresh(self) -> Optional[LLMBackend]:
+        """Re-check the current backend and run detection if it is gone."""
+        with self._lock:
+            current = self._backend
+            if current is not None and current.is_running():
+                self._checked_at = time.monotonic()
+                return current
+
+            if self._detector is None:
+                self._detector = self.detector_factory()
+            self.detections += 1
+            resolved = None
+            for b in self._detector.detect_all():
+                if b.is_running():
+                    resolved = b
+                    break
+
+            if resolved is not current:
+                name = resolved.backend_name() if resolved else "none"
+                logger.info(f"Server backend resolved: {name}")
+            self._backend = resolved
+            self._checked_at = time.monotonic()
+            return resolved
+
+    def invalidate(self) -> None:
+        """Force the next lookup to re-check the backend."""
+        self._checked_at = None
+
+    async def run_health_checks(self) -> None:
+        """Refresh the backend every refresh_interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await run_in_threadpool(self.refresh)
+            except Exception as e:
+                logger.warning(f"Backend health check failed: {e}")
+
+
+class AsyncBackendClient:
+    """Sends completions to HTTP backends without blocking the event loop.
+
+    Ollama and llamafile are called directly with an async HTTP client when
+    httpx is installed; any other backend (or a missing httpx) falls back to
+    running the backend's blocking chat() in the threadpool.
+    """
+
+    def __init__(self, timeout: float = 60.0, max_connections: int = 32):
+        """
+        Initialize the client.
+
+        Args:
+            timeout: Per-request timeout in seconds
+            max_connections: Connection pool limit for the async HTTP client
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> Any:
+        """Async client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+            self._loop = loop
+        return self._client
+
+    async def complete(self, backend: LLMBackend, prompt: str, model: str = "", **kwargs: Any) -> str:
+        """
+        Generate a complete response for a prompt.
+
+        Raises:
+            RuntimeError: If the backend returns an error status
+        """
+        if httpx is None or not isinstance(backend, (OllamaBackend, LlamafileBackend)):
+            return await run_in_threadpool(lambda: backend.chat(prompt, model=model, **kwargs))
+
+        if isinstance(backend, OllamaBackend):
+            url = f"{backend.api_url}/api/generate"
+            payload = backend._generate_payload(prompt, model, False, kwargs)
+            field = "response"
+        else:
+            url = f"{backend.api_url}/completion"
+            payload = {"prompt": prompt, **kwargs, "stream": False}
+            field = "content"
+
+        try:
+            response = await self._get_client().post(url, json=payload)
+        except httpx.ConnectError:
+            if isinstance(backend, OllamaBackend):
+                backend.invalidate_health()
+            raise
+
+        if response.status_code != 200:
+            raise RuntimeError(f"{backend.backend_display_name()} returned HTTP {response.status_code}")
+        return response.json().get(field, "")
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
@@ -19,6 +19,10 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+_ASSIGNMENT = re.compile(r"\s*([a-z_]\w*)\s*=")
+_WORD = re.compile(r"\w+")
+_BOOL_COMPARISON = re.compile(r"==\s*True|==\s*False")
+
 
 class FixSeverity(str, Enum):
     """Severity of a refactoring fix."""
@@ -74,6 +78,40 @@ class QuickFix:
         }
 
 
+class SymbolUsage:
+    """
+    Where each identifier-like word occurs in a piece of code.
+
+    Built in one pass over the code, so quick-fix checks can ask whether a
+    name is used again without rescanning the rest of the file. Words are
+    matched the way ``\\b{name}\\b`` would match them, including occurrences
+    in strings and comments, and the code does not need to parse.
+    """
+
+    def __init__(self, lines: List[str]):
+        """
+        Index the words of the given lines.
+
+        Args:
+            lines: Source lines
+        """
+        self.lines = lines
+        self.last_line: Dict[str, int] = {}  # word -> index of the last line containing it
+
+        for line_idx, line in enumerate(lines):
+            for word in _WORD.findall(line):
+                self.last_line[word] = line_idx
+
+    @classmethod
+    def from_code(cls, code: str) -> "SymbolUsage":
+        """Build the usage table for a piece of code."""
+        return cls(code.split("\n"))
+
+    def is_used_after(self, name: str, line_idx: int) -> bool:
+        """Whether ``name`` appears on any line after ``line_idx``."""
+        return self.last_line.get(name, -1) > line_idx
+
+
 class RefactoringService:
     """Service for generating refactoring and quick-fix suggestions."""
 
@@ -161,11 +199,11 @@ class RefactoringService:
     def _get_python_fixes(self, code: str) -> List[QuickFix]:
         """Generate Python-specific fixes."""
         fixes: List[QuickFix] = []
-        lines = code.split("\n")
+        usage = SymbolUsage.from_code(code)
 
-        for line_num, line in enumerate(lines, 1):
+        for line_num, line in enumerate(usage.lines, 1):
             # Check for unused variables
-            if self._is_unused_variable_python(line, lines, line_num - 1):
+            if self._is_unused_variable_python(line, usage, line_num - 1):
                 fixes.append(
                     QuickFix(
                         id=f"fix-{self.fix_counter}",
@@ -202,7 +240,7 @@ class RefactoringService:
                 self.fix_counter += 1
 
             # Check for == True/False
-            if re.search(r"==\s*True|==\s*False", line):
+            if _BOOL_COMPARISON.search(line):
                 if "== True" in line:
                     fixed_line = line.replace("== True", "")
                 elif "== False" in line:
@@ -298,9 +336,9 @@ class RefactoringService:
 
         return fixes
 
-    def _is_unused_variable_python(self, line: str, lines: List[str], line_idx: int) -> bool:
+    def _is_unused_variable_python(self, line: str, usage: SymbolUsage, line_idx: int) -> bool:
         """Check if a variable is assigned but never used in Python."""
-        match = re.match(r"\s*([a-z_]\w*)\s*=", line)
+        match = _ASSIGNMENT.match(line)
         if not match:
             return False
 
@@ -311,11 +349,7 @@ class RefactoringService:
             return False
 
         # Check if variable is used later
-        remaining_code = "\n".join(lines[line_idx + 1 :])
-        if re.search(rf"\b{var_name}\b", remaining_code):
-            return False
-
-        return True
+        return not usage.is_used_after(var_name, line_idx)
 
     def apply_fix(self, code: str, fix: QuickFix) -> Tuple[str, bool]:
         """
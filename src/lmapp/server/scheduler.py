@@ -0,0 +1,115 @@
+"""
+Request coalescing scheduler for the API server.
+
+Identical requests that arrive while a generation for them is already in
+flight share that generation instead of starting their own. Distinct work is
+admitted through a bounded queue and runs under a per-model concurrency
+limit, so a burst queues in order rather than piling onto a local model that
+can only decode a few sequences at once.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from lmapp.core.cache import ResponseCache
+
+
+class SchedulerBusy(RuntimeError):
+    """Raised when the admission queue is full."""
+
+
+class RequestScheduler:
+    """Coalesces identical in-flight requests and bounds concurrency per model."""
+
+    def __init__(self, max_concurrency_per_model: int = 2, max_queue: int = 64):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency_per_model: Generations allowed to run at once per model
+            max_queue: Distinct requests allowed to be queued or running at once
+        """
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self.max_queue = max(1, max_queue)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._pending = 0
+        self._stats = {"submitted": 0, "coalesced": 0, "executed": 0, "rejected": 0}
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        model: str,
+        backend: str,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        """Request key, derived the same way as ResponseCache keys."""
+        if system_prompt:
+            prompt = f"{system_prompt}\0{prompt}"
+        return ResponseCache._hash_query(prompt, model, backend, temperature)
+
+    def _bind_loop(self) -> None:
+        """Futures and semaphores belong to one event loop; reset on a new one."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._in_flight = {}
+            self._limits = {}
+            self._pending = 0
+
+    async def submit(self, key: str, model: str, generate: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``generate`` for ``key``, or join the identical request already running.
+
+        Args:
+            key: Request key (see make_key)
+            model: Model name the per-model limit applies to
+            generate: Coroutine factory that performs the generation
+
+        Returns:
+            The generation result, shared by every coalesced caller
+
+        Raises:
+            SchedulerBusy: If the admission queue is full
+        """
+        self._bind_loop()
+        self._stats["submitted"] += 1
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            if self._pending >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise SchedulerBusy(f"Request queue is full ({self.max_queue} pending)")
+            self._pending += 1
+            task = asyncio.ensure_future(self._run(key, model, generate))
+            # Failures are re-raised to waiters; retrieve here so none go unobserved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._in_flight[key] = task
+
+        # The generation runs as its own task and is shielded, so a caller that
+        # disconnects doesn't cancel the result other callers are waiting for
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, model: str, generate: Callable[[], Awaitable[Any]]) -> Any:
+        limit = self._limits.setdefault(model, asyncio.Semaphore(self.max_concurrency_per_model))
+        try:
+            async with limit:
+                self._stats["executed"] += 1
+                return await generate()
+        finally:
+            self._pending -= 1
+            self._in_flight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler counters."""
+        return {
+            **self._stats,
+            "in_flight": len(self._in_flight),
+            "pending": self._pending,
+            "max_queue": self.max_queue,
+            "max_concurrency_per_model": self.max_concurrency_per_model,
+        }
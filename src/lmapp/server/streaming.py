@@ -19,7 +19,18 @@ def stream_chat(backend, model: str, prompt: str, system_prompt: Optional[str] =
         Text chunks as they arrive from LLM
     """
     try:
-        # Most backends support stream=True parameter
+        # Backends forward tokens as they are generated
+        if hasattr(backend, 'stream_chat'):
+            for chunk in backend.stream_chat(
+                prompt=prompt,
+                model=model,
+                system_prompt=system_prompt,
+                temperature=0.7
+            ):
+                if chunk:
+                    yield chunk
+            return
+
         response = backend.chat(
             prompt=prompt,
             model=model,
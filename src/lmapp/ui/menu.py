@@ -256,34 +256,31 @@ class MainMenu:
             console.clear()
             console.print("[bold cyan]🔌 Plugins[/bold cyan]\n")
 
-            # Discover actual plugins
-            plugin_paths = self.plugin_manager.discover_plugins()
+            # Discover plugins from the manifest (plugin code is not imported)
+            manifest = self.plugin_manager.refresh_manifest()
 
-            if not plugin_paths:
+            if not manifest:
                 console.print("[dim]No plugins found[/dim]")
                 console.print("[yellow]Visit github.com/nabaznyl/lmapp for plugins[/yellow]")
                 console.input("\n[dim]Press Enter to go back...[/dim]")
                 break
 
-            # Load plugins and group by category/tags
+            # Group plugins by category/tags
             plugins_by_category: Dict[str, List[Any]] = {}
             choices = []
 
-            for plugin_path in plugin_paths:
-                plugin_info = self.plugin_manager.load_plugin(plugin_path)
-                if plugin_info and plugin_info.metadata:
-                    name = plugin_info.metadata.name
-                    desc = plugin_info.metadata.description or "No description"
-                    tags = plugin_info.metadata.tags or ["General"]
+            for name, entry in sorted(manifest.items()):
+                desc = entry.metadata.description or "No description"
+                tags = entry.metadata.tags or ["General"]
 
-                    category = tags[0] if tags else "General"
-                    if category not in plugins_by_category:
-                        plugins_by_category[category] = []
-                        choices.append((f"[bold cyan]{category}[/bold cyan]", f"HEADER_{category}"))
+                category = tags[0] if tags else "General"
+                if category not in plugins_by_category:
+                    plugins_by_category[category] = []
+                    choices.append((f"[bold cyan]{category}[/bold cyan]", f"HEADER_{category}"))
 
-                    plugins_by_category[category].append((name, plugin_info))
-                    choices.append((f"  {name:<25} - {desc[:40]}", name))
-                    choices.append(("", "SPACER"))
+                plugins_by_category[category].append(name)
+                choices.append((f"  {name:<25} - {desc[:40]}", name))
+                choices.append(("", "SPACER"))
 
             if not choices:
                 console.print("[dim]No plugins available[/dim]")
@@ -304,12 +301,9 @@ class MainMenu:
                     break
                 continue
 
-            # Find and execute selected plugin
-            for category, plugins in plugins_by_category.items():
-                for name, plugin_info in plugins:
-                    if name == selected:
-                        self._execute_plugin(plugin_info)
-                        break
+            # Load and execute the selected plugin
+            if selected in manifest:
+                self._execute_plugin(self.plugin_manager.activate(selected))
 
     def _manage_plugins_advanced(self):
         """Full plugin management for advanced users - load real plugins"""
@@ -317,29 +311,28 @@ class MainMenu:
             console.clear()
             console.print("[bold cyan]🔌 Plugins (Advanced Mode)[/bold cyan]\n")
 
-            # Discover actual plugins
-            plugin_paths = self.plugin_manager.discover_plugins()
+            # Discover plugins from the manifest (plugin code is not imported)
+            self.plugin_manager.refresh_manifest()
+            plugins = self.plugin_manager.list_plugins()
 
-            if not plugin_paths:
+            if not plugins:
                 console.print("[dim]No plugins found[/dim]")
                 console.print("[yellow]To add plugins, place them in ~/.lmapp/plugins/[/yellow]")
                 console.input("\n[dim]Press Enter to go back...[/dim]")
                 break
 
-            # Load and display all plugins
+            # Display all plugins
             choices = []
-            loaded_plugins = {}
+            available = set()
 
-            for plugin_path in plugin_paths:
-                plugin_info = self.plugin_manager.load_plugin(plugin_path)
-                if plugin_info and plugin_info.metadata:
-                    name = plugin_info.metadata.name
-                    version = plugin_info.metadata.version or "unknown"
-                    desc = plugin_info.metadata.description or "No description"
-                    loaded_plugins[name] = plugin_info
+            for plugin in plugins:
+                name = plugin["name"]
+                version = plugin["version"] or "unknown"
+                desc = plugin["description"] or "No description"
+                available.add(name)
 
-                    status = "✓" if plugin_info.is_loaded else "✗"
-                    choices.append((f"{status} {name:<20} v{version:<10} - {desc[:35]}", name))
+                status = "✗" if plugin["status"] == "error" else "✓"
+                choices.append((f"{status} {name:<20} v{version:<10} - {desc[:35]}", name))
 
             choices.extend(
                 [
@@ -361,15 +354,20 @@ class MainMenu:
             elif selected == "repo":
                 console.print("[yellow]Plugin repository: github.com/nabaznyl/lmapp/plugins[/yellow]")
                 console.input("[dim]Press Enter to continue...[/dim]")
-            elif selected in loaded_plugins:
-                self._execute_plugin(loaded_plugins[selected])
+            elif selected in available:
+                self._execute_plugin(self.plugin_manager.activate(selected))
 
     def _execute_plugin(self, plugin_info):
         """Execute a plugin and display output
 
         Args:
-            plugin_info: PluginInfo object with loaded plugin
+            plugin_info: PluginInfo object with loaded plugin (None if it failed to load)
         """
+        if plugin_info is None:
+            console.print("[red]✗ Plugin failed to load[/red]")
+            console.input("\n[dim]Press Enter to go back...[/dim]")
+            return
+
         try:
             console.clear()
             console.print(f"[bold cyan]{plugin_info.metadata.name}[/bold cyan]\n")
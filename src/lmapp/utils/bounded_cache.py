@@ -0,0 +1,227 @@
+"""
+Bounded in-memory cache primitive
+
+An ordered-dict cache bounded by entry count and/or total size, evicting by
+least recently used (LRU) or least frequently used (LFU) order. Entry sizes
+are tracked as a running total, so get, set, pop and eviction are all
+constant time regardless of how many entries are cached.
+
+Not thread-safe; callers that share an instance across threads or tasks
+must hold their own lock.
+"""
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from enum import Enum
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class EvictionPolicy(Enum):
+    """Which entry a full cache gives up first"""
+
+    LRU = "lru"  # least recently used
+    LFU = "lfu"  # least frequently used, least recently used among ties
+
+
+class BoundedCache(MutableMapping, Generic[K, V]):
+    """
+    Size- and count-bounded cache with O(1) operations.
+
+    Entries are kept in frequency buckets, each an OrderedDict in recency
+    order, and the non-empty buckets form a linked list in ascending
+    frequency. Under LRU every entry stays in bucket 0 and a hit moves it to
+    the end; under LFU a hit moves it to the next bucket. The victim is
+    always the first entry of the lowest bucket.
+
+    The cache is also a mutable mapping, so it can stand in for a plain
+    dict: ``cache[key]`` reads without recording an access (like ``peek``),
+    ``cache[key] = value`` stores through ``set`` and ``del cache[key]``
+    removes the entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: Union[EvictionPolicy, str] = EvictionPolicy.LRU,
+        size_of: Optional[Callable[[V], int]] = None,
+    ):
+        """
+        Initialize BoundedCache.
+
+        Args:
+            max_entries: Maximum number of entries (None for unbounded)
+            max_bytes: Maximum sum of entry sizes (None for unbounded)
+            policy: Eviction policy, an EvictionPolicy or its value
+            size_of: Size of a value, used when ``set`` is not given one
+                (including ``cache[key] = value``); sizes default to 0
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = EvictionPolicy(policy)
+        self._lfu = self.policy is EvictionPolicy.LFU
+        self._size_of = size_of
+
+        # key -> [value, size, frequency]
+        self._data: Dict[K, list] = {}
+        self._buckets: Dict[int, "OrderedDict[K, None]"] = {}
+        # frequency -> [lower, higher] neighbouring non-empty buckets
+        self._links: Dict[int, list] = {}
+        self._min_frequency = 0
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._data)
+
+    def __getitem__(self, key: K) -> V:
+        slot = self._data.get(key)
+        if slot is None:
+            raise KeyError(key)
+        return slot[0]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    @property
+    def total_bytes(self) -> int:
+        """Sum of the sizes of all cached entries."""
+        return self._total_bytes
+
+    def get(self, key: K, default: Any = None) -> Any:
+        """Return the value for ``key`` and record the access."""
+        slot = self._data.get(key)
+        if slot is None:
+            return default
+        self._touch(key, slot)
+        return slot[0]
+
+    def peek(self, key: K, default: Any = None) -> Any:
+        """Return the value for ``key`` without affecting eviction order."""
+        slot = self._data.get(key)
+        return default if slot is None else slot[0]
+
+    def frequency(self, key: K) -> int:
+        """Number of recorded accesses since ``key`` was stored (0 if absent)."""
+        slot = self._data.get(key)
+        return 0 if slot is None else slot[2]
+
+    def set(self, key: K, value: V, size: Optional[int] = None) -> List[Tuple[K, V]]:
+        """
+        Store ``value`` under ``key``, evicting entries until it fits.
+
+        Replacing a key resets its access frequency. An entry larger than
+        ``max_bytes`` is not stored (and any previous value is dropped).
+        Without ``size``, the size comes from ``size_of`` (or is 0).
+
+        Returns:
+            The evicted (key, value) pairs, oldest victim first
+        """
+        if size is None:
+            size = self._size_of(value) if self._size_of is not None else 0
+        self.pop(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return []
+
+        evicted = []
+        while self._data and self._over_bounds(size, 1):
+            evicted.append(self.popitem())
+
+        self._data[key] = [value, size, 0]
+        self._link(key, 0, after=None)
+        self._total_bytes += size
+        return evicted
+
+    def pop(self, key: K, default: Any = None) -> Any:
+        """Remove ``key`` and return its value (``default`` if absent)."""
+        slot = self._data.pop(key, _MISSING)
+        if slot is _MISSING:
+            return default
+        self._unlink(key, slot[2] if self._lfu else 0)
+        self._total_bytes -= slot[1]
+        return slot[0]
+
+    def popitem(self) -> Tuple[K, V]:
+        """Remove and return the next (key, value) pair due for eviction."""
+        if not self._data:
+            raise KeyError("popitem(): cache is empty")
+        bucket = self._buckets[self._min_frequency]
+        key = next(iter(bucket))
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        self._buckets.clear()
+        self._links.clear()
+        self._min_frequency = 0
+        self._total_bytes = 0
+
+    def keys(self) -> Iterator[K]:
+        return iter(self._data)
+
+    def values(self) -> Iterator[V]:
+        return (slot[0] for slot in self._data.values())
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        return ((key, slot[0]) for key, slot in self._data.items())
+
+    def _over_bounds(self, extra_bytes: int, extra_entries: int) -> bool:
+        if self.max_entries is not None and len(self._data) + extra_entries > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._total_bytes + extra_bytes > self.max_bytes
+
+    def _link(self, key: K, frequency: int, after: Optional[int]) -> None:
+        """Append ``key`` to its bucket, creating the bucket right after ``after`` if needed."""
+        bucket = self._buckets.get(frequency)
+        if bucket is None:
+            bucket = self._buckets[frequency] = OrderedDict()
+            following = self._min_frequency if after is None else self._links[after][1]
+            if not self._links:
+                following = None
+            self._links[frequency] = [after, following]
+            if after is None:
+                self._min_frequency = frequency
+            else:
+                self._links[after][1] = frequency
+            if following is not None:
+                self._links[following][0] = frequency
+        bucket[key] = None
+
+    def _unlink(self, key: K, frequency: int) -> None:
+        """Drop ``key`` from its bucket, splicing the bucket out once empty."""
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if bucket:
+            return
+        del self._buckets[frequency]
+        previous, following = self._links.pop(frequency)
+        if previous is None:
+            self._min_frequency = following if following is not None else 0
+        else:
+            self._links[previous][1] = following
+        if following is not None:
+            self._links[following][0] = previous
+
+    def _touch(self, key: K, slot: list) -> None:
+        frequency = slot[2]
+        slot[2] = frequency + 1
+        if not self._lfu:
+            self._buckets[0].move_to_end(key)
+            return
+        self._link(key, frequency + 1, after=frequency)
+        self._unlink(key, frequency)
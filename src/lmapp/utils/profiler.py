@@ -4,12 +4,14 @@ Performance Profiling Module for LMAPP
 Tracks execution time, memory usage, cache hit rates, and identifies bottlenecks
 """
 
+import math
 import time
+import threading
 import psutil
 import os
-from typing import Dict, List, Any, Optional, Callable
+from typing import Deque, Dict, List, Any, Optional, Callable
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
 from contextlib import contextmanager
 from functools import wraps
 from datetime import datetime
@@ -51,21 +53,152 @@ class OperationMetrics:
         }
 
 
+@dataclass
+class ProcessSample:
+    """Process resource usage sampled at a point in time"""
+
+    timestamp: float
+    rss_bytes: int
+    cpu_percent: float
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram that doubles as a streaming quantile sketch
+
+    Bucket bounds grow geometrically, so every quantile is answered within
+    ``relative_accuracy`` of the true value while memory grows only with the
+    logarithm of the range of values seen, not with the number of samples.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        """
+        Initialize histogram
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+            min_value: Values below this share a single bucket
+        """
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.low_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record a value"""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < self.min_value:
+            self.low_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate the value below which a fraction ``q`` of samples fall"""
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.low_count
+        if rank < seen:
+            return self.min
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def histogram(self) -> List[Dict[str, float]]:
+        """Sample counts in power-of-two buckets, as ``{"le_ms", "count"}`` rows"""
+        coarse: Dict[int, int] = defaultdict(int)
+        if self.low_count:
+            coarse[math.ceil(math.log2(self.min_value))] += self.low_count
+        for index, count in self.buckets.items():
+            representative = 2 * self._gamma**index / (self._gamma + 1)
+            coarse[math.ceil(math.log2(representative))] += count
+        return [{"le_ms": 2.0**exponent, "count": coarse[exponent]} for exponent in sorted(coarse)]
+
+
+class OperationStats:
+    """Running aggregates for one operation, independent of how often it runs"""
+
+    def __init__(self):
+        self.successes = 0
+        self.memory_delta_bytes = 0
+        self.latency = LatencyHistogram()
+
+    def record(self, metrics: OperationMetrics) -> None:
+        self.latency.add(metrics.duration_ms)
+        self.successes += metrics.success
+        self.memory_delta_bytes += metrics.memory_delta_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = self.latency
+        return {
+            "count": latency.count,
+            "total_ms": latency.total,
+            "avg_ms": latency.total / latency.count,
+            "min_ms": latency.min,
+            "max_ms": latency.max,
+            "p50_ms": latency.quantile(0.50),
+            "p95_ms": latency.quantile(0.95),
+            "p99_ms": latency.quantile(0.99),
+            "total_memory_kb": self.memory_delta_bytes / 1024,
+            "success_rate": self.successes / latency.count * 100,
+            "histogram": latency.histogram(),
+        }
+
+
 class PerformanceProfiler:
     """
     Performance profiling and monitoring
     Tracks execution time, memory usage, and cache performance
+
+    Cheap enough to leave enabled: each operation updates running aggregates
+    and a fixed-size ring buffer of recent metrics, and the process's memory
+    and CPU usage are sampled at most once per ``sample_interval`` seconds
+    rather than on every call.
     """
 
-    def __init__(self, enable_memory_tracking: bool = True):
+    DEFAULT_HISTORY_SIZE = 100
+    DEFAULT_SAMPLE_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        enable_memory_tracking: bool = True,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ):
         """
         Initialize profiler
 
         Args:
             enable_memory_tracking: Whether to track memory usage
+            history_size: Recent metrics and process samples kept per ring buffer
+            sample_interval: Minimum seconds between process memory/CPU samples
+                (0 to sample around every operation)
         """
         self.enable_memory = enable_memory_tracking
-        self.metrics: Dict[str, List[OperationMetrics]] = defaultdict(list)
+        self.history_size = history_size
+        self.sample_interval = sample_interval
+        self.metrics: Dict[str, Deque[OperationMetrics]] = defaultdict(lambda: deque(maxlen=history_size))
+        self.stats: Dict[str, OperationStats] = {}
+        self.process_samples: Deque[ProcessSample] = deque(maxlen=history_size)
         self.process = psutil.Process(os.getpid())
         self.start_time = time.time()
         self.cache_stats = {
@@ -74,43 +207,69 @@ class PerformanceProfiler:
             "hit_rate": 0.0,
             "total_queries": 0,
         }
+        self._lock = threading.Lock()
+        self._next_sample = 0.0
+        self._rss_bytes = 0
+        self._cpu_percent = 0.0
+
+    def _sample_process(self) -> None:
+        """Refresh the cached process sample once the sampling interval has elapsed"""
+        now = time.monotonic()
+        if now < self._next_sample:
+            return
+        self._next_sample = now + self.sample_interval
+        try:
+            rss_bytes = self.process.memory_info().rss if self.enable_memory else 0
+            cpu_percent = self.process.cpu_percent()
+        except psutil.Error as e:
+            logger.debug(f"Could not sample process: {e}")
+            return
+        self._rss_bytes, self._cpu_percent = rss_bytes, cpu_percent
+        self.process_samples.append(ProcessSample(time.time(), rss_bytes, cpu_percent))
 
     @contextmanager
     def track_operation(self, operation_name: str):
         """
         Context manager for tracking operation performance
 
+        Memory figures come from the latest process sample, so an operation
+        shorter than the sampling interval usually reports a zero delta.
+
         Args:
             operation_name: Name of the operation
         """
+        self._sample_process()
         metrics = OperationMetrics(
             operation_name=operation_name,
             start_time=time.time(),
-            memory_start_bytes=(self.process.memory_info().rss if self.enable_memory else 0),
+            memory_start_bytes=self._rss_bytes,
         )
 
         try:
-            start_cpu = self.process.cpu_percent()
             yield metrics
-            metrics.end_time = time.time()
-            metrics.cpu_percent = self.process.cpu_percent() - start_cpu
             metrics.success = True
         except Exception as e:
-            metrics.end_time = time.time()
             metrics.success = False
             metrics.error_message = str(e)
             raise
         finally:
+            metrics.end_time = time.time()
+            metrics._update_duration()
+            self._sample_process()
             if self.enable_memory:
-                metrics.memory_end_bytes = self.process.memory_info().rss
+                metrics.memory_end_bytes = self._rss_bytes
                 metrics.memory_delta_bytes = metrics.memory_end_bytes - metrics.memory_start_bytes
-
-            # Ensure duration is calculated
-            if metrics.end_time:
-                metrics._update_duration()
-
-            self.metrics[operation_name].append(metrics)
-            logger.debug(f"Profiled {operation_name}: {metrics.duration_ms:.2f}ms")
+            metrics.cpu_percent = self._cpu_percent
+            self._record(metrics)
+
+    def _record(self, metrics: OperationMetrics) -> None:
+        name = metrics.operation_name
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = OperationStats()
+            stats.record(metrics)
+            self.metrics[name].append(metrics)
 
     def profile_function(self, func: Optional[str] = None) -> Callable:
         """
@@ -157,32 +316,17 @@ class PerformanceProfiler:
         Returns:
             Dictionary with performance metrics
         """
-        summary: Dict[str, Any] = {
+        with self._lock:
+            operations = {name: stats.to_dict() for name, stats in self.stats.items()}
+
+        return {
             "uptime_seconds": time.time() - self.start_time,
-            "operations": {},
+            "operations": operations,
             "cache_performance": self.cache_stats,
             "memory_usage": self._get_memory_summary(),
+            "process": self._get_process_summary(),
         }
 
-        for op_name, metrics_list in self.metrics.items():
-            if metrics_list:
-                durations = [m.duration_ms for m in metrics_list]
-                memory_deltas = [m.memory_delta_bytes for m in metrics_list]
-
-                ops_dict = summary["operations"]
-                if isinstance(ops_dict, dict):
-                    ops_dict[op_name] = {
-                        "count": len(metrics_list),
-                        "total_ms": sum(durations),
-                        "avg_ms": sum(durations) / len(durations),
-                        "min_ms": min(durations),
-                        "max_ms": max(durations),
-                        "total_memory_kb": (sum(memory_deltas) / 1024 if self.enable_memory else 0),
-                        "success_rate": sum(1 for m in metrics_list if m.success) / len(metrics_list) * 100,
-                    }
-
-        return summary
-
     def _get_memory_summary(self) -> Dict[str, float]:
         """Get memory usage summary"""
         try:
@@ -196,6 +340,16 @@ class PerformanceProfiler:
             logger.debug(f"Could not get memory info: {e}")
             return {"rss_mb": 0, "vms_mb": 0, "percent": 0}
 
+    def _get_process_summary(self) -> Dict[str, Any]:
+        """Summarize the ring buffer of periodic process samples"""
+        samples = list(self.process_samples)
+        return {
+            "sample_interval_seconds": self.sample_interval,
+            "samples": len(samples),
+            "cpu_percent_avg": (sum(s.cpu_percent for s in samples) / len(samples) if samples else 0.0),
+            "rss_peak_mb": max((s.rss_bytes for s in samples), default=0) / (1024 * 1024),
+        }
+
     def print_report(self, top_n: int = 10):
         """
         Print performance report
@@ -228,7 +382,7 @@ class PerformanceProfiler:
         # Top operations
         if summary["operations"]:
             print(f"\nTop {top_n} Operations by Total Time:")
-            print(f"{'Operation':<30} {'Count':>6} {'Total':>8} {'Avg':>8} {'Min':>8} {'Max':>8}")
+            print(f"{'Operation':<22} {'Count':>6} {'Total':>9} {'Avg':>8} {'P50':>8} {'P95':>8} {'P99':>8}")
             print("-" * 80)
 
             sorted_ops = sorted(
@@ -239,12 +393,13 @@ class PerformanceProfiler:
 
             for op_name, metrics in sorted_ops[:top_n]:
                 print(
-                    f"{op_name:<30} "
+                    f"{op_name:<22} "
                     f"{metrics['count']:>6d} "
                     f"{metrics['total_ms']:>7.1f}ms "
-                    f"{metrics['avg_ms']:>7.1f}ms "
-                    f"{metrics['min_ms']:>7.1f}ms "
-                    f"{metrics['max_ms']:>7.1f}ms"
+                    f"{metrics['avg_ms']:>6.1f}ms "
+                    f"{metrics['p50_ms']:>6.1f}ms "
+                    f"{metrics['p95_ms']:>6.1f}ms "
+                    f"{metrics['p99_ms']:>6.1f}ms"
                 )
 
         print("\n" + "=" * 80 + "\n")
@@ -1,44 +1,165 @@
 """
 Workflow LLM Response Cache
 Caches LLM responses to improve workflow execution speed on repeated runs.
+
+Entries live in a single SQLite database. Expiry, recency and creation time
+are indexed, and triggers keep a running entry count and byte total, so
+lookups, expiry sweeps, LRU eviction and statistics are all indexed queries.
+
+Database work runs in the event loop's default executor so it never
+blocks the event loop, and hits only record their access time in memory;
+the buffered times are written in one batch before the next write or
+eviction pass.
 """
+import asyncio
+import functools
 import hashlib
 import json
 import os
+import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
-import aiofiles
+from lmapp.utils.logging import logger
 
 
 class WorkflowCache:
-    """Cache for workflow LLM responses with TTL support."""
-    
-    def __init__(self, cache_dir: str = None, ttl_hours: int = 24):
+    """Cache for workflow LLM responses with TTL support and LRU bounds."""
+
+    CACHE_DB_NAME = "workflow_cache.db"
+    DEFAULT_MAX_ENTRIES = 10000
+    TOUCH_FLUSH_THRESHOLD = 64
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            workflow TEXT NOT NULL,
+            response TEXT NOT NULL,
+            variables TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries(expires_at);
+        CREATE INDEX IF NOT EXISTS idx_entries_last_accessed ON entries(last_accessed);
+        CREATE INDEX IF NOT EXISTS idx_entries_created_at ON entries(created_at);
+
+        -- Running totals, maintained by triggers so stats never scan the table
+        CREATE TABLE IF NOT EXISTS totals (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            entries INTEGER NOT NULL,
+            bytes INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO totals (id, entries, bytes) VALUES (0, 0, 0);
+
+        CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+            UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+            UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+            UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0;
+        END;
+    """
+
+    _SELECT_SQL = "SELECT response, expires_at FROM entries WHERE key = ?"
+    _TOUCH_SQL = "UPDATE entries SET last_accessed = ? WHERE key = ?"
+    _UPSERT_SQL = """
+        INSERT INTO entries (key, workflow, response, variables, size, created_at, expires_at, last_accessed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            workflow = excluded.workflow,
+            response = excluded.response,
+            variables = excluded.variables,
+            size = excluded.size,
+            created_at = excluded.created_at,
+            expires_at = excluded.expires_at,
+            last_accessed = excluded.last_accessed
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = None,
+        ttl_hours: int = 24,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        max_size_mb: Optional[float] = None,
+    ):
         """
         Initialize workflow cache.
-        
+
         Args:
-            cache_dir: Directory to store cache files. Defaults to ~/.lmapp/workflow_cache
+            cache_dir: Directory to store the cache database. Defaults to ~/.lmapp/workflow_cache
             ttl_hours: Time-to-live for cache entries in hours. Default 24 hours.
+            max_entries: Maximum number of entries; least recently used entries
+                are evicted beyond this (None for unbounded)
+            max_size_mb: Maximum total size of cached responses and variables
+                (None for unbounded)
         """
         if cache_dir is None:
             cache_dir = os.path.expanduser("~/.lmapp/workflow_cache")
-        
+
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / self.CACHE_DB_NAME
         self.ttl_seconds = ttl_hours * 3600
-        
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb is not None else None
+
+        # A single connection shared by the worker threads; every use holds _lock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # Buffered hit times: key -> last_accessed
+        self._pending_touches: Dict[str, float] = {}
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executescript(self._SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection, opening it on first use. Caller holds _lock."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, cached_statements=32, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """Write buffered access times. Caller holds _lock."""
+        if not self._pending_touches:
+            return
+        pending = self._pending_touches
+        self._pending_touches = {}
+        with conn:
+            conn.executemany(self._TOUCH_SQL, [(when, key) for key, when in pending.items()])
+
+    def close(self) -> None:
+        """Write buffered access times and close the database connection."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._flush_touches(self._conn)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to flush workflow cache access times: {e}")
+            self._conn.close()
+            self._conn = None
+
     def _generate_key(self, workflow_name: str, step: Dict[str, Any], variables: Dict[str, Any]) -> str:
         """
         Generate cache key from workflow name, step, and variables.
-        
+
         Args:
             workflow_name: Name of the workflow
             step: Workflow step dictionary
             variables: Current workflow variables
-            
+
         Returns:
             SHA256 hash as hex string
         """
@@ -49,52 +170,57 @@ class WorkflowCache:
             "prompt": step.get("prompt", ""),
             "variables": sorted(variables.items())  # Sort for consistency
         }
-        
+
         # Generate hash
         content = json.dumps(cache_input, sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()
-    
+
     async def get(self, workflow_name: str, step: Dict[str, Any], variables: Dict[str, Any]) -> Optional[str]:
         """
         Retrieve cached response if available and not expired.
-        
+
         Args:
             workflow_name: Name of the workflow
             step: Workflow step dictionary
             variables: Current workflow variables
-            
+
         Returns:
             Cached response string or None if not found/expired
         """
         key = self._generate_key(workflow_name, step, variables)
-        cache_file = self.cache_dir / f"{key}.json"
-        
-        if not cache_file.exists():
-            return None
-        
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(self._lookup, key))
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Blocking part of get(); runs in a worker thread."""
+        now = time.time()
         try:
-            async with aiofiles.open(cache_file, 'r') as f:
-                content = await f.read()
-                cache_data = json.loads(content)
-            
-            # Check expiration
-            age_seconds = time.time() - cache_data.get("timestamp", 0)
-            if age_seconds > self.ttl_seconds:
-                # Expired, remove it
-                cache_file.unlink()
-                return None
-            
-            return cache_data.get("response")
-            
-        except (json.JSONDecodeError, IOError, KeyError):
-            # Corrupted cache file, remove it
-            cache_file.unlink(missing_ok=True)
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(self._SELECT_SQL, (key,)).fetchone()
+                if row is None:
+                    return None
+
+                response, expires_at = row
+                if expires_at <= now:
+                    # Expired, remove it
+                    with conn:
+                        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._pending_touches.pop(key, None)
+                    return None
+
+                self._pending_touches[key] = now
+                if len(self._pending_touches) >= self.TOUCH_FLUSH_THRESHOLD:
+                    self._flush_touches(conn)
+            return response
+
+        except sqlite3.Error as e:
+            logger.warning(f"Workflow cache read failed: {e}")
             return None
-    
+
     async def set(self, workflow_name: str, step: Dict[str, Any], variables: Dict[str, Any], response: str):
         """
         Store response in cache.
-        
+
         Args:
             workflow_name: Name of the workflow
             step: Workflow step dictionary
@@ -102,76 +228,95 @@ class WorkflowCache:
             response: LLM response to cache
         """
         key = self._generate_key(workflow_name, step, variables)
-        cache_file = self.cache_dir / f"{key}.json"
-        
-        cache_data = {
-            "workflow": workflow_name,
-            "timestamp": time.time(),
-            "response": response,
-            "variables": variables
-        }
-        
+        variables_json = json.dumps(variables, default=str)
+        await asyncio.get_running_loop().run_in_executor(None, functools.partial(self._store, key, workflow_name, variables_json, response))
+
+    def _store(self, key: str, workflow_name: str, variables_json: str, response: str) -> None:
+        """Blocking part of set(); runs in a worker thread."""
+        size = len(response.encode()) + len(variables_json.encode())
+        now = time.time()
+
         try:
-            async with aiofiles.open(cache_file, 'w') as f:
-                await f.write(json.dumps(cache_data, indent=2))
-        except IOError as e:
+            with self._lock:
+                conn = self._connect()
+                # Eviction must see current recency, so buffered hits go first
+                self._pending_touches.pop(key, None)
+                self._flush_touches(conn)
+                with conn:
+                    conn.execute(
+                        self._UPSERT_SQL,
+                        (key, workflow_name, response, variables_json, size, now, now + self.ttl_seconds, now),
+                    )
+                    self._enforce_bounds(conn)
+        except sqlite3.Error as e:
             # Cache write failed, log but don't crash
-            print(f"Warning: Failed to write cache: {e}")
-    
+            logger.warning(f"Failed to write workflow cache: {e}")
+
+    def _totals(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        return conn.execute("SELECT entries, bytes FROM totals WHERE id = 0").fetchone()
+
+    def _enforce_bounds(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries, then least recently used ones, until within bounds."""
+        entries, total_bytes = self._totals(conn)
+        over_entries = self.max_entries is not None and entries > self.max_entries
+        over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+        if not (over_entries or over_bytes):
+            return
+
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        entries, total_bytes = self._totals(conn)
+
+        if self.max_entries is not None and entries > self.max_entries:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_accessed LIMIT ?)",
+                (entries - self.max_entries,),
+            )
+            entries, total_bytes = self._totals(conn)
+
+        if self.max_bytes is not None and total_bytes > self.max_bytes:
+            # Walk the LRU index, accumulating sizes until enough has been freed
+            excess = total_bytes - self.max_bytes
+            freed = 0
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_accessed"):
+                victims.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+
     def clear_expired(self):
         """Remove all expired cache entries."""
-        now = time.time()
-        removed_count = 0
-        
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                
-                age_seconds = now - cache_data.get("timestamp", 0)
-                if age_seconds > self.ttl_seconds:
-                    cache_file.unlink()
-                    removed_count += 1
-                    
-            except (json.JSONDecodeError, IOError, KeyError):
-                # Corrupted, remove it
-                cache_file.unlink(missing_ok=True)
-                removed_count += 1
-        
-        return removed_count
-    
+        with self._lock:
+            conn = self._connect()
+            self._flush_touches(conn)
+            with conn:
+                return conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+
     def clear_all(self):
         """Remove all cache entries."""
-        removed_count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
-            removed_count += 1
-        return removed_count
-    
+        with self._lock:
+            conn = self._connect()
+            self._pending_touches.clear()
+            with conn:
+                return conn.execute("DELETE FROM entries").rowcount
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
-        
+
         Returns:
             Dictionary with cache stats (total_entries, total_size_mb, oldest_entry_age_hours)
         """
-        cache_files = list(self.cache_dir.glob("*.json"))
-        total_size = sum(f.stat().st_size for f in cache_files)
-        
-        oldest_timestamp = time.time()
-        for cache_file in cache_files:
-            try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                    timestamp = cache_data.get("timestamp", time.time())
-                    oldest_timestamp = min(oldest_timestamp, timestamp)
-            except (json.JSONDecodeError, IOError, KeyError):
-                continue
-        
-        oldest_age_hours = (time.time() - oldest_timestamp) / 3600 if cache_files else 0
-        
+        with self._lock:
+            conn = self._connect()
+            entries, total_bytes = self._totals(conn)
+            oldest_timestamp = conn.execute("SELECT MIN(created_at) FROM entries").fetchone()[0]
+
+        oldest_age_hours = (time.time() - oldest_timestamp) / 3600 if oldest_timestamp is not None else 0
+
         return {
-            "total_entries": len(cache_files),
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "total_entries": entries,
+            "total_size_mb": round(total_bytes / (1024 * 1024), 2),
             "oldest_entry_age_hours": round(oldest_age_hours, 1)
         }
@@ -1,10 +1,17 @@
 """Workflow engine for agentic multi-step tasks."""
 
+import asyncio
+import heapq
+import re
+import time
 import aiofiles
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# ${step_id} in step args or conditions refers to that step's output
+STEP_REFERENCE = re.compile(r"\$\{([^${}]+)\}")
 
 
 class TaskStatus(Enum):
@@ -39,6 +46,9 @@ class WorkflowStep:
     condition: Optional[str] = None  # Optional condition to run step
     retry_count: int = 0
     timeout_seconds: int = 300
+    # Ids of steps that must finish first ([] for none). None = the previous
+    # step, or only ${step_id} references when the workflow runs in parallel mode
+    depends_on: Optional[List[str]] = None
 
 
 @dataclass
@@ -206,11 +216,28 @@ class CodeExecutionTool(WorkflowTool):
 
 
 class WorkflowEngine:
-    """Executes multi-step workflows with tools."""
+    """Executes multi-step workflows with tools.
+
+    Steps form a dependency graph: a step waits for the steps listed in its
+    ``depends_on`` and for any step it references as ``${step_id}`` in its
+    args or condition. A step without ``depends_on`` waits for the step
+    before it, so plain step lists keep running in order; declaring
+    ``depends_on`` (``[]`` for a root) or running the workflow with
+    ``parallel=True`` lets independent steps run concurrently, up to
+    ``max_parallel`` at a time, so a workflow takes roughly as long as its
+    critical path.
+    """
+
+    DEFAULT_MAX_PARALLEL = 4
+
+    def __init__(self, max_parallel: int = DEFAULT_MAX_PARALLEL):
+        """Initialize workflow engine.
 
-    def __init__(self):
-        """Initialize workflow engine."""
+        Args:
+            max_parallel: Maximum number of steps running at once
+        """
         self.tools: Dict[str, WorkflowTool] = {}
+        self.max_parallel = max(1, max_parallel)
         self._register_builtin_tools()
 
     def _register_builtin_tools(self) -> None:
@@ -226,52 +253,193 @@ class WorkflowEngine:
         """
         self.tools[tool.name] = tool
 
-    async def execute_workflow(self, steps: List[WorkflowStep], context: Optional[WorkflowContext] = None) -> WorkflowContext:
+    @staticmethod
+    def _references(value: Any) -> Set[str]:
+        """Names referenced as ${name} anywhere in a (nested) value."""
+        if isinstance(value, str):
+            return set(STEP_REFERENCE.findall(value))
+        if isinstance(value, dict):
+            return set().union(*(WorkflowEngine._references(v) for v in value.values()))
+        if isinstance(value, (list, tuple)):
+            return set().union(*(WorkflowEngine._references(v) for v in value))
+        return set()
+
+    def build_graph(self, steps: List[WorkflowStep], parallel: bool = False) -> Dict[str, Set[str]]:
+        """Resolve each step's dependencies.
+
+        Explicit ``depends_on`` entries are combined with ${step_id}
+        references. A step without ``depends_on`` also waits for the step
+        before it, since it may rely on that step's side effects. In
+        parallel mode it waits only for the steps it references, unless it
+        has a condition: conditions read workflow variables that any earlier
+        step may set, so it then waits for every step before it.
+
+        Args:
+            steps: Workflow steps
+            parallel: Infer dependencies from references only, instead of
+                keeping list order for steps without ``depends_on``
+
+        Returns:
+            Mapping of step id to the ids it depends on
+
+        Raises:
+            ValueError: On duplicate ids, unknown dependencies or cycles
+        """
+        ids = [step.id for step in steps]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate step ids in workflow")
+
+        graph: Dict[str, Set[str]] = {}
+        for index, step in enumerate(steps):
+            deps = set(step.depends_on or ())
+            unknown = deps.difference(ids)
+            if unknown:
+                raise ValueError(f"Step {step.id} depends on unknown steps: {', '.join(sorted(unknown))}")
+
+            deps |= self._references([step.args, step.condition]).intersection(ids)
+            if step.depends_on is None and index:
+                if not parallel:
+                    deps.add(ids[index - 1])
+                elif step.condition:
+                    deps.update(ids[:index])
+            deps.discard(step.id)
+            graph[step.id] = deps
+
+        # Kahn's algorithm: anything left unvisited is on a cycle
+        pending = {step_id: len(deps) for step_id, deps in graph.items()}
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in graph}
+        for step_id, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(step_id)
+        queue = [step_id for step_id, count in pending.items() if count == 0]
+        visited = 0
+        while queue:
+            step_id = queue.pop()
+            visited += 1
+            for dependent in dependents[step_id]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    queue.append(dependent)
+        if visited != len(graph):
+            cycle = sorted(step_id for step_id, count in pending.items() if count)
+            raise ValueError(f"Workflow has a dependency cycle among: {', '.join(cycle)}")
+
+        return graph
+
+    async def execute_workflow(
+        self,
+        steps: List[WorkflowStep],
+        context: Optional[WorkflowContext] = None,
+        max_parallel: Optional[int] = None,
+        parallel: bool = False,
+    ) -> WorkflowContext:
         """Execute a workflow.
 
+        Ready steps are started in list order. After a failure no new steps
+        are started; steps already running are allowed to finish.
+
         Args:
             steps: List of workflow steps
             context: Optional initial context
+            max_parallel: Override for the engine's parallelism limit
+            parallel: Schedule steps without ``depends_on`` by their
+                references alone (see ``build_graph``)
 
         Returns:
             Final workflow context with results
+
+        Raises:
+            ValueError: If the step dependencies are invalid
         """
+        graph = self.build_graph(steps, parallel=parallel)
+        limit = max(1, max_parallel or self.max_parallel)
+
         if context is None:
             context = WorkflowContext()
         context.log_action("Workflow started")
 
-        for step in steps:
-            # Check condition
-            if step.condition and not self._eval_condition(step.condition, context):
-                context.results[step.id] = TaskResult(
-                    task_id=step.id,
-                    status=TaskStatus.SKIPPED,
-                    output=None,
-                )
-                context.log_action(f"Step {step.id} skipped (condition false)")
+        by_id = {step.id: step for step in steps}
+        order = {step.id: index for index, step in enumerate(steps)}
+        waiting = {step_id: set(deps) for step_id, deps in graph.items()}
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in graph}
+        for step_id, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(step_id)
+
+        ready: List[Tuple[int, str]] = [(order[step_id], step_id) for step_id, deps in waiting.items() if not deps]
+        heapq.heapify(ready)
+        running: Dict["asyncio.Task[TaskResult]", WorkflowStep] = {}
+        failed = False
+
+        def release(step_id: str) -> None:
+            for dependent in dependents[step_id]:
+                waiting[dependent].discard(step_id)
+                if not waiting[dependent]:
+                    heapq.heappush(ready, (order[dependent], dependent))
+
+        while running or (ready and not failed):
+            while ready and not failed and len(running) < limit:
+                step = by_id[heapq.heappop(ready)[1]]
+
+                # Check condition
+                if step.condition and not self._eval_condition(step.condition, context):
+                    context.results[step.id] = TaskResult(
+                        task_id=step.id,
+                        status=TaskStatus.SKIPPED,
+                        output=None,
+                    )
+                    context.log_action(f"Step {step.id} skipped (condition false)")
+                    release(step.id)
+                    continue
+
+                running[asyncio.ensure_future(self._execute_step(step, context))] = step
+
+            if not running:
                 continue
 
-            # Execute step
-            try:
-                result = await self._execute_step(step, context)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: order[running[t].id]):
+                step = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    context.results[step.id] = TaskResult(
+                        task_id=step.id,
+                        status=TaskStatus.FAILED,
+                        output=None,
+                        error=str(e),
+                    )
+                    context.log_action(f"Step {step.id} failed: {str(e)}")
+
+                    # Stop scheduling new steps on failure
+                    failed = True
+                    continue
+
                 context.results[step.id] = result
                 context.log_action(f"Step {step.id} completed: {result.status.value}")
-            except Exception as e:
-                error_result = TaskResult(
-                    task_id=step.id,
-                    status=TaskStatus.FAILED,
-                    output=None,
-                    error=str(e),
-                )
-                context.results[step.id] = error_result
-                context.log_action(f"Step {step.id} failed: {str(e)}")
-
-                # Stop workflow on failure
-                break
+                release(step.id)
 
         context.log_action("Workflow completed")
         return context
 
+    def _resolve_args(self, value: Any, context: WorkflowContext) -> Any:
+        """Substitute ${step_id} references with the outputs of completed steps."""
+        if isinstance(value, str):
+            whole = STEP_REFERENCE.fullmatch(value)
+            if whole and whole.group(1) in context.results:
+                return context.results[whole.group(1)].output
+
+            def substitute(match: "re.Match[str]") -> str:
+                result = context.results.get(match.group(1))
+                return match.group(0) if result is None else str(result.output)
+
+            return STEP_REFERENCE.sub(substitute, value)
+        if isinstance(value, dict):
+            return {key: self._resolve_args(v, context) for key, v in value.items()}
+        if isinstance(value, list):
+            return [self._resolve_args(v, context) for v in value]
+        return value
+
     async def _execute_step(self, step: WorkflowStep, context: WorkflowContext) -> TaskResult:
         """Execute a single step.
 
@@ -286,20 +454,23 @@ class WorkflowEngine:
             raise ValueError(f"Unknown tool: {step.tool}")
 
         tool = self.tools[step.tool]
+        args = self._resolve_args(step.args, context)
 
         # Validate args
-        if not tool.validate_args(step.args):
+        if not tool.validate_args(args):
             raise ValueError(f"Invalid args for {step.tool}")
 
         # Execute with retry
         last_error = None
+        start = time.perf_counter()
         for attempt in range(step.retry_count + 1):
             try:
-                output = await tool.execute(step.args, context)
+                output = await tool.execute(args, context)
                 return TaskResult(
                     task_id=step.id,
                     status=TaskStatus.SUCCESS,
                     output=output,
+                    duration_ms=(time.perf_counter() - start) * 1000,
                 )
             except Exception as e:
                 last_error = e
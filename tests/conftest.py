@@ -1,5 +1,10 @@
+import json
 import os
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from mock_backend import MockBackend
 from lmapp.core.chat import ChatSession
@@ -25,3 +30,44 @@ def mock_backend():
 def chat_session(mock_backend):
     """Provide a chat session with mock backend"""
     return ChatSession(mock_backend, model="mock-model")
+
+
+class _GenerateHandler(BaseHTTPRequestHandler):
+    """Ollama stand-in that takes `latency` seconds per generation."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        self._reply({"models": [{"name": "m"}]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.paths.append(self.path)
+        time.sleep(self.server.latency)
+        self._reply({"response": f"echo: {body['prompt']}", "done": True})
+
+
+@pytest.fixture
+def ollama_server():
+    """Local Ollama stand-in; records request paths, generation latency is adjustable"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GenerateHandler)
+    server.paths = []
+    server.latency = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -59,3 +59,13 @@ class MockBackend(LLMBackend):
     def get_info(self) -> BackendInfo:
         info = super().get_info()
         return info
+
+
+class StaticDetector:
+    """BackendDetector stand-in that reports a fixed list of backends."""
+
+    def __init__(self, backends):
+        self.backends = backends
+
+    def detect_all(self):
+        return list(self.backends)
@@ -1,8 +1,18 @@
 """Tests for backend modules"""
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
 from mock_backend import MockBackend
 from lmapp.backend.detector import BackendDetector
 from lmapp.backend.base import BackendStatus
+from lmapp.backend.llamafile import LlamafileBackend
+from lmapp.backend.ollama import OllamaBackend
+from lmapp.server.streaming import stream_chat
 
 
 class TestMockBackend:
@@ -103,3 +113,185 @@ class TestBackendDetector:
         detector.show_status_table()
         # Just verify it doesn't crash
         assert True
+
+
+TOKENS = ["Hel", "lo", ",", " wor", "ld"]
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    """Emits one token per chunk, pausing between tokens like a real model."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(body)
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(TOKENS):
+            if self.path == "/api/generate":
+                line = json.dumps({"response": token, "done": False}) + "\n"
+            else:
+                line = "data: " + json.dumps({"content": token, "stop": False}) + "\n\n"
+            self._send_chunk(line.encode())
+            time.sleep(self.server.token_delay)
+        if self.path == "/api/generate":
+            self._send_chunk(json.dumps({"response": "", "done": True}).encode() + b"\n")
+        else:
+            self._send_chunk(b"data: " + json.dumps({"content": "", "stop": True}).encode() + b"\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+@pytest.fixture
+def streaming_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+    server.payloads = []
+    server.token_delay = 0.1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _first_token_and_total(chunks):
+    start = time.perf_counter()
+    received = []
+    first = None
+    for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+        received.append(chunk)
+    return received, first, time.perf_counter() - start
+
+
+class TestStreamingBackends:
+    """Test incremental token streaming"""
+
+    def test_default_stream_chat_yields_full_response(self):
+        """Backends without native streaming yield one chunk"""
+        backend = MockBackend()
+        assert list(backend.stream_chat("Hi", model="mock-model")) == ["Mock response. You asked: Hi"]
+
+    def test_ollama_streams_tokens_as_generated(self, streaming_server):
+        """Ollama NDJSON lines are yielded before generation finishes"""
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{streaming_server.server_port}"
+
+        chunks, first, total = _first_token_and_total(backend.stream_chat("Hi", model="m", system_prompt="Be brief"))
+
+        assert chunks == TOKENS
+        assert first < 0.25 < total
+        assert streaming_server.payloads[0]["stream"] is True
+        assert streaming_server.payloads[0]["system"] == "Be brief"
+
+    def test_llamafile_streams_sse_tokens(self, streaming_server):
+        """llamafile SSE data lines are yielded before generation finishes"""
+        backend = LlamafileBackend()
+        backend.api_url = f"http://127.0.0.1:{streaming_server.server_port}"
+
+        chunks, first, total = _first_token_and_total(backend.stream_chat("Hi"))
+
+        assert chunks == TOKENS
+        assert first < 0.25 < total
+
+    def test_server_stream_chat_forwards_tokens(self, streaming_server):
+        """server.streaming.stream_chat passes tokens through unchanged"""
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{streaming_server.server_port}"
+
+        chunks, first, _ = _first_token_and_total(stream_chat(backend, "m", "Hi"))
+
+        assert chunks == TOKENS
+        assert first < 0.25
+
+
+class _OllamaAPIHandler(BaseHTTPRequestHandler):
+    """Minimal non-streaming Ollama API that records each request's client port."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1]))
+        self._reply({"models": [{"name": "m"}]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.path, self.client_address[1]))
+        self._reply({"response": "ok", "done": True})
+
+
+@pytest.fixture
+def ollama_api_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaAPIHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestOllamaSessionAndHealthCache:
+    """Test connection reuse and the cached health probe"""
+
+    def test_health_probe_cached_between_chats(self, ollama_api_server):
+        """Only the first chat pays for GET /api/tags"""
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{ollama_api_server.server_port}"
+
+        for _ in range(5):
+            assert backend.chat("Hi", model="m") == "ok"
+
+        paths = [path for path, _ in ollama_api_server.requests]
+        assert paths.count("/api/tags") == 1
+        assert paths.count("/api/generate") == 5
+        backend.close()
+
+    def test_requests_reuse_one_connection(self, ollama_api_server):
+        """All requests travel over a single keep-alive connection"""
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{ollama_api_server.server_port}"
+
+        backend.list_models()
+        for _ in range(3):
+            backend.chat("Hi", model="m")
+
+        ports = {port for _, port in ollama_api_server.requests}
+        assert len(ports) == 1
+        backend.close()
+
+    def test_connection_error_invalidates_health(self, ollama_api_server):
+        """A refused connection clears the cached health state"""
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{ollama_api_server.server_port}"
+        assert backend.is_running() is True
+
+        ollama_api_server.shutdown()
+        ollama_api_server.server_close()
+        backend.close()
+
+        assert backend.chat("Hi", model="m") == ""
+        assert backend.is_running() is False
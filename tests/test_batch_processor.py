@@ -0,0 +1,247 @@
+"""Tests for concurrent, checkpointed batch execution"""
+
+import csv
+import io
+import json
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from lmapp.batch.batch_processor import BatchInput, BatchProcessor, OutputFormat, _iter_json_array
+
+
+def make_inputs(n):
+    return [BatchInput(f"id{i}", f"text{i}") for i in range(n)]
+
+
+class _SlowFn:
+    """Processor that takes `latency` seconds and tracks concurrency."""
+
+    def __init__(self, latency=0.0, fail=()):
+        self.latency = latency
+        self.fail = set(fail)
+        self.seen = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, content):
+        with self._lock:
+            self.seen.append(content)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.latency)
+            if content in self.fail:
+                raise RuntimeError(f"boom: {content}")
+            return content.upper(), None
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class TestConcurrentBatch:
+    """Test bounded-concurrency execution"""
+
+    def test_results_keep_input_order(self, tmp_path):
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", make_inputs(20))
+        fn = _SlowFn(latency=0.01)
+
+        job = processor.process_batch("job", fn, max_workers=4)
+
+        assert [r.input_id for r in job.results] == [f"id{i}" for i in range(20)]
+        assert [r.output for r in job.results] == [f"TEXT{i}" for i in range(20)]
+        assert job.total_processed == 20
+        assert 1 < fn.max_running <= 4
+
+    def test_concurrency_cuts_wall_time(self, tmp_path):
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", make_inputs(16))
+
+        start = time.perf_counter()
+        processor.process_batch("job", _SlowFn(latency=0.05), max_workers=8)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 16 * 0.05 / 2
+
+    def test_progress_and_errors(self, tmp_path):
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", make_inputs(5))
+        progress = []
+
+        job = processor.process_batch("job", _SlowFn(fail={"text2"}), on_progress=lambda done, total: progress.append((done, total)))
+
+        assert progress == [(i, 5) for i in range(1, 6)]
+        assert job.total_processed == 4
+        assert job.total_failed == 1
+        assert job.results[2].status == "error"
+        assert "boom" in job.results[2].error
+
+
+class TestCheckpointResume:
+    """Test the checkpoint journal and resume"""
+
+    def test_each_result_is_checkpointed(self, tmp_path):
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", make_inputs(3))
+        processor.process_batch("job", _SlowFn(fail={"text1"}))
+
+        checkpoint = processor.load_checkpoint("job")
+        assert set(checkpoint) == {"id0", "id1", "id2"}
+        assert checkpoint["id1"].status == "error"
+
+    def test_resume_after_crash_skips_completed(self, tmp_path):
+        inputs = make_inputs(10)
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", inputs)
+
+        def crash_at_six(done, total):
+            if done == 6:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            processor.process_batch("job", _SlowFn(), on_progress=crash_at_six, max_workers=1)
+
+        restarted = BatchProcessor(tmp_path)
+        restarted.create_batch_job("job", inputs)
+        fn = _SlowFn()
+        job = restarted.process_batch("job", fn, resume=True, max_workers=1)
+
+        assert fn.seen == [f"text{i}" for i in range(6, 10)]
+        assert job.total_processed == 10
+        assert [r.input_id for r in job.results] == [f"id{i}" for i in range(10)]
+
+    def test_resume_retries_failures(self, tmp_path):
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", make_inputs(3))
+        processor.process_batch("job", _SlowFn(fail={"text1"}))
+
+        fn = _SlowFn()
+        job = processor.process_batch("job", fn, resume=True)
+
+        assert fn.seen == ["text1"]
+        assert job.total_failed == 0
+
+    def test_fresh_run_truncates_checkpoint(self, tmp_path):
+        processor = BatchProcessor(tmp_path)
+        processor.create_batch_job("job", make_inputs(3))
+        processor.process_batch("job", _SlowFn())
+
+        fn = _SlowFn()
+        processor.process_batch("job", fn)
+
+        assert len(fn.seen) == 3
+        assert len((tmp_path / "job.checkpoint.jsonl").read_text().splitlines()) == 3
+
+
+class TestStreamingInput:
+    """Test lazy input readers"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+    def test_json_array_across_chunk_boundaries(self, chunk_size):
+        data = [{"id": "a", "content": "x, ]"}, 12345, "s", [1, [2]], {"content": "\u00e9"}, -0.5e3, None, True]
+        text = "  \n" + json.dumps(data, indent=1)
+        assert list(_iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == data
+
+    def test_json_array_edge_cases(self):
+        assert list(_iter_json_array(io.StringIO("[]"))) == []
+        assert list(_iter_json_array(io.StringIO('{"not": "a list"}'))) == []
+        with pytest.raises(json.JSONDecodeError):
+            list(_iter_json_array(io.StringIO("[1, 2")))
+
+    def test_iter_matches_load(self, tmp_path):
+        processor = BatchProcessor(tmp_path / "batch")
+        files = {
+            "in.json": json.dumps([{"id": "a", "content": "one"}, "two"]),
+            "in.jsonl": '{"id": "a", "content": "one"}\n\n{"content": "two"}\n',
+            "in.txt": "one\n\ntwo\n",
+        }
+        for name, text in files.items():
+            path = tmp_path / name
+            path.write_text(text)
+            streamed = list(processor.iter_inputs_from_file(path))
+            assert [i.content for i in streamed] == ["one", "two"]
+            assert [i.to_dict() for i in streamed] == [i.to_dict() for i in processor.load_inputs_from_file(path)]
+
+    def test_malformed_file_keeps_inputs_read_so_far(self, tmp_path):
+        path = tmp_path / "in.jsonl"
+        path.write_text('{"content": "ok"}\nnot json\n')
+        assert [i.content for i in BatchProcessor(tmp_path / "batch").load_inputs_from_file(path)] == ["ok"]
+
+
+class TestProcessFile:
+    """Test file-to-file streaming jobs"""
+
+    @pytest.fixture
+    def input_file(self, tmp_path):
+        path = tmp_path / "in.jsonl"
+        with open(path, "w") as f:
+            for i in range(50):
+                f.write(json.dumps({"id": f"id{i}", "content": f"text{i}"}) + "\n")
+        return path
+
+    def test_jsonl_output(self, tmp_path, input_file):
+        processor = BatchProcessor(tmp_path / "batch")
+        progress = []
+        out = tmp_path / "out.jsonl"
+
+        job = processor.process_file("job", input_file, _SlowFn(fail={"text3"}), out, on_progress=lambda d, t: progress.append((d, t)))
+
+        rows = [json.loads(line) for line in out.read_text().splitlines()]
+        assert sorted(r["input_id"] for r in rows) == sorted(f"id{i}" for i in range(50))
+        assert progress[-1] == (50, 50) and len(progress) == 50
+        assert job.results == [] and job.input_count == 50
+        assert job.total_processed == 49 and job.total_failed == 1
+        assert processor.get_job_stats("job")["total_inputs"] == 50
+
+    def test_csv_output(self, tmp_path, input_file):
+        out = tmp_path / "out.csv"
+        BatchProcessor(tmp_path / "batch").process_file("job", input_file, _SlowFn(), out, format=OutputFormat.CSV)
+
+        with open(out, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 50
+        assert {r["output"] for r in rows} == {f"TEXT{i}" for i in range(50)}
+
+    def test_non_streamable_format_rejected(self, tmp_path, input_file):
+        with pytest.raises(ValueError):
+            BatchProcessor(tmp_path / "batch").process_file("job", input_file, _SlowFn(), tmp_path / "out.txt", format=OutputFormat.TEXT)
+
+    def test_resume_rebuilds_output(self, tmp_path, input_file):
+        out = tmp_path / "out.jsonl"
+        processor = BatchProcessor(tmp_path / "batch")
+
+        def crash(done, total):
+            if done == 20:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            processor.process_file("job", input_file, _SlowFn(), out, on_progress=crash, max_workers=1)
+
+        fn = _SlowFn()
+        job = processor.process_file("job", input_file, fn, out, resume=True)
+
+        assert len(fn.seen) == 30
+        ids = [json.loads(line)["input_id"] for line in out.read_text().splitlines()]
+        assert sorted(ids) == sorted(f"id{i}" for i in range(50))
+        assert job.total_processed == 50
+
+    def test_memory_is_independent_of_input_size(self, tmp_path):
+        def peak(n):
+            path = tmp_path / f"in{n}.json"
+            with open(path, "w") as f:
+                f.write("[")
+                f.write(",".join(json.dumps({"content": "x" * 1000}) for _ in range(n)))
+                f.write("]")
+            processor = BatchProcessor(tmp_path / "batch")
+            tracemalloc.start()
+            processor.process_file(f"job{n}", path, lambda c: (c, None), tmp_path / f"out{n}.jsonl", max_workers=2)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small, large = peak(300), peak(1500)
+        assert large < small * 2
@@ -0,0 +1,141 @@
+"""Tests for the bounded LRU/LFU cache primitive"""
+
+import random
+import time
+
+import pytest
+
+from lmapp.utils.bounded_cache import BoundedCache, EvictionPolicy
+
+
+class _ReferenceCache:
+    """Straightforward O(n) model of the eviction rules."""
+
+    def __init__(self, max_entries, max_bytes, lfu):
+        self.max_entries, self.max_bytes, self.lfu = max_entries, max_bytes, lfu
+        self.entries = {}  # key -> [value, size, frequency, last_use]
+        self.clock = 0
+
+    def _tick(self):
+        self.clock += 1
+        return self.clock
+
+    def victim(self):
+        rank = (lambda k: (self.entries[k][2], self.entries[k][3])) if self.lfu else (lambda k: self.entries[k][3])
+        return min(self.entries, key=rank)
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+        entry = self.entries[key]
+        entry[2] += 1
+        entry[3] = self._tick()
+        return entry[0]
+
+    def set(self, key, value, size):
+        self.entries.pop(key, None)
+        if size > self.max_bytes:
+            return []
+        evicted = []
+        while self.entries and (len(self.entries) + 1 > self.max_entries or sum(e[1] for e in self.entries.values()) + size > self.max_bytes):
+            victim = self.victim()
+            evicted.append((victim, self.entries.pop(victim)[0]))
+        self.entries[key] = [value, size, 0, self._tick()]
+        return evicted
+
+
+class TestBoundedCache:
+    """Test bounds, eviction order and size accounting"""
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = BoundedCache(max_entries=3)
+        for key in "abc":
+            cache.set(key, key.upper())
+        cache.get("a")
+
+        assert cache.set("d", "D") == [("b", "B")]
+        assert list(cache) == ["a", "c", "d"]
+        assert cache.peek("c") == "C" and cache.popitem() == ("c", "C")
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = BoundedCache(max_entries=3, policy="lfu")
+        for key in "abc":
+            cache.set(key, key)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.set("d", "d") == [("c", "c")]
+        assert cache.set("e", "e") == [("d", "d")]
+        assert cache.frequency("a") == 2 and cache.policy is EvictionPolicy.LFU
+
+    def test_byte_bound_and_running_total(self):
+        cache = BoundedCache(max_bytes=100)
+        cache.set("a", 1, size=40)
+        cache.set("b", 2, size=40)
+        cache.set("a", 3, size=10)
+        assert cache.total_bytes == 50
+
+        assert cache.set("c", 4, size=70) == [("b", 2)]
+        assert cache.total_bytes == 80
+        assert cache.set("huge", 5, size=101) == [] and "huge" not in cache
+
+        assert cache.pop("c") == 4 and cache.pop("c", "gone") == "gone"
+        assert cache.total_bytes == 10
+        cache.clear()
+        assert len(cache) == 0 and cache.total_bytes == 0
+        with pytest.raises(KeyError):
+            cache.popitem()
+
+    @pytest.mark.parametrize("policy", ["lru", "lfu"])
+    def test_matches_reference_model(self, policy):
+        rng = random.Random(policy)
+        cache = BoundedCache(max_entries=20, max_bytes=400, policy=policy)
+        model = _ReferenceCache(20, 400, policy == "lfu")
+
+        for step in range(5000):
+            key = rng.randrange(40)
+            op = rng.random()
+            if op < 0.5:
+                assert cache.get(key) == model.get(key), step
+            elif op < 0.9:
+                size = rng.randrange(60)
+                assert cache.set(key, step, size) == model.set(key, step, size), step
+            else:
+                removed = model.entries.pop(key, [None])[0]
+                assert cache.pop(key) == removed, step
+            assert cache.total_bytes == sum(e[1] for e in model.entries.values())
+            assert sorted(cache.items()) == sorted((k, e[0]) for k, e in model.entries.items())
+
+    @pytest.mark.parametrize("policy", ["lru", "lfu"])
+    def test_operations_stay_flat_as_cache_grows(self, policy):
+        def per_op(n):
+            cache = BoundedCache(max_entries=n, max_bytes=n * 10, policy=policy)
+            for i in range(n):
+                cache.set(i, i, size=10)
+            start = time.perf_counter()
+            for i in range(n, n + 20000):
+                cache.get(i - n + 1)
+                cache.set(i, i, size=10)
+            return (time.perf_counter() - start) / 20000
+
+        small, large = min(per_op(1000) for _ in range(3)), min(per_op(100_000) for _ in range(3))
+        assert large < small * 5
+
+    def test_mapping_protocol(self):
+        cache = BoundedCache(max_bytes=10, size_of=len)
+        assert cache == {}
+        cache["a"] = "xxxx"
+        cache["b"] = "yyyy"
+        assert cache == {"a": "xxxx", "b": "yyyy"} and cache.total_bytes == 8
+
+        assert cache["a"] == "xxxx" and cache.frequency("a") == 0
+        cache["c"] = "zzzz"
+        assert "a" not in cache and cache.total_bytes == 8
+
+        del cache["b"]
+        assert cache == {"c": "zzzz"}
+        with pytest.raises(KeyError):
+            cache["b"]
+        with pytest.raises(KeyError):
+            del cache["b"]
@@ -127,6 +127,87 @@ class TestResponseCache:
         assert len(variants) == 2
         assert variants[0]["model"] in ["model-a", "model-b"]
 
+    def test_cache_hits_are_buffered_until_flush(self, cache):
+        """Hits don't write to the database until flushed"""
+        cache.set("Query", "Response", "mistral", "ollama", 0.7)
+        for _ in range(3):
+            assert cache.get("Query", "mistral", "ollama", 0.7) == "Response"
+
+        raw = cache._connect().execute("SELECT access_count FROM cache").fetchone()[0]
+        assert raw == 1
+
+        cache.flush()
+        raw = cache._connect().execute("SELECT access_count FROM cache").fetchone()[0]
+        assert raw == 4
+
+    def test_cache_expired_entry_is_miss(self, tmp_path):
+        """Expired entries are reported as misses"""
+        cache = ResponseCache(cache_dir=tmp_path, ttl_hours=0)
+        cache.set("Query", "Response", "mistral", "ollama", 0.7)
+
+        assert cache.get("Query", "mistral", "ollama", 0.7) is None
+        assert cache.clear(expired_only=True) == 1
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        """Overflowing max_entries evicts oldest-access entries down to the low-water mark"""
+        cache = ResponseCache(cache_dir=tmp_path, ttl_hours=1, max_entries=10)
+        for i in range(10):
+            cache.set(f"Query {i}", f"Response {i}", "mistral", "ollama", 0.7)
+        cache.get("Query 0", "mistral", "ollama", 0.7)
+        cache.set("Query 5", "Replaced", "mistral", "ollama", 0.7)
+
+        statements = []
+        cache._connect().set_trace_callback(statements.append)
+        cache.set("Query 10", "Response 10", "mistral", "ollama", 0.7)
+
+        assert not any("COUNT(" in sql for sql in statements)
+        assert cache.get_stats()["total_entries"] == cache._row_count == 9
+        assert cache.get("Query 0", "mistral", "ollama", 0.7) == "Response 0"
+        assert cache.get("Query 1", "mistral", "ollama", 0.7) is None
+        assert cache.get("Query 2", "mistral", "ollama", 0.7) is None
+        assert cache.get("Query 3", "mistral", "ollama", 0.7) == "Response 3"
+
+    def test_cache_close_from_another_thread(self, tmp_path):
+        """close() only touches the calling thread's connection"""
+        import threading
+
+        cache = ResponseCache(cache_dir=tmp_path)
+        cache.set("Query", "Response", "mistral", "ollama", 0.7)
+        conn = cache._connect()
+
+        def worker():
+            cache.get("Query", "mistral", "ollama", 0.7)
+            cache.close()
+
+        closer = threading.Thread(target=worker)
+        closer.start()
+        closer.join()
+
+        assert cache._connect() is conn
+        assert cache.get("Query", "mistral", "ollama", 0.7) == "Response"
+        cache.close()
+        assert cache.get("Query", "mistral", "ollama", 0.7) == "Response"
+
+    def test_cache_concurrent_access(self, cache):
+        """Threads share the cache through their own connections"""
+        import threading
+
+        def worker(n):
+            for i in range(20):
+                cache.set(f"Query {n}-{i}", "Response", "mistral", "ollama", 0.7)
+                assert cache.get(f"Query {n}-{i}", "mistral", "ollama", 0.7) == "Response"
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 80
+        assert stats["total_accesses"] == 160
+        cache.close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
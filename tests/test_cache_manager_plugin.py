@@ -113,6 +113,19 @@ class TestSimpleLRUCache:
         # One of the entries should be gone
         assert len(cache.entries) <= 1
 
+    def test_eviction_follows_recency_and_tracks_size(self):
+        """Test that reads protect entries from eviction and sizes are tracked incrementally"""
+        cache = SimpleLRUCache(max_size_mb=300 / (1024 * 1024))
+
+        for key in ("key1", "key2", "key3"):
+            cache.set(key, "x" * 100)
+        cache.get("key1")
+        cache.set("key4", "x" * 100)
+
+        assert set(cache.entries) == {"key1", "key3", "key4"}
+        assert cache.entries.total_bytes == 300
+        assert cache.set("huge", "x" * 301) is False
+
     def test_clear_expired_entries(self):
         """Test clearing expired entries"""
         cache = SimpleLRUCache()
@@ -3,6 +3,7 @@
 import pytest
 from datetime import datetime
 from lmapp.core.chat import ChatSession, ChatMessage
+from lmapp.core.context import ContextBuilder, estimate_tokens
 from mock_backend import MockBackend
 
 
@@ -127,3 +128,93 @@ class TestChatSession:
         stats = chat_session.get_stats()
         assert stats["user_messages"] == 3
         assert stats["assistant_messages"] == 3
+
+
+def _legacy_prompt(system_prompt, history):
+    """Prompt format produced before the context builder existed"""
+    full_prompt = f"System: {system_prompt}\n\n" if system_prompt else ""
+    for msg in history:
+        role = "User" if msg.role == "user" else "Assistant"
+        full_prompt += f"{role}: {msg.content}\n\n"
+    return full_prompt.strip()
+
+
+class TestContextBuilder:
+    """Test incremental, token-budgeted prompt assembly"""
+
+    def test_matches_full_rebuild_within_budget(self):
+        builder = ContextBuilder(max_tokens=None)
+        history = []
+        for i in range(5):
+            history.append(ChatMessage("user", f"Question {i}"))
+            history.append(ChatMessage("assistant", f"Answer {i}"))
+            assert builder.build("Be brief", history) == _legacy_prompt("Be brief", history)
+
+    def test_each_message_is_formatted_once(self, monkeypatch):
+        builder = ContextBuilder(max_tokens=None)
+        calls = []
+        original = ContextBuilder._format
+        monkeypatch.setattr(ContextBuilder, "_format", staticmethod(lambda m: calls.append(m) or original(m)))
+
+        history = []
+        for i in range(50):
+            history.append(ChatMessage("user", f"Message {i}"))
+            builder.build("", history)
+
+        assert len(calls) == 50
+
+    def test_budget_evicts_oldest_turns(self):
+        builder = ContextBuilder(max_tokens=200)
+        history = []
+        for i in range(200):
+            history.append(ChatMessage("user" if i % 2 == 0 else "assistant", f"Turn {i} " + "x" * 80))
+            prompt = builder.build("System text", history)
+            assert estimate_tokens(prompt) <= 200
+
+        assert prompt.startswith("System: System text")
+        assert prompt.endswith(history[-1].content)
+        assert "Turn 0 " not in prompt
+        assert builder.get_stats()["evicted_messages"] > 0
+
+    def test_newest_message_kept_even_if_over_budget(self):
+        builder = ContextBuilder(max_tokens=10)
+        history = [ChatMessage("user", "short"), ChatMessage("user", "y" * 400)]
+        assert builder.build("", history) == f"User: {'y' * 400}"
+
+    def test_summarizer_folds_evicted_turns(self):
+        seen = []
+
+        def summarizer(messages, previous):
+            seen.extend(messages)
+            return f"{len(seen)} earlier messages"
+
+        builder = ContextBuilder(max_tokens=100, summarizer=summarizer)
+        history = [ChatMessage("user", f"Turn {i} " + "z" * 60) for i in range(10)]
+        prompt = builder.build("", history)
+
+        assert prompt.startswith(f"Summary of earlier conversation: {len(seen)} earlier messages")
+        assert seen[0] is history[0]
+        assert builder.total_tokens <= 100
+
+    def test_history_rewrite_resyncs(self):
+        builder = ContextBuilder(max_tokens=None)
+        history = [ChatMessage("user", "a"), ChatMessage("assistant", "b")]
+        builder.build("", history)
+
+        history.pop()
+        history.append(ChatMessage("assistant", "c"))
+        assert builder.build("", history) == _legacy_prompt("", history)
+
+    def test_session_prompt_stays_bounded(self, mock_backend):
+        session = ChatSession(mock_backend, model="mock-model", context_tokens=300)
+        for i in range(100):
+            session.send_prompt(f"Question number {i} " + "q" * 100)
+
+        assert session.get_stats()["context_tokens"] <= 300
+        assert estimate_tokens(session._build_prompt()) <= 300
+
+    def test_clear_history_resets_context(self, chat_session):
+        chat_session.send_prompt("First")
+        chat_session.clear_history()
+        chat_session.history.append(ChatMessage("user", "Fresh"))
+        assert chat_session._build_prompt() == "User: Fresh"
@@ -0,0 +1,127 @@
+"""
+Import-time benchmark for the lmapp CLI
+
+Measures a cold `import lmapp.cli` in a fresh interpreter with
+`python -X importtime` and fails if command implementations or heavy
+dependencies are imported eagerly, or if a cold start exceeds the budget.
+The default budget is about twice the measured import time (~225 ms), to
+leave room for slower CI machines; set LMAPP_IMPORT_BUDGET_MS to override it.
+
+Run directly to print the slowest modules:
+    python tests/test_cli_import_time.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Cold-start budget for `import lmapp.cli`, in milliseconds (override for slow machines)
+IMPORT_BUDGET_MS = float(os.environ.get("LMAPP_IMPORT_BUDGET_MS", "500"))
+
+# Modules that belong to individual commands and must not load at startup
+LAZY_MODULES = [
+    "lmapp.ui.menu",
+    "lmapp.ui.chat_ui",
+    "lmapp.core.chat",
+    "lmapp.backend.detector",
+    "lmapp.backend.installer",
+    "lmapp.utils.system_check",
+    "lmapp.core.auth",
+    "lmapp.core.sync_manager",
+    "lmapp.cli_plugins",
+    "lmapp.backend",
+    "lmapp.rag",
+    "inquirer",
+    "httpx",
+    "numpy",
+    "requests",
+    "rich.progress",
+]
+
+
+def _run(code, *flags):
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run([sys.executable, *flags, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def measure_import(module="lmapp.cli"):
+    """Per-module (self_us, cumulative_us) for a cold import of ``module``."""
+    costs = {}
+    for line in _run(f"import {module}", "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header row
+        costs[name.strip()] = (int(self_us), int(cumulative_us))
+    return costs
+
+
+def report(costs, top=15):
+    rows = sorted(costs.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return "\n".join(f"{self_us / 1000:8.1f} ms  {name}" for name, (self_us, _) in rows)
+
+
+class TestCLIImportTime:
+    """Startup cost of the CLI entry point"""
+
+    def test_cold_import_within_budget(self):
+        # Best of three, to keep scheduler noise out of the measurement
+        runs = [measure_import() for _ in range(3)]
+        costs = min(runs, key=lambda c: c["lmapp.cli"][1])
+        total_ms = costs["lmapp.cli"][1] / 1000
+
+        print(f"\nimport lmapp.cli: {total_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)\n{report(costs)}")
+        assert total_ms < IMPORT_BUDGET_MS, f"import lmapp.cli took {total_ms:.1f} ms\n{report(costs)}"
+
+    def test_command_modules_are_not_imported_eagerly(self):
+        costs = measure_import()
+        eager = [name for name in LAZY_MODULES if name in costs]
+        assert not eager, f"Imported at startup: {eager}"
+
+    def test_help_does_not_load_commands(self):
+        code = "\n".join(
+            [
+                "import sys",
+                "from lmapp.cli import main",
+                "try:",
+                "    main(['--help'])",
+                "except SystemExit:",
+                "    pass",
+                "print(','.join(sorted(sys.modules)))",
+            ]
+        )
+        result = _run(code)
+        loaded = set(result.stdout.strip().splitlines()[-1].split(","))
+
+        assert "plugins" in result.stdout
+        assert not loaded.intersection(LAZY_MODULES)
+
+
+class TestLazyCommands:
+    """Lazily loaded commands still behave like regular ones"""
+
+    def test_lazy_group_is_loaded_on_invocation(self):
+        from lmapp.cli import main
+
+        result = CliRunner().invoke(main, ["plugins", "--help"])
+
+        assert result.exit_code == 0
+        assert "search" in result.output
+        assert "plugins" in main.commands
+
+    def test_lazy_names_resolve_as_module_attributes(self):
+        import lmapp.cli as cli
+        from lmapp.backend.detector import BackendDetector
+
+        assert cli.BackendDetector is BackendDetector
+
+
+if __name__ == "__main__":
+    costs = measure_import()
+    print(f"import lmapp.cli: {costs['lmapp.cli'][1] / 1000:.1f} ms\n{report(costs, top=30)}")
@@ -9,15 +9,35 @@ Comprehensive test suite for code analysis including:
 - CLI commands
 """
 
+import re
+import time
+
 import pytest
 
 from lmapp.plugins.example_code_analyzer import (
     CodeAnalyzerPlugin,
     CodeIssue,
     AnalysisResult,
+    PatternRule,
+    RuleMatcher,
 )
 
 
+def naive_scan(rules, code):
+    """Reference: search every pattern in every line."""
+    hits = []
+    for rule in rules:
+        for line_no, line in enumerate(code.split("\n"), 1):
+            for pattern in rule.patterns:
+                if re.search(pattern, line, re.IGNORECASE):
+                    hits.append((rule.rule_id, line_no, len(line) - len(line.lstrip())))
+    return hits
+
+
+def make_rule(rule_id, *patterns):
+    return PatternRule(rule_id, "low", "style", "message", "suggestion", patterns)
+
+
 class TestCodeIssue:
     """Test CodeIssue data structure."""
 
@@ -453,5 +473,82 @@ for item in items:
         assert plugin2.analysis_stats["analyses_run"] == 1
 
 
+class TestRuleMatcher:
+    """Test the single-pass compiled rule matcher."""
+
+    SAMPLE = """import json
+def loadData(path):
+    f = open(path)
+    data = json.parse(f.read())
+    try:
+        store.delete(keys)
+    except KeyError:
+        pass
+    if (a == b == c):
+        name.strip()
+    result = [] ; for x in y
+    str += "x"
+\treturn None.value()
+"""
+
+    def detect(self, plugin, code):
+        return [(i.pattern, i.line, i.column) for i in plugin._detect_issues(code, plugin.language)]
+
+    @pytest.mark.parametrize("strict", [False, True])
+    def test_matches_line_by_line_search(self, strict):
+        """Test results equal searching each pattern in each line, in the same order."""
+        plugin = CodeAnalyzerPlugin()
+        plugin.initialize({"strict": strict})
+        rules = plugin._build_rules("python")
+
+        code = self.SAMPLE * 3 + "open(x)"
+        assert self.detect(plugin, code) == naive_scan(rules, code)
+
+    def test_lookahead_does_not_see_next_line(self):
+        """Test a negative lookahead is evaluated against its own line only."""
+        plugin = CodeAnalyzerPlugin()
+        issues = self.detect(plugin, "store.delete(keys)\nexcept KeyError:")
+
+        assert ("uncaught_exception", 1, 0) in issues
+
+    def test_anchors_and_backreferences(self):
+        """Test patterns the scanner cannot relax are still matched exactly."""
+        rules = [
+            make_rule("anchored", r"^\s*TODO", r"pass$"),
+            make_rule("repeated", r"(\w+) \1"),
+            make_rule("lookbehind", r"(?<!#)print\("),
+        ]
+        code = "  todo: x\nx = pass\npass x\nthe the\n# print(1)\nprint(2)"
+
+        hits = [(rule.rule_id, line, column) for rule, line, column in RuleMatcher(rules).scan(code)]
+        assert sorted(hits) == sorted(naive_scan(rules, code))
+        assert RuleMatcher(rules[:1])._scanner is not None
+        assert RuleMatcher(rules)._scanner is None
+
+    def test_matcher_is_shared_per_language(self):
+        """Test rules are compiled once per language and mode."""
+        first, second = CodeAnalyzerPlugin(), CodeAnalyzerPlugin()
+
+        assert first._get_matcher("python") is second._get_matcher("python")
+        second.initialize({"strict": True})
+        assert first._get_matcher("python") is not second._get_matcher("python")
+
+    def test_large_file_scales_linearly(self):
+        """Test analysis time grows linearly with file size."""
+        plugin = CodeAnalyzerPlugin()
+        plugin.initialize({"strict": True})
+
+        def elapsed(repeats):
+            code = self.SAMPLE * repeats
+            start = time.perf_counter()
+            plugin._detect_issues(code, "python")
+            return time.perf_counter() - start
+
+        elapsed(10)  # warm up
+        small, large = elapsed(100), elapsed(1000)  # ~1.3k and ~13k lines
+        assert large < 1.0
+        assert large < small * 30
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
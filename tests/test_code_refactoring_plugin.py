@@ -8,8 +8,11 @@ Tests the plugin's ability to:
 - Find duplicate patterns
 """
 
+import ast
+
 import pytest
 
+from lmapp.plugins import example_code_refactoring
 from lmapp.plugins.example_code_refactoring import (
     CodeRefactoringPlugin,
     RefactoringIssue,
@@ -323,3 +326,97 @@ x = calculate()
         assert issue.issue_type == "test"
         assert issue.severity == "low"
         assert issue.line_number == 1
+
+
+class TestSharedAnalysis:
+    """Tests for the shared per-source analysis context."""
+
+    ACTIONS = ["analyze", "suggest_names", "complexity", "duplicates"]
+
+    CODE = """
+import os
+
+def outer(a):
+    total = 0
+    def inner(b):
+        unused = b
+        if b and a:
+            return b
+    for item in a:
+        total += item
+    return total
+
+class badName:
+    pass
+"""
+
+    @pytest.fixture
+    def parses(self, monkeypatch):
+        """Count calls to ast.parse made by the plugin."""
+        calls = []
+        original = ast.parse
+        monkeypatch.setattr(example_code_refactoring.ast, "parse", lambda code, *a, **k: calls.append(code) or original(code, *a, **k))
+        return calls
+
+    def test_all_actions_parse_once(self, parses):
+        """Test running every action on one source parses it once."""
+        plugin = CodeRefactoringPlugin()
+        results = [plugin.execute(action, code=self.CODE) for action in self.ACTIONS]
+
+        assert all(r["success"] for r in results)
+        assert len(parses) == 1
+
+        plugin.execute("analyze", code=self.CODE + "\n")
+        assert len(parses) == 2
+
+    def test_syntax_error_is_cached(self, parses):
+        """Test invalid code is not re-parsed by each action."""
+        plugin = CodeRefactoringPlugin()
+
+        assert "Syntax error" in plugin.execute("analyze", code="def broken(:")["error"]
+        assert plugin.execute("complexity", code="def broken(:")["error"] == "Invalid Python code"
+        assert len(parses) == 1
+
+    def test_context_cache_is_bounded(self):
+        """Test old analysis contexts are evicted."""
+        plugin = CodeRefactoringPlugin()
+        for i in range(CodeRefactoringPlugin.CONTEXT_CACHE_SIZE + 5):
+            plugin.execute("complexity", code=f"x = {i}")
+
+        assert len(plugin._contexts) == CodeRefactoringPlugin.CONTEXT_CACHE_SIZE
+
+    def test_nested_functions_match_per_function_walk(self):
+        """Test facts collected in one pass match walking each function."""
+        plugin = CodeRefactoringPlugin()
+
+        complexity = plugin.execute("complexity", code=self.CODE)["functions"]
+        assert complexity == {"outer": 4, "inner": 3}
+
+        issues = plugin.execute("analyze", code=self.CODE)["issues"]
+        assert {(i["type"], i["line"]) for i in issues} >= {("unused_variable", 4), ("unused_variable", 6), ("unused_import", 2), ("naming", 14)}
+
+    def test_duplicate_blocks(self):
+        """Test repeated multi-line blocks are found and merged."""
+        block = "a = load()\n# comment\nb = a + 1\nsave(b)\nlog(b)\n"
+        code = block + "other()\n\n" + block
+
+        blocks = CodeRefactoringPlugin().execute("duplicates", code=code)["duplicate_blocks"]
+
+        assert blocks == [
+            {
+                "line": 8,
+                "previous_line": 1,
+                "end_line": 12,
+                "lines": 4,
+                "code": "a = load()\nb = a + 1\nsave(b)\nlog(b)",
+            }
+        ]
+
+    def test_repeated_line_run_is_one_block(self):
+        """Test a run of identical lines is reported as one block."""
+        code = "\n".join(["step()"] * 8)
+
+        result = CodeRefactoringPlugin().execute("duplicates", code=code, window=2)
+
+        assert result["duplicate_count"] == 7
+        assert [(b["line"], b["previous_line"], b["lines"]) for b in result["duplicate_blocks"]] == [(3, 1, 6)]
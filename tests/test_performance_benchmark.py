@@ -202,6 +202,20 @@ class PerformanceBenchmark:
 
         print(f"✅ Stress test (1000 lines): {elapsed*1000:.1f}ms")
 
+    def benchmark_stress_very_large_file(self):
+        """Stress test: Very large module (10,000 lines)"""
+        code = self.generate_python_code(10000)
+
+        start = time.perf_counter()
+        result = self.service.get_quick_fixes(code, "python")
+        elapsed = time.perf_counter() - start
+
+        # Unused-variable detection must stay linear in file length
+        assert elapsed < 0.5, f"Should analyze 10,000 lines in <500ms, took {elapsed*1000:.1f}ms"
+        assert len(result) == 9999
+
+        print(f"✅ Stress test (10,000 lines): {elapsed*1000:.1f}ms")
+
     def benchmark_stress_complex_code(self):
         """Stress test: Complex code patterns"""
         code = """
@@ -277,6 +291,7 @@ def run_benchmarks():
         ("Language Comparison", bench.benchmark_language_comparison),
         # Stress tests
         ("Stress: Large file (1000 lines)", bench.benchmark_stress_large_file),
+        ("Stress: Very large file (10,000 lines)", bench.benchmark_stress_very_large_file),
         ("Stress: Complex patterns", bench.benchmark_stress_complex_code),
         ("Stress: Suggestions", bench.benchmark_stress_suggestions),
         # Stability
@@ -318,6 +333,11 @@ def run_benchmarks():
     return failed == 0
 
 
+def test_stress_very_large_file():
+    """Guard against quadratic quick-fix analysis on large modules"""
+    PerformanceBenchmark().benchmark_stress_very_large_file()
+
+
 if __name__ == "__main__":
     success = run_benchmarks()
     sys.exit(0 if success else 1)
@@ -217,6 +217,26 @@ class TestAsyncCache:
 
         run_async_test(run_test())
 
+    def test_memory_cache_evicts_least_used(self):
+        """Test memory cache keeps frequently read entries and running totals."""
+
+        async def run_test():
+            backend = MemoryCache(max_size=3)
+            for key in ("a", "b", "c"):
+                await backend.set(key, key * 10, ttl_seconds=60)
+            await backend.get("a")
+            await backend.get("c")
+            await backend.set("d", "d" * 10)
+
+            assert await backend.get("b") is None
+            stats = await backend.get_stats()
+            assert stats["entries"] == 3
+            assert stats["total_hits"] == 2
+            assert stats["size_bytes"] == 30
+            assert stats["avg_ttl"] == 40
+
+        run_async_test(run_test())
+
     def test_cache_deletion(self, memory_cache):
         """Test cache deletion."""
 
@@ -0,0 +1,210 @@
+"""Tests for manifest-cached lazy plugin loading"""
+
+import json
+import sys
+import uuid
+
+import pytest
+
+from lmapp.plugins.plugin_manager import PluginManager, PluginStatus
+
+PLUGIN_SOURCE = """
+from lmapp.plugins.plugin_manager import BasePlugin, PluginMetadata
+
+
+class Plugin(BasePlugin):
+    @property
+    def metadata(self):
+        return PluginMetadata(name="{name}", version="1.0.0", description="", author="test")
+
+    def initialize(self, config=None):
+        self.config = config
+
+    def execute(self, *args, **kwargs):
+        return "executed {name}"
+
+    def get_commands(self):
+        return {{"{name}-greet": lambda who: "{name} greets " + who}}
+
+    def get_hooks(self):
+        return {{"on_start": lambda: "{name} started"}}
+"""
+
+
+@pytest.fixture
+def make_plugin(tmp_path):
+    """Create plugin directories with unique module names; unload them afterwards."""
+    modules = []
+
+    def make(name, declare=True, source=PLUGIN_SOURCE):
+        module = f"plugin_{uuid.uuid4().hex}"
+        modules.append(module)
+        plugin_dir = tmp_path / name
+        plugin_dir.mkdir()
+        (plugin_dir / f"{module}.py").write_text(source.format(name=name))
+        metadata = {
+            "name": name,
+            "version": "1.0.0",
+            "description": f"{name} plugin",
+            "author": "test",
+            "entry_point": f"{module}:Plugin",
+            "tags": ["testing"],
+        }
+        if declare:
+            metadata.update(commands=[f"{name}-greet"], hooks=["on_start"])
+        (plugin_dir / "plugin.json").write_text(json.dumps(metadata))
+        return module
+
+    yield make
+
+    for module in modules:
+        sys.modules.pop(module, None)
+    sys.path[:] = [p for p in sys.path if not p.startswith(str(tmp_path))]
+
+
+class TestLazyLoading:
+    """Test that plugin code is imported only on first use"""
+
+    def test_listing_does_not_import(self, tmp_path, make_plugin):
+        modules = [make_plugin(f"p{i}") for i in range(5)]
+        manager = PluginManager(tmp_path)
+
+        assert manager.load_all_plugins() == 5
+        plugins = manager.list_plugins()
+
+        assert [p["name"] for p in plugins] == [f"p{i}" for i in range(5)]
+        assert {p["status"] for p in plugins} == {"unloaded"}
+        assert plugins[0]["tags"] == ["testing"]
+        assert manager.get_manifest_commands()["p3-greet"] == "p3"
+        assert not any(m in sys.modules for m in modules)
+
+    def test_command_loads_only_its_plugin(self, tmp_path, make_plugin):
+        first, second = make_plugin("first"), make_plugin("second")
+        manager = PluginManager(tmp_path)
+        manager.load_all_plugins()
+
+        assert manager.execute_command("second-greet", "you") == "second greets you"
+        assert second in sys.modules and first not in sys.modules
+        assert manager.get_plugin("second").status == PluginStatus.LOADED
+
+        greet = manager.get_plugin_commands()["first-greet"]
+        assert first not in sys.modules
+        assert greet("me") == "first greets me"
+        assert first in sys.modules
+
+    def test_hook_loads_declaring_plugins(self, tmp_path, make_plugin):
+        make_plugin("a")
+        make_plugin("b")
+        manager = PluginManager(tmp_path)
+
+        assert sorted(manager.trigger_hook("on_start")) == ["a started", "b started"]
+        assert manager.trigger_hook("unknown") == []
+
+    def test_execute_plugin_loads_on_demand(self, tmp_path, make_plugin):
+        make_plugin("solo")
+        manager = PluginManager(tmp_path)
+
+        assert manager.execute_plugin("solo") == "executed solo"
+        assert manager.execute_plugin("missing") is None
+
+    def test_get_plugin_loads_from_manifest(self, tmp_path, make_plugin):
+        module = make_plugin("solo")
+        manager = PluginManager(tmp_path)
+        manager.load_all_plugins()
+
+        assert module not in sys.modules
+        assert manager.get_plugin("solo").status == PluginStatus.LOADED
+        assert module in sys.modules
+        assert manager.get_plugin("missing") is None
+
+    def test_stats_include_unloaded_plugins(self, tmp_path, make_plugin):
+        modules = [make_plugin(name) for name in ("a", "b", "c")]
+        manager = PluginManager(tmp_path)
+        manager.load_all_plugins()
+        manager.execute_plugin("a")
+
+        stats = manager.get_plugin_stats()
+        assert stats["total_plugins"] == 3 and stats["loaded_plugins"] == 1
+        assert stats["by_status"] == {"loaded": 1, "unloaded": 2}
+        assert stats["with_errors"] == 0
+        assert not any(m in sys.modules for m in modules[1:])
+
+    def test_broken_plugin_is_not_retried(self, tmp_path, make_plugin, monkeypatch):
+        make_plugin("broken", source="raise ImportError('nope')")
+        manager = PluginManager(tmp_path)
+        manager.load_all_plugins()
+
+        attempts = []
+        original = manager.load_plugin
+        monkeypatch.setattr(manager, "load_plugin", lambda *a, **k: attempts.append(1) or original(*a, **k))
+
+        assert manager.execute_command("broken-greet", "x") is None
+        assert manager.execute_command("broken-greet", "x") is None
+        assert len(attempts) == 1
+        assert manager.list_plugins()[0]["status"] == "error"
+
+
+class TestManifestCache:
+    """Test manifest reuse and invalidation"""
+
+    def test_manifest_is_reused_across_managers(self, tmp_path, make_plugin, monkeypatch):
+        make_plugin("cached")
+        PluginManager(tmp_path).load_all_plugins()
+        assert (tmp_path / PluginManager.MANIFEST_FILE).exists()
+
+        def rebuild(*args):
+            raise AssertionError("manifest entry rebuilt")
+
+        monkeypatch.setattr(PluginManager, "_build_manifest_entry", rebuild)
+        assert list(PluginManager(tmp_path).refresh_manifest()) == ["cached"]
+
+    def test_changed_plugin_is_reread(self, tmp_path, make_plugin):
+        make_plugin("evolving")
+        PluginManager(tmp_path).load_all_plugins()
+
+        metadata_file = tmp_path / "evolving" / "plugin.json"
+        metadata = json.loads(metadata_file.read_text())
+        metadata.update(version="2.0.0", commands=["evolving-greet", "evolving-wave"])
+        metadata_file.write_text(json.dumps(metadata))
+
+        manager = PluginManager(tmp_path)
+        entry = manager.refresh_manifest()["evolving"]
+        assert entry.metadata.version == "2.0.0"
+        assert "evolving-wave" in manager.get_manifest_commands()
+
+    def test_removed_plugin_is_dropped(self, tmp_path, make_plugin):
+        make_plugin("keep")
+        make_plugin("gone")
+        PluginManager(tmp_path).load_all_plugins()
+
+        for path in (tmp_path / "gone").iterdir():
+            path.unlink()
+        (tmp_path / "gone").rmdir()
+
+        assert list(PluginManager(tmp_path).refresh_manifest()) == ["keep"]
+
+    def test_undeclared_commands_are_introspected_once(self, tmp_path, make_plugin):
+        module = make_plugin("legacy", declare=False)
+        manager = PluginManager(tmp_path)
+
+        entry = manager.refresh_manifest()["legacy"]
+        assert entry.commands == ["legacy-greet"] and entry.hooks == ["on_start"]
+        assert module in sys.modules
+
+        sys.modules.pop(module)
+        PluginManager(tmp_path).refresh_manifest()
+        assert module not in sys.modules
+
+    def test_corrupt_manifest_is_rebuilt(self, tmp_path, make_plugin):
+        make_plugin("sturdy")
+        (tmp_path / PluginManager.MANIFEST_FILE).write_text("{not json")
+
+        assert list(PluginManager(tmp_path).refresh_manifest()) == ["sturdy"]
+
+    def test_eager_loading_still_available(self, tmp_path, make_plugin):
+        module = make_plugin("eager")
+        manager = PluginManager(tmp_path)
+
+        assert manager.load_all_plugins(lazy=False) == 1
+        assert module in sys.modules
+        assert manager.get_plugin("eager").is_loaded
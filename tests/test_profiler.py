@@ -4,11 +4,13 @@ Tests for performance profiler module
 """
 
 import pytest
+import random
 import time
 
 from lmapp.utils.profiler import (
     PerformanceProfiler,
     OperationMetrics,
+    LatencyHistogram,
     get_profiler,
     profile_operation,
     enable_profiling,
@@ -179,6 +181,71 @@ class TestPerformanceProfiler:
         assert metrics.memory_end_bytes == 0
 
 
+class TestLatencyHistogram:
+    """Test the log-bucketed quantile sketch"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test p50/p95/p99 against exact order statistics"""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(2, 1.5) for _ in range(20000)]
+        histogram = LatencyHistogram(relative_accuracy=0.01)
+        for value in values:
+            histogram.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert histogram.quantile(q) == pytest.approx(exact, rel=0.011)
+        assert histogram.quantile(0) == ordered[0]
+        assert histogram.quantile(1) == ordered[-1]
+        assert len(histogram.buckets) < 2000
+
+    def test_histogram_buckets(self):
+        """Test power-of-two histogram rows"""
+        histogram = LatencyHistogram()
+        for value in (0.0, 0.5, 0.9, 3, 3, 100):
+            histogram.add(value)
+
+        rows = histogram.histogram()
+        assert sum(row["count"] for row in rows) == 6
+        assert [row["le_ms"] for row in rows] == sorted(row["le_ms"] for row in rows)
+        assert {"le_ms": 4.0, "count": 2} in rows
+        assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+class TestLowOverheadProfiling:
+    """Test bounded memory and interval-based process sampling"""
+
+    def test_history_is_bounded(self):
+        """Test ring buffers keep recent metrics while aggregates see everything"""
+        profiler = PerformanceProfiler(history_size=10)
+
+        for _ in range(1000):
+            with profiler.track_operation("op"):
+                pass
+
+        assert len(profiler.metrics["op"]) == 10
+        ops = profiler.get_summary()["operations"]["op"]
+        assert ops["count"] == 1000
+        assert ops["min_ms"] <= ops["p50_ms"] <= ops["p95_ms"] <= ops["p99_ms"] <= ops["max_ms"]
+        assert sum(row["count"] for row in ops["histogram"]) == 1000
+
+    @pytest.mark.parametrize("interval, expected_samples", [(3600, 1), (0, 100)])
+    def test_process_sampled_on_interval(self, monkeypatch, interval, expected_samples):
+        """Test psutil is queried per interval rather than per operation"""
+        profiler = PerformanceProfiler(sample_interval=interval)
+        calls = []
+        memory_info = profiler.process.memory_info
+        monkeypatch.setattr(profiler.process, "memory_info", lambda: calls.append(1) or memory_info())
+
+        for _ in range(50):
+            with profiler.track_operation("op"):
+                pass
+
+        assert len(calls) == expected_samples
+        assert profiler.get_summary()["process"]["samples"] == expected_samples
+
+
 class TestGlobalProfiler:
     """Test global profiler functions"""
 
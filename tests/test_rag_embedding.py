@@ -1,8 +1,14 @@
 """Unit tests for RAG embedding service."""
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
 from lmapp.rag.embedding import EmbeddingService, MockEmbeddingModel, OllamaEmbeddingModel
+from lmapp.rag.embedding_cache import EmbeddingCache
 
 
 class TestMockEmbeddingModel:
@@ -122,6 +128,120 @@ class TestEmbeddingService:
         assert len(embeddings) == 2
 
 
+class _CountingModel(MockEmbeddingModel):
+    """Mock model that records how many texts and queries it embedded."""
+
+    def __init__(self, dim: int = 16):
+        super().__init__(dim)
+        self.embedded = 0
+        self.queries = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+    def embed_query(self, query):
+        # Like instruction-tuned models, queries embed differently from documents
+        self.queries += 1
+        return super().embed_query("query: " + query)
+
+
+class TestPersistentEmbeddingCache:
+    """Test the bounded, persistent embedding cache."""
+
+    def test_no_embedding_calls_after_restart(self, tmp_path):
+        """Test unchanged texts are served from disk by a new service."""
+        texts = [f"chunk {i}" for i in range(20)]
+
+        first_model = _CountingModel()
+        first = EmbeddingService(first_model, cache_dir=tmp_path)
+        original = first.embed_texts(texts)
+        first._cache.close()
+        assert first_model.embedded == 20
+
+        second_model = _CountingModel()
+        second = EmbeddingService(second_model, cache_dir=tmp_path)
+        restored = second.embed_texts(texts)
+
+        assert second_model.embedded == 0
+        assert restored == original
+        assert second.get_cache_stats()["disk_hits"] == 20
+
+    def test_duplicate_texts_embedded_once(self):
+        """Test repeated texts in one call are embedded once."""
+        model = _CountingModel()
+        service = EmbeddingService(model)
+
+        embeddings = service.embed_texts(["same", "same", "other"])
+
+        assert model.embedded == 2
+        assert embeddings[0] == embeddings[1]
+
+    def test_keys_include_model(self, tmp_path):
+        """Test different models do not share cached vectors."""
+        EmbeddingService(_CountingModel(dim=16), cache_dir=tmp_path).embed_texts(["text"])
+
+        other_model = _CountingModel(dim=32)
+        other = EmbeddingService(other_model, cache_dir=tmp_path)
+        embedding = other.embed_texts(["text"])[0]
+
+        assert other_model.embedded == 1
+        assert len(embedding) == 32
+
+    def test_memory_tier_bounded_by_bytes(self):
+        """Test the LRU tier evicts to stay within its byte budget."""
+        cache = EmbeddingCache(max_memory_bytes=4 * 10 * 3)
+        for i in range(5):
+            cache.set_many({f"key{i}": [float(i)] * 10})
+
+        stats = cache.get_stats()
+        assert stats["memory_entries"] == 3
+        assert stats["memory_bytes"] <= stats["max_memory_bytes"]
+        assert cache.get("key0") is None
+        assert cache.get("key4") == [4.0] * 10
+
+    def test_lru_order_on_hit(self):
+        """Test a hit protects an entry from eviction."""
+        cache = EmbeddingCache(max_memory_bytes=4 * 2)
+        cache.set_many({"a": [1.0]})
+        cache.set_many({"b": [2.0]})
+        cache.get("a")
+        cache.set_many({"c": [3.0]})
+
+        assert cache.get("a") == [1.0]
+        assert cache.get("b") is None
+
+    def test_hit_miss_counters(self):
+        """Test hit and miss counters."""
+        service = EmbeddingService(_CountingModel())
+        service.embed_texts(["a", "b"])
+        service.embed_texts(["a", "c"])
+
+        stats = service.get_cache_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 3
+
+    def test_query_embedding_uses_model_and_own_namespace(self):
+        """Test queries go through embed_query and are cached apart from documents."""
+        model = _CountingModel()
+        service = EmbeddingService(model)
+        document = service.embed_texts(["text"])[0]
+
+        first = service.embed_query("text")
+        second = service.embed_query("text")
+
+        assert model.queries == 1
+        assert first == second == pytest.approx(MockEmbeddingModel(16).embed_query("query: text"))
+        assert first != document
+
+    def test_fallback_vectors_not_persisted(self, tmp_path):
+        """Test vectors from a degraded Ollama call are not written to disk."""
+        service = EmbeddingService(OllamaEmbeddingModel(base_url="http://invalid-url:0000"), cache_dir=tmp_path)
+
+        assert len(service.embed_texts(["Test"])) == 1
+        assert len(service._cache) == 0
+
+
 class TestOllamaEmbeddingModel:
     """Test Ollama embedding model."""
 
@@ -144,5 +264,79 @@ class TestOllamaEmbeddingModel:
         assert len(embeddings[0]) > 0
 
 
+class _MockEmbedHandler(BaseHTTPRequestHandler):
+    """Minimal /api/embed endpoint with a fixed per-request latency."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        self.server.requests_seen += 1
+        time.sleep(self.server.latency)
+        payload = json.dumps({"embeddings": [[float(len(text)), 1.0, 0.0] for text in inputs]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_embed_server():
+    """Run a local mock Ollama embed server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockEmbedHandler)
+    server.requests_seen = 0
+    server.latency = 0.005
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestBatchedOllamaEmbedding:
+    """Test batched, pooled embedding against a mock server."""
+
+    def test_batches_preserve_order(self, mock_embed_server):
+        """Test results come back in input order across batches."""
+        url = f"http://127.0.0.1:{mock_embed_server.server_port}"
+        model = OllamaEmbeddingModel(base_url=url, batch_size=4, max_concurrency=3)
+        texts = ["x" * i for i in range(1, 11)]
+
+        embeddings = model.embed(texts)
+
+        assert [e[0] for e in embeddings] == [float(i) for i in range(1, 11)]
+        assert mock_embed_server.requests_seen == 3
+        assert model.dimension == 3
+        model.close()
+
+    def test_batched_throughput_beats_serial(self, mock_embed_server):
+        """Benchmark batched requests against one request per text."""
+        url = f"http://127.0.0.1:{mock_embed_server.server_port}"
+        texts = [f"chunk {i}" for i in range(100)]
+
+        serial = OllamaEmbeddingModel(base_url=url, batch_size=1, max_concurrency=1)
+        start = time.perf_counter()
+        serial.embed(texts)
+        serial_time = time.perf_counter() - start
+        serial.close()
+
+        mock_embed_server.requests_seen = 0
+        batched = OllamaEmbeddingModel(base_url=url, batch_size=32, max_concurrency=4)
+        start = time.perf_counter()
+        embeddings = batched.embed(texts)
+        batched_time = time.perf_counter() - start
+        batched.close()
+
+        assert len(embeddings) == 100
+        assert mock_embed_server.requests_seen == 4
+        assert batched_time < serial_time / 4, f"batched {batched_time:.3f}s vs serial {serial_time:.3f}s"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
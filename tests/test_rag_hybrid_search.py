@@ -3,6 +3,9 @@
 import pytest
 
 from lmapp.rag.hybrid_search import BM25Searcher, HybridSearcher, SearchRanking
+from lmapp.rag.inverted_index import InvertedIndex
+from lmapp.rag.models import Document
+from lmapp.rag.rag_system import DocumentIndex
 
 
 class TestBM25Searcher:
@@ -55,6 +58,123 @@ class TestBM25Searcher:
         assert all(score >= 0 for _, score in results)
 
 
+class TestBM25Index:
+    """Test the inverted index behind BM25."""
+
+    def test_incremental_add_and_remove(self):
+        """Test documents can be added and removed without a rebuild."""
+        searcher = BM25Searcher()
+        searcher.add_document("py", "Python is a programming language")
+        searcher.add_document("dog", "Dogs are cute pets")
+
+        assert [doc_id for doc_id, _ in searcher.search_index("python")] == ["py"]
+
+        searcher.remove_document("py")
+        assert searcher.search_index("python") == []
+        assert "python" not in searcher.index.postings
+
+    def test_true_average_document_length(self):
+        """Test the average length is computed over the whole corpus."""
+        index = InvertedIndex()
+        index.add("a", "one two")
+        index.add("b", "one two three four")
+
+        assert index.avg_doc_length == 3.0
+
+        index.remove("b")
+        assert index.avg_doc_length == 2.0
+
+    def test_shorter_document_ranks_higher(self):
+        """Test length normalisation favours the shorter matching document."""
+        searcher = BM25Searcher()
+        searcher.add_document("short", "python tips")
+        searcher.add_document("long", "python " + "filler words here " * 20)
+        searcher.add_document("other", "java")
+
+        results = searcher.search_index("python", k=2)
+        assert results[0][0] == "short"
+        assert results[0][1] > results[1][1]
+
+    def test_idf_cache_invalidated_on_change(self):
+        """Test cached IDF values follow corpus updates."""
+        index = InvertedIndex()
+        index.add("a", "python")
+        index.add("b", "java")
+        before = index.idf("python")
+
+        index.add("c", "python again")
+        assert index.idf("python") < before
+
+    def test_index_round_trip(self, tmp_path):
+        """Test the index persists and restores."""
+        searcher = BM25Searcher()
+        searcher.add_document("py", "Python is a programming language")
+        searcher.add_document("java", "Java is a programming language")
+        path = tmp_path / "bm25.json"
+        searcher.index.save(path)
+
+        restored = BM25Searcher(index=InvertedIndex.load(path))
+        assert restored.search_index("python") == searcher.search_index("python")
+        restored.remove_document("py")
+        assert restored.search_index("python") == []
+
+    def test_document_index_persists_keyword_index(self, tmp_path):
+        """Test DocumentIndex keeps its keyword index next to the documents."""
+        index = DocumentIndex(tmp_path)
+        index.add_document(Document("doc1", "Python", "Python programming"))
+        index.flush()
+        assert index.keyword_index_file.exists()
+
+        reloaded = DocumentIndex(tmp_path)
+        assert not reloaded._keyword_index_dirty
+        assert reloaded.keyword_searcher.search_index("python")[0][0] == "doc1"
+
+    def test_list_search_leaves_injected_index_alone(self, tmp_path):
+        """Test search() over a document list does not replace the persistent postings."""
+        index = DocumentIndex(tmp_path)
+        index.add_document(Document("doc1", "Python", "Python programming"))
+
+        results = index.keyword_searcher.search("java", ["Java programming", "Dogs"], k=1)
+        assert results[0][0] == 0 and results[0][1] > 0
+        assert set(index.keyword_searcher.index.doc_lengths) == {"doc1"}
+        assert index.search("python")[0].document.doc_id == "doc1"
+
+    def test_document_index_reconciles_stale_keyword_index(self, tmp_path):
+        """Test unflushed changes are picked up from the documents on load."""
+        index = DocumentIndex(tmp_path)
+        index.add_document(Document("doc1", "Python", "Python programming"))
+        index.flush()
+        index.add_document(Document("doc2", "Java", "Java programming"))
+        index.remove_document("doc1")
+
+        reloaded = DocumentIndex(tmp_path)
+        assert reloaded.keyword_searcher.search_index("python") == []
+        assert reloaded.keyword_searcher.search_index("java")[0][0] == "doc2"
+
+    def test_stopwords_are_not_indexed(self):
+        """Test stopword-only queries match nothing."""
+        searcher = BM25Searcher()
+        searcher.add_document("py", "The Python language")
+        searcher.add_document("java", "A language for the JVM")
+
+        assert "the" not in searcher.index.postings
+        assert searcher.search_index("the and a") == []
+        assert [doc_id for doc_id, _ in searcher.search_index("the python")] == ["py"]
+
+    def test_document_index_ranks_by_bm25(self, tmp_path):
+        """Test DocumentIndex.search ranks from the postings with scores in (0, 1]."""
+        index = DocumentIndex(tmp_path)
+        index.add_document(Document("short", "Python", "python tips"))
+        index.add_document(Document("long", "Python", "python " + "filler words here " * 20))
+        index.add_document(Document("java", "Java", "java tips"))
+
+        results = index.search("the python tips", top_k=3)
+        assert results[0].document.doc_id == "short"
+        assert {r.document.doc_id for r in results} == {"short", "long", "java"}
+        assert all(0 < r.relevance_score <= 1 for r in results)
+        assert results[0].matched_text.startswith("python")
+
+
 class TestHybridSearcher:
     """Test hybrid semantic + keyword search."""
 
@@ -0,0 +1,143 @@
+"""Tests for incremental directory indexing in RAGSystem."""
+
+import os
+from pathlib import Path
+
+from lmapp.rag.inverted_index import InvertedIndex
+from lmapp.rag.rag_system import RAGSystem
+
+
+def _bump_mtime(path):
+    """Move a file's mtime forward without changing its content."""
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 5_000_000_000))
+
+
+class TestIncrementalIndexing:
+    """Test manifest-based change detection."""
+
+    def _make_tree(self, root):
+        (root / "docs").mkdir()
+        (root / "docs" / "a.txt").write_text("Python is a programming language")
+        (root / "docs" / "b.md").write_text("# Notes\n\nJava is also a language")
+        (root / "src").mkdir()
+        (root / "src" / "c.py").write_text("def hello():\n    return 'hello'")
+        (root / "image.png").write_bytes(b"\x89PNG")
+
+    def test_first_run_indexes_all_files(self, tmp_path):
+        """Test a fresh index picks up every matching file."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+
+        assert rag.index_directory(tmp_path, workers=2) == 3
+        assert rag.last_index_stats["unchanged"] == 0
+        assert len(rag.file_manifest.records) == 3
+
+    def test_unchanged_files_are_skipped(self, tmp_path):
+        """Test a second run reads nothing when files are unchanged."""
+        self._make_tree(tmp_path)
+        RAGSystem(tmp_path / "index").index_directory(tmp_path)
+
+        rag = RAGSystem(tmp_path / "index")
+        rag.ingestor.load_file = lambda path: (_ for _ in ()).throw(AssertionError(f"re-read {path}"))
+
+        assert rag.index_directory(tmp_path) == 0
+        assert rag.last_index_stats["unchanged"] == 3
+
+    def test_touched_file_with_same_content_not_rechunked(self, tmp_path):
+        """Test a new mtime alone only refreshes the manifest entry."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+        _bump_mtime(tmp_path / "docs" / "a.txt")
+
+        assert rag.index_directory(tmp_path) == 0
+        assert rag.last_index_stats["unchanged"] == 3
+        assert rag.index_directory(tmp_path) == 0
+
+    def test_modified_file_is_reindexed(self, tmp_path):
+        """Test changed content replaces the file's chunks."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+
+        target = tmp_path / "docs" / "a.txt"
+        target.write_text("Rust is a systems language")
+        _bump_mtime(target)
+
+        assert rag.index_directory(tmp_path) == 1
+        assert rag.search("Rust")[0].document.file_path == str(target.absolute())
+        assert not any("Python" in doc.content for doc in rag.index.documents.values())
+
+    def test_shrunk_file_drops_stale_chunks(self, tmp_path):
+        """Test chunks beyond the new chunk count are purged."""
+        target = tmp_path / "long.txt"
+        target.write_text("word " * 1000)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+        assert len(rag.index.documents) > 1
+
+        target.write_text("short now")
+        _bump_mtime(target)
+        rag.index_directory(tmp_path)
+
+        assert len(rag.index.documents) == 1
+
+    def test_deleted_file_is_purged(self, tmp_path):
+        """Test chunks of deleted files are removed from the index."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+
+        (tmp_path / "src" / "c.py").unlink()
+        rag.index_directory(tmp_path)
+
+        assert rag.last_index_stats["removed"] == 1
+        assert not any(doc.file_path.endswith("c.py") for doc in rag.index.documents.values())
+        reloaded = RAGSystem(tmp_path / "index")
+        assert len(reloaded.file_manifest.records) == 2
+
+    def test_narrower_extensions_keep_other_files(self, tmp_path):
+        """Test files excluded by extensions are only purged with prune."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+
+        rag.index_directory(tmp_path, extensions=[".py"])
+        assert rag.last_index_stats["removed"] == 0
+        assert len(rag.file_manifest.records) == 3
+        assert any(doc.file_path.endswith("a.txt") for doc in rag.index.documents.values())
+
+        rag.index_directory(tmp_path, extensions=[".py"], prune=True)
+        assert rag.last_index_stats["removed"] == 2
+        assert [Path(path).name for path in rag.file_manifest.records] == ["c.py"]
+
+    def test_force_reindexes_everything(self, tmp_path):
+        """Test force ignores the manifest."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+
+        assert rag.index_directory(tmp_path, force=True) == 3
+
+    def test_index_directory_is_not_indexed(self, tmp_path):
+        """Test the index's own files are never picked up."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        rag.index_directory(tmp_path)
+        rag.index_directory(tmp_path)
+
+        assert not any(path.startswith(str((tmp_path / "index").absolute())) for path in rag.file_manifest.records)
+
+    def test_index_files_saves_once_per_batch(self, tmp_path, monkeypatch):
+        """Test indexing several files writes the keyword index once."""
+        self._make_tree(tmp_path)
+        rag = RAGSystem(tmp_path / "index")
+        saves = []
+        original_save = InvertedIndex.save
+        monkeypatch.setattr(InvertedIndex, "save", lambda index, path: saves.append(path) or original_save(index, path))
+
+        doc_ids = rag.index_files([tmp_path / "docs" / "a.txt", tmp_path / "docs" / "b.md", tmp_path / "missing.txt"])
+
+        assert doc_ids[0] and doc_ids[1] and doc_ids[2] is None
+        assert len(saves) == 1
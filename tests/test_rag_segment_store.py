@@ -0,0 +1,154 @@
+"""Unit tests for the append-only RAG segment store."""
+
+import json
+import threading
+
+from lmapp.rag.models import Document
+from lmapp.rag.rag_system import DocumentIndex
+from lmapp.rag.segment_store import SegmentStore
+
+
+class TestSegmentStore:
+    """Test SegmentStore."""
+
+    def test_put_and_reload(self, tmp_path):
+        """Test documents survive a reload."""
+        store = SegmentStore(tmp_path)
+        store.put(Document("doc1", "One", "First"))
+        store.put_many([Document("doc2", "Two", "Second"), Document("doc3", "Three", "Third")])
+        store.close()
+
+        documents = SegmentStore(tmp_path).load()
+        assert set(documents) == {"doc1", "doc2", "doc3"}
+        assert documents["doc2"].title == "Two"
+
+    def test_put_appends_without_rewriting(self, tmp_path):
+        """Test each put appends exactly one record."""
+        store = SegmentStore(tmp_path)
+        segment = store.segment_dir / store._segments[-1]
+
+        store.put(Document("doc1", "One", "First"))
+        size_after_first = segment.stat().st_size
+        store.put(Document("doc2", "Two", "Second"))
+
+        lines = segment.read_text().splitlines()
+        assert len(lines) == 2
+        assert segment.read_text().startswith(lines[0])
+        assert segment.stat().st_size > size_after_first
+
+    def test_tombstone_delete(self, tmp_path):
+        """Test deletes are recorded as tombstones and honoured on replay."""
+        store = SegmentStore(tmp_path)
+        store.put(Document("doc1", "One", "First"))
+        store.delete("doc1")
+        store.close()
+
+        assert SegmentStore(tmp_path).load() == {}
+        assert store.get_stats()["dead_records"] == 2
+
+    def test_overwrite_keeps_latest(self, tmp_path):
+        """Test later puts win over earlier ones."""
+        store = SegmentStore(tmp_path)
+        store.put(Document("doc1", "Old", "Old content"))
+        store.put(Document("doc1", "New", "New content"))
+        store.close()
+
+        assert SegmentStore(tmp_path).load()["doc1"].title == "New"
+
+    def test_segment_rolls_when_full(self, tmp_path):
+        """Test the active segment is sealed once it exceeds the size limit."""
+        store = SegmentStore(tmp_path, max_segment_bytes=200)
+        for i in range(10):
+            store.put(Document(f"doc{i}", "Title", "x" * 100))
+        store.close()
+
+        assert store.get_stats()["segments"] > 1
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert len(manifest["segments"]) == store.get_stats()["segments"]
+        assert len(SegmentStore(tmp_path).load()) == 10
+
+    def test_compaction_drops_dead_records(self, tmp_path):
+        """Test compaction merges sealed segments and removes garbage."""
+        store = SegmentStore(tmp_path, compaction_ratio=0.5, min_compaction_records=10, background_compaction=False)
+        for i in range(20):
+            store.put(Document("doc", "Title", f"version {i}"))
+        store.put(Document("other", "Other", "kept"))
+        store.close()
+
+        stats = store.get_stats()
+        assert stats["total_records"] < 21
+        documents = SegmentStore(tmp_path).load()
+        assert documents["doc"].content == "version 19"
+        assert documents["other"].content == "kept"
+
+    def test_background_compaction(self, tmp_path):
+        """Test compaction on a background thread leaves a consistent index."""
+        store = SegmentStore(tmp_path, compaction_ratio=0.5, min_compaction_records=10)
+        for i in range(50):
+            store.put(Document(f"doc{i % 5}", "Title", f"version {i}"))
+        store.wait_for_compaction()
+        store.close()
+
+        documents = SegmentStore(tmp_path).load()
+        assert len(documents) == 5
+        assert documents["doc4"].content == "version 49"
+
+    def test_merge_write_does_not_hold_the_lock(self, tmp_path, monkeypatch):
+        """Test writers can append while the merged segment is being written."""
+        store = SegmentStore(tmp_path, compaction_ratio=0.5, min_compaction_records=10, background_compaction=False)
+        for i in range(5):
+            store.put(Document("doc", "Title", f"version {i}"))
+        store._seal_active()
+
+        blocked = []
+        original = store._write_temp_segment
+
+        def write_temp_segment(documents):
+            writer = threading.Thread(target=store.put, args=(Document("late", "Late", "during merge"),))
+            writer.start()
+            writer.join(timeout=5)
+            blocked.append(writer.is_alive())
+            return original(documents)
+
+        monkeypatch.setattr(store, "_write_temp_segment", write_temp_segment)
+        store.compact()
+        store.close()
+
+        assert blocked == [False]
+        documents = SegmentStore(tmp_path).load()
+        assert documents["doc"].content == "version 4"
+        assert documents["late"].content == "during merge"
+        assert not list((tmp_path / "segments").glob("*.tmp"))
+
+    def test_migrates_legacy_index(self, tmp_path):
+        """Test an existing documents.jsonl is adopted as the first segment."""
+        legacy = tmp_path / "documents.jsonl"
+        legacy.write_text(json.dumps(Document("doc1", "Legacy", "Old format").to_dict()) + "\n")
+
+        documents = SegmentStore(tmp_path).load()
+        assert documents["doc1"].title == "Legacy"
+        assert not legacy.exists()
+
+
+class TestDocumentIndexStorage:
+    """Test DocumentIndex on top of the segment store."""
+
+    def test_remove_persists(self, tmp_path):
+        """Test removals survive a reload."""
+        index = DocumentIndex(tmp_path)
+        index.add_documents([Document("doc1", "One", "First"), Document("doc2", "Two", "Second")])
+        index.remove_document("doc1")
+        index.store.close()
+
+        reloaded = DocumentIndex(tmp_path)
+        assert reloaded.get_document("doc1") is None
+        assert reloaded.get_document("doc2") is not None
+
+    def test_clear_persists(self, tmp_path):
+        """Test clearing the index leaves a single empty segment."""
+        index = DocumentIndex(tmp_path)
+        index.add_document(Document("doc1", "One", "First"))
+        index.clear()
+
+        assert index.store.get_stats()["segments"] == 1
+        assert DocumentIndex(tmp_path).documents == {}
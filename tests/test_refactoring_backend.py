@@ -20,6 +20,7 @@ from lmapp.server.refactoring_service import (
     QuickFix,
     FixCategory,
     FixSeverity,
+    SymbolUsage,
 )
 
 
@@ -191,6 +192,32 @@ print(text)'''
         assert isinstance(fixes, list)
 
 
+class TestSymbolUsage:
+    """Test the one-pass symbol usage table."""
+
+    def test_whole_words_only(self):
+        """Test names match as whole words, like \\b{name}\\b."""
+        usage = SymbolUsage.from_code("count = 0\ncounter = 1\nx.count_all()\nprint(f'{count}')")
+
+        assert usage.is_used_after("count", 0)
+        assert usage.last_line["count"] == 3
+        assert not usage.is_used_after("counter", 1)
+        assert not usage.is_used_after("missing", 0)
+
+    def test_unused_detection_in_large_module(self):
+        """Test every unused assignment is found in one pass over a large module."""
+        code = "\n".join(f"value_{i} = {i}" for i in range(5000)) + "\nprint(value_0, value_4999)"
+        fixes = RefactoringService().get_quick_fixes(code, "python")
+
+        unused_lines = {f.line for f in fixes if f.category == FixCategory.REMOVE_UNUSED}
+        assert unused_lines == set(range(2, 5000))
+
+    def test_unparseable_code(self):
+        """Test code that does not parse is still analyzed."""
+        fixes = RefactoringService().get_quick_fixes("def broken(:\n    leftover = (1,\n", "python")
+        assert any(f.category == FixCategory.REMOVE_UNUSED and f.line == 2 for f in fixes)
+
+
 class TestQuickFixDataclass:
     """Test the QuickFix dataclass."""
 
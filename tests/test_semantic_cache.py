@@ -0,0 +1,122 @@
+"""
+Tests for the semantic (near-duplicate) response cache
+"""
+
+import pytest
+from lmapp.core.cache import ResponseCache
+from lmapp.core.chat import ChatSession
+from lmapp.core.semantic_cache import SemanticResponseCache
+from lmapp.rag.embedding import HashingEmbeddingModel
+from mock_backend import MockBackend
+
+
+class TestSemanticResponseCache:
+    """Test suite for SemanticResponseCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Semantic cache over a temporary response cache"""
+        return SemanticResponseCache(ResponseCache(cache_dir=tmp_path, ttl_hours=1), embedder=HashingEmbeddingModel(), threshold=0.8)
+
+    def test_rephrased_query_hits(self, cache):
+        """A rephrasing of a cached query returns its response"""
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+
+        assert cache.get("what is the capital of france", "mistral", "ollama", 0.7) == "Paris"
+        assert cache.get("What's the capital city of France?", "mistral", "ollama", 0.7) == "Paris"
+        assert cache.get_stats()["semantic_hits"] == 2
+
+    def test_unrelated_query_misses(self, cache):
+        """Dissimilar queries fall below the threshold"""
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+
+        assert cache.get("How do I sort a list in Python?", "mistral", "ollama", 0.7) is None
+        assert cache.get_stats()["semantic_misses"] == 1
+
+    def test_partitioned_by_model_and_temperature(self, cache):
+        """Matches never cross model, backend or temperature"""
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+
+        assert cache.get("what is the capital of france", "llama2", "ollama", 0.7) is None
+        assert cache.get("what is the capital of france", "mistral", "ollama", 0.2) is None
+        assert cache.get("what is the capital of france", "mistral", "llamafile", 0.7) is None
+
+    def test_threshold_is_configurable(self, tmp_path):
+        """A strict threshold rejects looser rephrasings"""
+        cache = SemanticResponseCache(ResponseCache(cache_dir=tmp_path), embedder=HashingEmbeddingModel(), threshold=0.99)
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+
+        assert cache.get("What's the capital city of France?", "mistral", "ollama", 0.7) is None
+
+    def test_index_survives_restart(self, tmp_path, cache):
+        """Vectors are persisted alongside the responses"""
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+        cache.response_cache.close()
+
+        reopened = SemanticResponseCache(ResponseCache(cache_dir=tmp_path), embedder=HashingEmbeddingModel(), threshold=0.8)
+        assert reopened.get_stats()["indexed_queries"] == 1
+        assert reopened.get("what is the capital of france", "mistral", "ollama", 0.7) == "Paris"
+
+    def test_cleared_responses_are_dropped_from_index(self, cache):
+        """Entries whose response is gone are forgotten on lookup"""
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+        cache.response_cache.clear(expired_only=False)
+
+        assert cache.get("what is the capital of france", "mistral", "ollama", 0.7) is None
+        assert cache.get_stats()["indexed_queries"] == 0
+
+    def test_embedder_is_required(self, tmp_path):
+        """There is no lexical fallback embedder"""
+        with pytest.raises(ValueError):
+            SemanticResponseCache(ResponseCache(cache_dir=tmp_path))
+
+    @pytest.mark.parametrize(
+        "cached, query",
+        [
+            ("what is 2+2", "what is 2+3"),
+            ("Is this code safe?", "Is this code not safe?"),
+            ("Why does the build fail?", "Why doesn't the build fail?"),
+        ],
+    )
+    def test_numbers_and_negations_must_match(self, tmp_path, cached, query):
+        """Near-identical wording with a different number or negation is a miss"""
+        cache = SemanticResponseCache(ResponseCache(cache_dir=tmp_path), embedder=HashingEmbeddingModel(), threshold=0.5)
+        cache.set(cached, "cached answer", "mistral", "ollama", 0.7)
+
+        assert cache.get(query, "mistral", "ollama", 0.7) is None
+        assert cache.get(cached.upper(), "mistral", "ollama", 0.7) == "cached answer"
+
+    def test_degraded_embeddings_are_not_indexed(self, tmp_path):
+        """Placeholder vectors from an unreachable embedding server are ignored"""
+        embedder = HashingEmbeddingModel()
+        embedder.last_call_degraded = True
+        cache = SemanticResponseCache(ResponseCache(cache_dir=tmp_path), embedder=embedder, threshold=0.8)
+        cache.set("What is the capital of France?", "Paris", "mistral", "ollama", 0.7)
+
+        assert cache.get_stats()["indexed_queries"] == 0
+        assert cache.get("what is the capital of france", "mistral", "ollama", 0.7) is None
+
+
+class TestChatSessionSemanticCache:
+    """ChatSession consults the semantic tier before the backend"""
+
+    def test_rephrased_prompt_skips_backend(self, tmp_path):
+        backend = MockBackend()
+        backend.start()
+        calls = []
+        original_chat = backend.chat
+
+        def counting_chat(*args, **kwargs):
+            calls.append(kwargs.get("prompt"))
+            return original_chat(*args, **kwargs)
+
+        backend.chat = counting_chat
+        semantic = SemanticResponseCache(ResponseCache(cache_dir=tmp_path), embedder=HashingEmbeddingModel(), threshold=0.8)
+        session = ChatSession(backend, model="mock-model", semantic_cache=semantic)
+
+        first = session.send_prompt("What is the capital of France?")
+        second = session.send_prompt("what is the capital of france")
+
+        assert second == first
+        assert len(calls) == 1
+        assert len(session.history) == 4
@@ -0,0 +1,113 @@
+"""Tests for cached backend resolution and the async completion path"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mock_backend import MockBackend, StaticDetector
+from lmapp.backend.ollama import OllamaBackend
+from lmapp.server import app as server_app
+from lmapp.server.backend_state import BackendState
+from lmapp.server.scheduler import RequestScheduler
+
+
+class TestBackendState:
+    """Test backend resolution caching"""
+
+    def test_detection_runs_once_while_backend_is_up(self):
+        backend = MockBackend()
+        backend.start()
+        state = BackendState(detector_factory=lambda: StaticDetector([backend]))
+
+        for _ in range(10):
+            assert state.get() is backend
+
+        assert state.detections == 1
+
+    def test_refresh_replaces_stopped_backend(self):
+        first, second = MockBackend(), MockBackend()
+        first.start()
+        second.start()
+        state = BackendState(detector_factory=lambda: StaticDetector([first, second]))
+        assert state.get() is first
+
+        first.stop()
+        assert state.refresh() is second
+
+    def test_missing_backend_is_retried(self, monkeypatch):
+        backend = MockBackend()
+        state = BackendState(detector_factory=lambda: StaticDetector([backend]))
+        assert state.get() is None
+        assert state.get() is None
+        assert state.detections == 1
+
+        backend.start()
+        monkeypatch.setattr(BackendState, "MISSING_RETRY", 0.0)
+        assert state.get() is backend
+
+
+class TestAsyncCompletions:
+    """Test /v1/completions against an Ollama stand-in"""
+
+    @pytest.fixture
+    def client(self, ollama_server, monkeypatch):
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{ollama_server.server_port}"
+        state = BackendState(detector_factory=lambda: StaticDetector([backend]))
+        monkeypatch.setattr(server_app.app.state, "backend_state", state)
+        monkeypatch.setattr(server_app.app.state, "scheduler", RequestScheduler(max_concurrency_per_model=8))
+        with TestClient(server_app.app) as client:
+            yield client
+
+    def test_completion_skips_per_request_probes(self, client, ollama_server):
+        for i in range(5):
+            response = client.post("/v1/completions", json={"model": "m", "prompt": f"p{i}"})
+            assert response.status_code == 200
+            assert response.json()["choices"][0]["text"] == f"echo: p{i}"
+
+        assert ollama_server.paths.count("/api/tags") == 1
+        assert ollama_server.paths.count("/api/generate") == 5
+        assert server_app.app.state.backend_state.detections == 1
+
+    def test_concurrent_completions_overlap(self, client, ollama_server):
+        """Generations run concurrently on the event loop"""
+        ollama_server.latency = 0.3
+        client.post("/v1/completions", json={"model": "m", "prompt": "warm-up"})
+
+        results = []
+
+        def request(i):
+            results.append(client.post("/v1/completions", json={"model": "m", "prompt": f"p{i}"}).status_code)
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        assert results == [200] * 8
+        assert elapsed < 8 * 0.3 / 2
+
+    @pytest.mark.parametrize(
+        "path,body",
+        [
+            ("/v1/completions", {"model": "m", "prompt": "p"}),
+            ("/v1/chat", {"model": "m", "message": "p"}),
+        ],
+    )
+    def test_backend_failure_invalidates_cached_backend(self, client, monkeypatch, path, body):
+        state = server_app.app.state
+        invalidated = []
+        monkeypatch.setattr(state.backend_state, "invalidate", lambda: invalidated.append(path))
+
+        async def fail(*args, **kwargs):
+            raise ConnectionError("backend went away")
+
+        monkeypatch.setattr(state.async_client, "complete", fail)
+        client.post(path, json=body)
+
+        assert invalidated == [path]
@@ -0,0 +1,191 @@
+"""Tests for request coalescing and per-model admission in the API server"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mock_backend import StaticDetector
+from lmapp.backend.ollama import OllamaBackend
+from lmapp.server import app as server_app
+from lmapp.server.backend_state import BackendState
+from lmapp.server.scheduler import RequestScheduler, SchedulerBusy
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class _Generator:
+    """Mock model that takes `latency` seconds and tracks concurrency."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, prompt):
+        async def generate():
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(self.latency)
+                return f"echo: {prompt}"
+            finally:
+                self.running -= 1
+
+        return generate
+
+
+class TestRequestScheduler:
+    """Test RequestScheduler"""
+
+    def test_identical_requests_share_one_generation(self):
+        scheduler = RequestScheduler()
+        model = _Generator()
+        key = scheduler.make_key("hi", "m", "mock")
+
+        async def burst():
+            return await asyncio.gather(*(scheduler.submit(key, "m", model("hi")) for _ in range(10)))
+
+        results = run(burst())
+
+        assert results == ["echo: hi"] * 10
+        assert model.calls == 1
+        stats = scheduler.get_stats()
+        assert stats["coalesced"] == 9
+        assert stats["in_flight"] == 0
+
+    def test_key_matches_response_cache_normalisation(self):
+        assert RequestScheduler.make_key(" hi ", "m", "mock") == RequestScheduler.make_key("hi", "m", "mock")
+        assert RequestScheduler.make_key("hi", "m", "mock") != RequestScheduler.make_key("hi", "m", "mock", system_prompt="s")
+        assert RequestScheduler.make_key("hi", "m", "mock") != RequestScheduler.make_key("hi", "m2", "mock")
+
+    def test_per_model_concurrency_limit(self):
+        scheduler = RequestScheduler(max_concurrency_per_model=2)
+        model_a, model_b = _Generator(), _Generator()
+
+        async def burst():
+            jobs = [scheduler.submit(f"a{i}", "a", model_a(f"a{i}")) for i in range(6)]
+            jobs += [scheduler.submit(f"b{i}", "b", model_b(f"b{i}")) for i in range(6)]
+            return await asyncio.gather(*jobs)
+
+        run(burst())
+
+        assert model_a.max_running == 2
+        assert model_b.max_running == 2
+        assert model_a.calls == model_b.calls == 6
+
+    def test_queue_bound_rejects_excess(self):
+        scheduler = RequestScheduler(max_concurrency_per_model=1, max_queue=3)
+        model = _Generator()
+
+        async def burst():
+            return await asyncio.gather(
+                *(scheduler.submit(f"p{i}", "m", model(f"p{i}")) for i in range(5)),
+                return_exceptions=True,
+            )
+
+        results = run(burst())
+
+        assert sum(isinstance(r, SchedulerBusy) for r in results) == 2
+        assert scheduler.get_stats()["rejected"] == 2
+
+    def test_failure_fans_out_to_all_waiters(self):
+        scheduler = RequestScheduler()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("backend down")
+
+        async def burst():
+            return await asyncio.gather(*(scheduler.submit("k", "m", failing) for _ in range(3)), return_exceptions=True)
+
+        results = run(burst())
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert scheduler.get_stats()["executed"] == 1
+
+    def test_cancelled_waiter_does_not_cancel_shared_generation(self):
+        scheduler = RequestScheduler()
+        model = _Generator()
+
+        async def scenario():
+            first = asyncio.ensure_future(scheduler.submit("k", "m", model("hi")))
+            second = asyncio.ensure_future(scheduler.submit("k", "m", model("hi")))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert run(scenario()) == "echo: hi"
+
+    def test_bursty_throughput_beats_uncoalesced(self):
+        """20 requests over 4 distinct prompts on a single-slot model"""
+        latency = 0.05
+        prompts = [f"p{i % 4}" for i in range(20)]
+
+        async def uncoalesced():
+            model = _Generator(latency)
+            lock = asyncio.Semaphore(1)
+
+            async def one(p):
+                async with lock:
+                    return await model(p)()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(p) for p in prompts))
+            return time.perf_counter() - start
+
+        async def scheduled():
+            scheduler = RequestScheduler(max_concurrency_per_model=1)
+            model = _Generator(latency)
+            start = time.perf_counter()
+            results = await asyncio.gather(*(scheduler.submit(p, "m", model(p)) for p in prompts))
+            assert results == [f"echo: {p}" for p in prompts]
+            return time.perf_counter() - start
+
+        baseline = run(uncoalesced())
+        coalesced = run(scheduled())
+
+        assert coalesced < baseline / 3
+
+
+class TestServerCoalescing:
+    """Identical concurrent HTTP requests reach the backend once"""
+
+    @pytest.fixture
+    def client(self, ollama_server, monkeypatch):
+        backend = OllamaBackend()
+        backend.api_url = f"http://127.0.0.1:{ollama_server.server_port}"
+        monkeypatch.setattr(server_app.app.state, "backend_state", BackendState(detector_factory=lambda: StaticDetector([backend])))
+        monkeypatch.setattr(server_app.app.state, "scheduler", RequestScheduler())
+        with TestClient(server_app.app) as client:
+            yield client
+
+    @pytest.mark.parametrize(
+        "path,body,field",
+        [
+            ("/v1/completions", {"model": "m", "prompt": "same"}, lambda r: r["choices"][0]["text"]),
+            ("/v1/chat", {"model": "m", "message": "same"}, lambda r: r["response"]),
+        ],
+    )
+    def test_identical_requests_coalesce(self, client, ollama_server, path, body, field):
+        ollama_server.latency = 0.3
+        client.get("/v1/models")
+        results = []
+
+        def request():
+            results.append(field(client.post(path, json=body).json()))
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["echo: same"] * 6
+        assert ollama_server.paths.count("/api/generate") == 1
@@ -0,0 +1,147 @@
+"""Tests for the session journal and metadata index"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from lmapp.core.sessions import Session, SessionManager
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestSessionJournal:
+    """Test append-only session storage"""
+
+    def test_save_appends_only_new_messages(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        session = run(manager.create_session(name="Journal"))
+        journal = tmp_path / f"{session.session_id}.jsonl"
+
+        session.add_message("user", "first")
+        run(manager.save_current_session())
+        size = journal.stat().st_size
+        session.add_message("assistant", "second")
+        run(manager.save_current_session())
+        run(manager.save_current_session())
+
+        records = read_lines(journal)
+        assert [r["type"] for r in records] == ["session", "message", "message"]
+        assert journal.read_bytes().startswith(journal.read_bytes()[:size])
+
+        loaded = run(SessionManager(tmp_path).load_session(session.session_id))
+        assert [m.content for m in loaded.messages] == ["first", "second"]
+        assert loaded.last_accessed == session.messages[-1].timestamp
+
+    def test_rename_is_journaled(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        session = run(manager.create_session(name="Before"))
+        session.name = "After"
+        session.metadata["topic"] = "x"
+        run(manager.save_current_session())
+
+        loaded = run(SessionManager(tmp_path).load_session(session.session_id))
+        assert loaded.name == "After"
+        assert loaded.metadata == {"topic": "x"}
+
+    def test_torn_trailing_line_is_ignored(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        session = run(manager.create_session())
+        session.add_message("user", "kept")
+        run(manager.save_current_session())
+        with open(tmp_path / f"{session.session_id}.jsonl", "a") as f:
+            f.write('{"type": "message", "role": "us')
+
+        loaded = run(SessionManager(tmp_path).load_session(session.session_id))
+        assert [m.content for m in loaded.messages] == ["kept"]
+
+    def test_shrunk_history_rewrites_journal(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        session = run(manager.create_session())
+        session.add_message("user", "a")
+        session.add_message("user", "b")
+        run(manager.save_current_session())
+        session.messages.pop()
+        run(manager.save_current_session())
+
+        loaded = run(SessionManager(tmp_path).load_session(session.session_id))
+        assert [m.content for m in loaded.messages] == ["a"]
+
+    def test_legacy_session_is_migrated(self, tmp_path):
+        legacy = Session(name="Legacy")
+        legacy.add_message("user", "old")
+        (tmp_path / f"{legacy.session_id}.json").write_text(json.dumps(legacy.to_dict()))
+
+        manager = SessionManager(tmp_path)
+        assert [s["name"] for s in run(manager.list_sessions())] == ["Legacy"]
+
+        loaded = run(manager.load_session(legacy.session_id))
+        loaded.add_message("assistant", "new")
+        run(manager.save_current_session())
+
+        assert not (tmp_path / f"{legacy.session_id}.json").exists()
+        reloaded = run(SessionManager(tmp_path).load_session(legacy.session_id))
+        assert [m.content for m in reloaded.messages] == ["old", "new"]
+
+
+class TestSessionIndex:
+    """Test listing and cleanup through the metadata index"""
+
+    def test_list_reads_only_the_index(self, tmp_path, monkeypatch):
+        manager = SessionManager(tmp_path)
+        for i in range(3):
+            session = run(manager.create_session(name=f"Session {i}"))
+            session.add_message("user", f"hello {i}")
+            run(manager.save_current_session())
+
+        opened = []
+        monkeypatch.setattr(SessionManager, "_read_session_file", lambda self, path: opened.append(path))
+        sessions = run(SessionManager(tmp_path).list_sessions())
+
+        assert opened == []
+        assert [s["name"] for s in sessions] == ["Session 2", "Session 1", "Session 0"]
+        assert all(s["message_count"] == 1 for s in sessions)
+        assert sessions[0]["summary"].startswith("1 messages")
+
+    def test_index_is_rebuilt_from_journals(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        run(manager.create_session(name="One"))
+        run(manager.create_session(name="Two"))
+        (tmp_path / SessionManager.INDEX_FILE).unlink()
+
+        sessions = run(SessionManager(tmp_path).list_sessions())
+        assert sorted(s["name"] for s in sessions) == ["One", "Two"]
+
+    def test_delete_and_cleanup(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        old = run(manager.create_session(name="Old"))
+        old.created_at = (datetime.utcnow() - timedelta(days=40)).isoformat() + "Z"
+        (tmp_path / f"{old.session_id}.jsonl").unlink()
+        run(manager.save_current_session())
+        recent = run(manager.create_session(name="Recent"))
+        doomed = run(manager.create_session(name="Doomed"))
+
+        assert manager.delete_session(doomed.session_id)
+        assert not manager.delete_session(doomed.session_id)
+        assert run(manager.cleanup_old_sessions(days=30)) == 1
+
+        sessions = run(SessionManager(tmp_path).list_sessions())
+        assert [s["session_id"] for s in sessions] == [recent.session_id]
+        assert run(manager.load_session(old.session_id)) is None
+
+    def test_index_is_compacted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SessionManager, "INDEX_COMPACT_MIN", 10)
+        manager = SessionManager(tmp_path)
+        session = run(manager.create_session())
+        for i in range(50):
+            session.add_message("user", str(i))
+            run(manager.save_current_session())
+
+        assert len(read_lines(tmp_path / SessionManager.INDEX_FILE)) <= 10
+        [entry] = run(manager.list_sessions())
+        assert entry["message_count"] == 50
@@ -1,6 +1,7 @@
 """Tests for vector store backends and citation tracking."""
 
 import asyncio
+import random
 import pytest
 from datetime import datetime, timezone
 
@@ -357,3 +358,139 @@ class TestVectorStoreSimilarity:
             assert sim == 0.0
 
         run_async_test(run_test())
+
+
+class TestVectorisedSearch:
+    """Test the matrix-backed search path and its pure-Python fallback."""
+
+    @staticmethod
+    def _make_docs(count, dim=8):
+        rng = random.Random(42)
+        docs = []
+        for i in range(count):
+            vector = [rng.uniform(-1.0, 1.0) for _ in range(dim)]
+            docs.append(
+                VectorDocument(
+                    doc_id=f"doc{i}",
+                    text=f"Document {i}",
+                    vector=vector,
+                    metadata={"parity": i % 2},
+                    timestamp=datetime.now(timezone.utc),
+                    source="test",
+                )
+            )
+        return docs
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_matches_reference_cosine(self, use_numpy):
+        """Test ranking matches a brute-force cosine ranking."""
+
+        async def run_test():
+            store = InMemoryVectorStore(use_numpy=use_numpy)
+            docs = self._make_docs(50)
+            for doc in docs:
+                await store.add_document(doc)
+
+            query = [0.3, -0.1, 0.2, 0.0, 0.4, -0.2, 0.1, 0.05]
+            results = await store.search(query, top_k=5)
+
+            reference = sorted(docs, key=lambda d: -store._cosine_similarity(query, d.vector))[:5]
+            assert [r.doc_id for r in results] == [d.doc_id for d in reference]
+            for result, doc in zip(results, reference):
+                assert abs(result.similarity - store._cosine_similarity(query, doc.vector)) < 1e-5
+                assert isinstance(result.similarity, float)
+
+        run_async_test(run_test())
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_dimension_is_validated(self, use_numpy):
+        """Test wrong-dimension vectors are rejected, while empty vectors and queries score 0.0."""
+
+        async def run_test():
+            store = InMemoryVectorStore(use_numpy=use_numpy)
+            empty = VectorDocument("empty", "Empty", [], {}, datetime.now(timezone.utc), "test")
+            await store.add_document(empty)
+            for doc in TEST_DOCS:
+                await store.add_document(doc)
+
+            odd = VectorDocument("odd", "Odd", [1.0, 2.0], {}, datetime.now(timezone.utc), "test")
+            with pytest.raises(ValueError):
+                await store.add_document(odd)
+            with pytest.raises(ValueError):
+                await store.update_document(VectorDocument("doc1", "Odd", [1.0, 2.0], {}, datetime.now(timezone.utc), "test"))
+            assert "odd" not in store.documents
+
+            results = await store.search(TEST_QUERY_VECTOR, top_k=4)
+            assert results[-1].doc_id == "empty"
+            assert results[-1].similarity == 0.0
+
+            results = await store.search([1.0, 2.0, 3.0], top_k=4)
+            assert all(r.similarity == 0.0 for r in results)
+
+        run_async_test(run_test())
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_index_follows_mutations(self, use_numpy):
+        """Test updates and deletes are reflected in later searches."""
+
+        async def run_test():
+            store = InMemoryVectorStore(use_numpy=use_numpy)
+            for doc in TEST_DOCS:
+                await store.add_document(doc)
+            await store.search(TEST_QUERY_VECTOR)
+
+            await store.delete_document("doc1")
+            results = await store.search(TEST_QUERY_VECTOR, top_k=5)
+            assert "doc1" not in [r.doc_id for r in results]
+
+            updated = VectorDocument("doc2", "Updated", [-0.12, -0.22, -0.32, -0.42, -0.52], {}, datetime.now(timezone.utc), "test")
+            await store.update_document(updated)
+            results = await store.search(TEST_QUERY_VECTOR, top_k=5)
+            assert results[-1].doc_id == "doc2"
+            assert results[-1].similarity < 0
+
+        run_async_test(run_test())
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_incremental_rows_match_reference(self, use_numpy):
+        """Test rows stay consistent through interleaved adds, updates, deletes and compaction."""
+
+        async def run_test():
+            rng = random.Random(7)
+            store = InMemoryVectorStore(use_numpy=use_numpy)
+            docs = self._make_docs(60)
+            query = [0.3, -0.1, 0.2, 0.0, 0.4, -0.2, 0.1, 0.05]
+
+            for step in range(300):
+                doc = rng.choice(docs)
+                if doc.doc_id not in store.documents:
+                    await store.add_document(doc)
+                elif rng.random() < 0.5:
+                    await store.delete_document(doc.doc_id)
+                else:
+                    vector = [rng.uniform(-1.0, 1.0) for _ in range(8)]
+                    await store.update_document(VectorDocument(doc.doc_id, doc.text, vector, doc.metadata, doc.timestamp, doc.source))
+
+                results = await store.search(query, top_k=5)
+                live = list(store.documents.values())
+                reference = sorted(live, key=lambda d: -store._cosine_similarity(query, d.vector))[:5]
+                assert [r.doc_id for r in results] == [d.doc_id for d in reference], step
+                assert len(store._row_of) == len(live) and store._dead_rows <= len(live)
+
+        run_async_test(run_test())
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_filter_with_top_k(self, use_numpy):
+        """Test metadata filters are applied before top-k selection."""
+
+        async def run_test():
+            store = InMemoryVectorStore(use_numpy=use_numpy)
+            for doc in self._make_docs(20):
+                await store.add_document(doc)
+
+            results = await store.search([0.1] * 8, top_k=3, filter_metadata={"parity": 1})
+            assert len(results) == 3
+            assert all(r.metadata["parity"] == 1 for r in results)
+            assert results == sorted(results, key=lambda x: -x.similarity)
+
+        run_async_test(run_test())
@@ -0,0 +1,134 @@
+"""Unit tests for the workflow response cache."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from lmapp.workflows.cache import WorkflowCache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def step(prompt):
+    return {"action": "llm", "prompt": prompt}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = WorkflowCache(cache_dir=str(tmp_path))
+    yield cache
+    cache.close()
+
+
+class TestWorkflowCache:
+    """Test WorkflowCache"""
+
+    def test_set_and_get(self, cache):
+        run(cache.set("wf", step("hi"), {"a": 1}, "response"))
+
+        assert run(cache.get("wf", step("hi"), {"a": 1})) == "response"
+        assert run(cache.get("wf", step("hi"), {"a": 2})) is None
+        assert run(cache.get("other", step("hi"), {"a": 1})) is None
+
+    def test_overwrite_keeps_totals_consistent(self, cache):
+        run(cache.set("wf", step("hi"), {}, "short"))
+        run(cache.set("wf", step("hi"), {}, "a much longer response"))
+
+        assert run(cache.get("wf", step("hi"), {})) == "a much longer response"
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 1
+
+        conn = sqlite3.connect(cache.db_path)
+        assert conn.execute("SELECT entries, bytes FROM totals").fetchone() == conn.execute("SELECT COUNT(*), SUM(size) FROM entries").fetchone()
+        conn.close()
+
+    def test_expired_entries(self, tmp_path):
+        cache = WorkflowCache(cache_dir=str(tmp_path), ttl_hours=0)
+        run(cache.set("wf", step("a"), {}, "x"))
+        run(cache.set("wf", step("b"), {}, "y"))
+
+        assert run(cache.get("wf", step("a"), {})) is None
+        assert cache.clear_expired() == 1
+        assert cache.get_stats()["total_entries"] == 0
+        cache.close()
+
+    def test_lru_entry_bound(self, tmp_path):
+        cache = WorkflowCache(cache_dir=str(tmp_path), max_entries=3)
+        for prompt in "abc":
+            run(cache.set("wf", step(prompt), {}, prompt))
+        assert run(cache.get("wf", step("a"), {})) == "a"  # refresh "a"
+
+        run(cache.set("wf", step("d"), {}, "d"))
+
+        assert run(cache.get("wf", step("b"), {})) is None
+        assert [run(cache.get("wf", step(p), {})) for p in "acd"] == ["a", "c", "d"]
+        assert cache.get_stats()["total_entries"] == 3
+        cache.close()
+
+    def test_size_bound(self, tmp_path):
+        cache = WorkflowCache(cache_dir=str(tmp_path), max_entries=None, max_size_mb=0.01)
+        for i in range(10):
+            run(cache.set("wf", step(str(i)), {}, "x" * 2000))
+
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 5
+        assert run(cache.get("wf", step("9"), {})) is not None
+        assert run(cache.get("wf", step("0"), {})) is None
+        cache.close()
+
+    def test_persists_and_clears(self, tmp_path):
+        first = WorkflowCache(cache_dir=str(tmp_path))
+        run(first.set("wf", step("hi"), {}, "kept"))
+        first.close()
+
+        second = WorkflowCache(cache_dir=str(tmp_path))
+        assert run(second.get("wf", step("hi"), {})) == "kept"
+        assert second.get_stats()["oldest_entry_age_hours"] == 0
+        assert second.clear_all() == 1
+        assert second.get_stats() == {"total_entries": 0, "total_size_mb": 0.0, "oldest_entry_age_hours": 0}
+        second.close()
+
+    def test_hits_are_buffered_until_next_write(self, cache):
+        run(cache.set("wf", step("hi"), {}, "response"))
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+
+        for _ in range(3):
+            assert run(cache.get("wf", step("hi"), {})) == "response"
+        assert not any(sql.lstrip().startswith("UPDATE") for sql in statements)
+
+        run(cache.set("wf", step("other"), {}, "response"))
+        assert sum(sql.lstrip().startswith("UPDATE entries SET last_accessed") for sql in statements) == 1
+
+    def test_database_work_runs_off_the_event_loop(self, cache):
+        threads = []
+        lookup = cache._lookup
+        cache._lookup = lambda key: threads.append(threading.current_thread()) or lookup(key)
+
+        run(cache.get("wf", step("hi"), {}))
+        assert threads and threads[0] is not threading.main_thread()
+
+    def test_close_from_another_thread(self, tmp_path):
+        cache = WorkflowCache(cache_dir=str(tmp_path))
+        run(cache.set("wf", step("hi"), {}, "response"))
+        run(cache.get("wf", step("hi"), {}))
+
+        errors = []
+
+        def worker():
+            try:
+                cache.close()
+            except Exception as e:
+                errors.append(e)
+
+        closer = threading.Thread(target=worker)
+        closer.start()
+        closer.join()
+
+        assert errors == [] and cache._conn is None
+        assert run(cache.get("wf", step("hi"), {})) == "response"
+        cache.close()
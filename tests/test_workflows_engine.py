@@ -2,6 +2,7 @@
 
 import pytest
 import asyncio
+import time
 from pathlib import Path
 
 from lmapp.workflows.engine import (
@@ -11,9 +12,45 @@ from lmapp.workflows.engine import (
     WorkflowContext,
     WorkflowEngine,
     WorkflowStep,
+    WorkflowTool,
 )
 
 
+class SleepTool(WorkflowTool):
+    """Tool that sleeps, records concurrency and returns its 'value' arg."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+
+    @property
+    def name(self) -> str:
+        return "sleep"
+
+    async def execute(self, args, context):
+        self.started.append(args.get("label"))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(args.get("seconds", 0.05))
+            if args.get("fail"):
+                raise RuntimeError("failed on purpose")
+            return args.get("value")
+        finally:
+            self.running -= 1
+
+    def validate_args(self, args):
+        return True
+
+
+def sleep_step(step_id, **args):
+    depends_on = args.pop("depends_on", None)
+    condition = args.pop("condition", None)
+    args.setdefault("label", step_id)
+    return WorkflowStep(id=step_id, name=step_id, tool="sleep", args=args, depends_on=depends_on, condition=condition)
+
+
 class TestWorkflowContext:
     """Test workflow context."""
 
@@ -166,6 +203,115 @@ class TestWorkflowEngine:
         assert context.results["step1"].error is not None
 
 
+class TestWorkflowScheduling:
+    """Test dependency-graph scheduling."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = WorkflowEngine()
+        engine.sleep = SleepTool()
+        engine.register_tool(engine.sleep)
+        return engine
+
+    def test_independent_branches_run_concurrently(self, engine):
+        """Document-analysis shape: three branches fan out, one step joins them"""
+        steps = [
+            sleep_step("load", seconds=0.1, value="doc"),
+            sleep_step("summary", seconds=0.1, value="${load}:summary"),
+            sleep_step("entities", seconds=0.1, value="${load}:entities"),
+            sleep_step("sentiment", seconds=0.1, value="${load}:sentiment"),
+            sleep_step("report", seconds=0.1, value=["${summary}", "${entities}", "${sentiment}"]),
+        ]
+
+        start = time.perf_counter()
+        context = asyncio.run(engine.execute_workflow(steps, parallel=True))
+        elapsed = time.perf_counter() - start
+
+        assert context.results["report"].output == ["doc:summary", "doc:entities", "doc:sentiment"]
+        assert engine.sleep.max_running == 3
+        # Critical path is three steps; sequential execution would take five
+        assert elapsed < 0.45
+
+    def test_parallelism_limit(self, engine):
+        steps = [sleep_step(f"s{i}", seconds=0.02) for i in range(6)]
+
+        asyncio.run(engine.execute_workflow(steps, max_parallel=2, parallel=True))
+
+        assert engine.sleep.max_running == 2
+        assert engine.sleep.started == [f"s{i}" for i in range(6)]
+
+    def test_explicit_dependencies(self, engine):
+        steps = [
+            sleep_step("b", depends_on=["a"]),
+            sleep_step("a", seconds=0.05, depends_on=[]),
+        ]
+
+        context = asyncio.run(engine.execute_workflow(steps))
+
+        assert engine.sleep.started == ["a", "b"]
+        assert engine.build_graph(steps) == {"a": set(), "b": {"a"}}
+        assert context.results["b"].status == TaskStatus.SUCCESS
+
+    def test_condition_waits_for_earlier_steps(self, engine):
+        steps = [
+            WorkflowStep(id="set", name="set", tool="code_exec", args={"code": "context.set_var('go', False)"}),
+            sleep_step("gated", condition="go"),
+        ]
+
+        context = asyncio.run(engine.execute_workflow(steps))
+
+        assert engine.build_graph(steps)["gated"] == {"set"}
+        assert context.results["gated"].status == TaskStatus.SKIPPED
+
+    def test_failure_stops_new_steps(self, engine):
+        steps = [
+            sleep_step("bad", seconds=0.01, fail=True),
+            sleep_step("slow", seconds=0.05, depends_on=[]),
+            sleep_step("after", depends_on=["bad"]),
+            sleep_step("later", depends_on=["slow"]),
+        ]
+
+        context = asyncio.run(engine.execute_workflow(steps))
+
+        assert context.results["bad"].status == TaskStatus.FAILED
+        assert context.results["slow"].status == TaskStatus.SUCCESS
+        assert "after" not in context.results
+        assert "later" not in context.results
+
+    def test_steps_without_dependencies_keep_list_order(self, engine, tmp_path):
+        """Steps that only share side effects must not run concurrently"""
+        path = str(tmp_path / "wf.txt")
+        steps = [
+            WorkflowStep(id="w", name="w", tool="file_ops", args={"operation": "write", "path": path, "content": "hello"}),
+            WorkflowStep(id="r", name="r", tool="file_ops", args={"operation": "read", "path": path}),
+            sleep_step("s1", seconds=0.02),
+            sleep_step("s2", seconds=0.02),
+        ]
+
+        context = asyncio.run(engine.execute_workflow(steps))
+
+        assert context.results["r"].output == "hello"
+        assert engine.build_graph(steps) == {"w": set(), "r": {"w"}, "s1": {"r"}, "s2": {"s1"}}
+        assert engine.sleep.max_running == 1
+
+    def test_parallel_mode_uses_references_only(self, engine):
+        steps = [sleep_step("a"), sleep_step("b"), sleep_step("c", value="${a}")]
+
+        assert engine.build_graph(steps, parallel=True) == {"a": set(), "b": set(), "c": {"a"}}
+
+    @pytest.mark.parametrize(
+        "steps",
+        [
+            [sleep_step("a", value="${b}"), sleep_step("b", value="${a}")],
+            [sleep_step("a", depends_on=["missing"])],
+            [sleep_step("a"), sleep_step("a")],
+        ],
+    )
+    def test_invalid_graphs_rejected(self, engine, steps):
+        with pytest.raises(ValueError):
+            asyncio.run(engine.execute_workflow(steps))
+
+
 class TestWorkflowSteps:
     """Test workflow step definitions."""
 